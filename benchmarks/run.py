@@ -0,0 +1,422 @@
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matplotlib.backend_bases import MouseEvent  # noqa: E402
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas  # noqa: E402
+from matplotlib.figure import Figure  # noqa: E402
+from PyQt5.QtWidgets import QApplication, QComboBox, QTabWidget  # noqa: E402
+
+from benchmarks.synthetic import SyntheticSession, install, install_sessions  # noqa: E402
+from logic import telemetry_store  # noqa: E402
+from logic.data_worker import DataWorker, worker_ping  # noqa: E402
+from logic.plotter import plot_comparison_telemetry, plot_lap_telemetry  # noqa: E402
+from logic.race_pace import RacePacePlotter, get_race_pace  # noqa: E402
+from logic.replay import get_replay_timeline  # noqa: E402
+from logic.schedule_service import SUPPORTED_YEARS  # noqa: E402
+from logic.startup import STARTUP_ENV  # noqa: E402
+from logic.telemetry_cache import telemetry_cache  # noqa: E402
+from logic.track_map import TrackMapPlotter, load_track_map  # noqa: E402
+from logic.telemetry_loader import (  # noqa: E402
+    ensure_telemetry, get_driver_laps, load_session_data, persist_session, pick_fastest_lap
+)
+from ui.canvas_interaction import FRAME_MS, enable_zoom_pan  # noqa: E402
+from ui.lap_model import LapListModel  # noqa: E402
+from ui.replay_player import ReplayPlayer  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+COMPARISON_SIZES = [1, 5, 10, 20]
+PAN_FRAMES = 30
+PAN_DRIVERS = 20
+FRAME_SHARE = 0.5  # a blitted pan frame may cost at most this share of a full redraw
+RACE_LAPS = 70
+REPLAY_FRAMES = 120
+WORKER_ROUNDS = range(100, 200)  # fresh keys, so every worker load parses
+KEY = (2023, 5, 'R')
+
+
+def timed(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+# Mirrors RacePulseApp.create_plot_canvas / init_plot, shown on the offscreen platform so
+# only the current tab draws, as in the app
+class Canvases:
+    def __init__(self, app):
+        self.app = app
+        self.tabs = QTabWidget()
+        self.canvases = []
+        for title in ["Speed vs Distance", "Throttle", "Brake", "Gear", "Delta to Reference"]:
+            canvas = FigureCanvas(Figure(figsize=(6, 4), tight_layout=True))
+            canvas.ax = canvas.figure.add_subplot(111)
+            canvas.ax.set_title(title)
+            enable_zoom_pan(canvas)
+            self.tabs.addTab(canvas, title)
+            self.canvases.append(canvas)
+        self.tabs.resize(1200, 600)
+        self.tabs.show()
+        self.settle()
+
+    def settle(self):
+        # Runs the draw_idle requests the plotter queued
+        self.app.processEvents()
+
+    def reset(self):
+        # Cold runs slice telemetry again; the plotter and its artists are reused as in the app
+        telemetry_cache.clear()
+
+
+class Suite:
+    def __init__(self, repeat):
+        self.repeat = repeat
+        self.app = QApplication.instance() or QApplication(sys.argv)
+        self.session = SyntheticSession()
+        self.results = {}
+        self.failures = []  # checks that hold on any machine, unlike the baseline comparison
+
+    def record(self, name, samples):
+        self.results[name] = {
+            'median_ms': statistics.median(samples) * 1000,
+            'min_ms': min(samples) * 1000,
+            'runs': len(samples),
+        }
+        print(f"  {name:<36} {self.results[name]['median_ms']:9.2f} ms")
+
+    def run(self, only=None):
+        store_dir = telemetry_store.STORE_DIR
+        undo = install(lambda *key: self.session)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                telemetry_store.STORE_DIR = tmp
+                self.store_dir = tmp
+                for bench in [self.bench_load, self.bench_laps, self.bench_lap_dropdown,
+                              self.bench_plot_lap, self.bench_comparison, self.bench_zoom_pan,
+                              self.bench_track_map, self.bench_race_pace, self.bench_replay,
+                              self.bench_worker, self.bench_startup]:
+                    if only and not any(word in bench.__name__ for word in only):
+                        continue
+                    bench()
+        finally:
+            telemetry_store.STORE_DIR = store_dir
+            undo()
+        return self.results
+
+    def bench_load(self):
+        self.record('load_session_data[fastf1]', timed(lambda: load_session_data(*KEY), self.repeat))
+
+        session = load_session_data(*KEY)
+        ensure_telemetry(session)
+        persist_session(session)
+        self.record('load_session_data[store]', timed(lambda: load_session_data(*KEY), self.repeat))
+
+    def bench_laps(self):
+        drivers = self.session.drivers
+        self.record('get_driver_laps[20 drivers]',
+                    timed(lambda: [get_driver_laps(self.session, d) for d in drivers], self.repeat))
+
+    def bench_lap_dropdown(self):
+        combo = QComboBox()
+        model = LapListModel(combo)
+        combo.setModel(model)
+        laps = get_driver_laps(self.session, self.session.drivers[0])
+        fastest = pick_fastest_lap(laps)
+
+        def populate():
+            combo.blockSignals(True)
+            model.set_laps(laps)
+            combo.setCurrentIndex(model.row_for_lap(fastest['LapNumber']))
+            combo.blockSignals(False)
+
+        self.record(f'lap_dropdown[{len(laps)} laps]', timed(populate, self.repeat, setup=model.clear))
+
+    def bench_plot_lap(self):
+        canvases = Canvases(self.app)
+        laps = get_driver_laps(self.session, self.session.drivers[0])
+        lap_number = pick_fastest_lap(laps)['LapNumber']
+
+        def plot():
+            plot_lap_telemetry(self.session, self.session.drivers[0], lap_number, *canvases.canvases[:4])
+            canvases.settle()
+
+        self.record('plot_lap_telemetry[cold]', timed(plot, self.repeat, setup=canvases.reset))
+        self.record('plot_lap_telemetry[warm]', timed(plot, self.repeat))
+
+    def bench_comparison(self):
+        canvases = Canvases(self.app)
+        for size in COMPARISON_SIZES:
+            drivers = self.session.drivers[:size]
+
+            def plot():
+                plot_comparison_telemetry(self.session, drivers, *canvases.canvases)
+                canvases.settle()
+
+            self.record(f'plot_comparison_telemetry[{size}]', timed(plot, self.repeat, setup=canvases.reset))
+
+    def bench_zoom_pan(self):
+        canvases = Canvases(self.app)
+        drivers = self.session.drivers[:PAN_DRIVERS]
+        plot_comparison_telemetry(self.session, drivers, *canvases.canvases)
+        canvases.settle()
+        canvas = canvases.canvases[0]
+        interaction = canvas.interaction
+        x, y = canvas.ax.bbox.x0 + canvas.ax.bbox.width / 2, canvas.ax.bbox.y0 + canvas.ax.bbox.height / 2
+
+        frames = []
+        settles = []
+        for _ in range(self.repeat):
+            canvas.callbacks.process('button_press_event', MouseEvent('button_press_event', canvas, x, y, button=1))
+            for frame in range(PAN_FRAMES):
+                start = time.perf_counter()
+                canvas.callbacks.process('motion_notify_event',
+                                         MouseEvent('motion_notify_event', canvas, x + 4 * frame, y + 2 * frame,
+                                                    button=1))
+                interaction.render_frame()
+                frames.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            canvas.callbacks.process('button_release_event',
+                                     MouseEvent('button_release_event', canvas, x + 4 * PAN_FRAMES, y + 2 * PAN_FRAMES,
+                                                button=1))
+            canvases.settle()
+            settles.append(time.perf_counter() - start)
+
+        self.record(f'zoom_pan[frame, {len(drivers)} drivers]', frames)
+        self.record(f'zoom_pan[settle, {len(drivers)} drivers]', settles)
+
+        # The settle is one full draw; a frame that comes close to it is redrawing something
+        # that belongs in the cached background
+        frame, full = statistics.median(frames), statistics.median(settles)
+        if frame > full * FRAME_SHARE:
+            self.failures.append(f"a {len(drivers)}-driver pan frame takes {frame * 1000:.1f} ms, "
+                                 f"over {FRAME_SHARE:.0%} of a full draw ({full * 1000:.1f} ms)")
+        # Whatever a full draw costs on this machine, the drag has to keep up with the frame timer
+        if frame * 1000 > FRAME_MS:
+            self.failures.append(f"a {len(drivers)}-driver pan frame takes {frame * 1000:.1f} ms, "
+                                 f"over the {FRAME_MS} ms frame interval")
+
+    def bench_track_map(self):
+        canvases = Canvases(self.app)
+        canvas = canvases.canvases[0]
+        plotter = TrackMapPlotter(canvas)
+        laps = [(driver, lap) for driver in self.session.drivers for lap in (10.0, 20.0, 30.0)]
+
+        def plot():
+            plotter.plot(*load_track_map(self.session, laps))
+            canvases.settle()
+
+        self.record(f'track_map[{len(laps)} laps]', timed(plot, self.repeat, setup=canvases.reset))
+
+        interaction = canvas.interaction
+        x, y = canvas.ax.bbox.x0 + canvas.ax.bbox.width / 2, canvas.ax.bbox.y0 + canvas.ax.bbox.height / 2
+        frames = []
+        canvas.callbacks.process('button_press_event', MouseEvent('button_press_event', canvas, x, y, button=1))
+        for frame in range(PAN_FRAMES * self.repeat):
+            start = time.perf_counter()
+            canvas.callbacks.process('motion_notify_event',
+                                     MouseEvent('motion_notify_event', canvas, x + frame % 40, y, button=1))
+            interaction.render_frame()
+            frames.append(time.perf_counter() - start)
+        canvas.callbacks.process('button_release_event', MouseEvent('button_release_event', canvas, x, y, button=1))
+        self.record(f'track_map[pan frame, {len(laps)} laps]', frames)
+
+    def bench_race_pace(self):
+        canvases = Canvases(self.app)
+        plotter = RacePacePlotter(canvases.canvases[0])
+        race = SyntheticSession(laps=RACE_LAPS)
+        name = f'{len(race.drivers)} drivers x {RACE_LAPS} laps'
+
+        def plot():
+            plotter.plot(get_race_pace(race))
+            canvases.settle()
+
+        self.record(f'race_pace[compute, {name}]', timed(lambda: get_race_pace(race), self.repeat,
+                                                         setup=canvases.reset))
+        self.record(f'race_pace[cold, {name}]', timed(plot, self.repeat, setup=canvases.reset))
+        self.record(f'race_pace[warm, {name}]', timed(plot, self.repeat))
+
+    def bench_replay(self):
+        race = SyntheticSession(laps=RACE_LAPS)
+        name = f'{len(race.drivers)} drivers x {RACE_LAPS} laps'
+        self.record(f'replay[timeline, {name}]', timed(lambda: get_replay_timeline(race), self.repeat,
+                                                       setup=telemetry_cache.clear))
+
+        # Frames at 8x over the map of one lap, as played back in the app
+        canvases = Canvases(self.app)
+        canvas = canvases.canvases[0]
+        TrackMapPlotter(canvas).plot(*load_track_map(race, [(race.drivers[0], 10.0)]))
+        player = ReplayPlayer(canvas)
+        player.set_timeline(get_replay_timeline(race))
+        canvases.settle()
+        frames = []
+        for frame in range(REPLAY_FRAMES):
+            start = time.perf_counter()
+            player.seek(player.start + 600.0 + frame * 8 / 60)
+            frames.append(time.perf_counter() - start)
+        self.record(f'replay[frame, {len(race.drivers)} cars]', frames)
+
+    def bench_worker(self):
+        # Longest the GUI thread goes without running while a race loads with its telemetry
+        # tier: on a thread of this process (the GIL is held through the parse) and in the
+        # data worker. Each load is a fresh SyntheticSession, standing in for FastF1's parse.
+        rounds = iter(WORKER_ROUNDS)
+        undo = install(lambda *key: SyntheticSession(laps=RACE_LAPS))
+
+        def in_thread():
+            session = load_session_data(2023, next(rounds), 'R')
+            ensure_telemetry(session)
+            persist_session(session)
+
+        try:
+            self.record('worker[stall, thread]', [self.max_stall(in_thread) for _ in range(self.repeat)])
+        finally:
+            undo()
+
+        worker = DataWorker(cache_dir=None, setup=functools.partial(
+            install_sessions, self.store_dir, laps=RACE_LAPS)).start()
+        try:
+            worker.call(worker_ping)  # process start-up is not part of a load
+
+            def in_worker():
+                ensure_telemetry(worker.load_session(2023, next(rounds), 'R'))
+
+            loads = []
+            stalls = []
+            for _ in range(self.repeat):
+                start = time.perf_counter()
+                stalls.append(self.max_stall(in_worker))
+                loads.append(time.perf_counter() - start)
+            self.record('worker[stall, process]', stalls)
+            self.record('worker[load, process]', loads)
+        finally:
+            worker.shutdown(wait=True)  # lets the last persist finish before the store goes
+
+    def bench_startup(self):
+        # Launches main.py and reads back its startup report: when the window was first
+        # painted and when its plots were ready. Run from a directory whose store already
+        # holds the schedules, so no launch waits on the network.
+        with tempfile.TemporaryDirectory() as tmp:
+            store = os.path.join(tmp, 'resources', 'cache', 'racepulse')
+            os.makedirs(store)
+            event = {'name': 'Bahrain Grand Prix', 'round': 1, 'circuit': 'Sakhir', 'country': 'Bahrain',
+                     'date': '2023-03-05T00:00:00'}
+            with open(os.path.join(store, 'schedules.json'), 'w') as f:
+                json.dump({str(year): {'fetched': datetime.now().isoformat(), 'events': [event]}
+                           for year in SUPPORTED_YEARS}, f)
+
+            report = os.path.join(tmp, 'startup.jsonl')
+            env = dict(os.environ, QT_QPA_PLATFORM='offscreen', RACEPULSE_DATA_WORKER='0', **{STARTUP_ENV: report})
+            env.pop('RACEPULSE_TRACE', None)
+            for _ in range(self.repeat):
+                subprocess.run([sys.executable, os.path.join(ROOT, 'main.py')], cwd=tmp, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=120, check=True)
+            with open(report) as f:
+                launches = [json.loads(line)['marks'] for line in f]
+
+        for mark in ('visible', 'plots'):
+            self.record(f'startup[{mark}]', [marks[mark] / 1000 for marks in launches])
+
+    def max_stall(self, fn):
+        # Runs fn on a thread while this one spins an event loop; returns the longest gap
+        thread = threading.Thread(target=fn)
+        thread.start()
+        longest = 0.0
+        last = time.perf_counter()
+        while thread.is_alive():
+            self.app.processEvents()
+            time.sleep(0.001)
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+        thread.join()
+        return longest
+
+
+def compare(results, baseline, tolerance, floor_ms):
+    # A benchmark regresses when its median is both `tolerance` slower and `floor_ms`
+    # slower than the baseline; the floor keeps sub-millisecond jitter from failing runs
+    regressions = []
+    print(f"\n  {'benchmark':<36} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f"  {name:<36} {'-':>10} {result['median_ms']:8.2f}ms {'new':>8}")
+            continue
+        old, new = before['median_ms'], result['median_ms']
+        change = (new - old) / old if old else 0.0
+        regressed = new > old * (1 + tolerance) and new - old > floor_ms
+        flag = '  REGRESSION' if regressed else ''
+        print(f"  {name:<36} {old:8.2f}ms {new:8.2f}ms {change:+7.0%}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+def load_baseline(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump({
+            'python': platform.python_version(),
+            'machine': platform.platform(),
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'results': results,
+        }, f, indent=2)
+    print(f"\nBaseline saved to {path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline RacePulse benchmarks on synthetic sessions.")
+    parser.add_argument('only', nargs='*', help="groups to run: load, laps, lap_dropdown, plot_lap, comparison, zoom_pan, track_map, race_pace, replay, worker, startup")
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help="store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument('--floor-ms', type=float, default=1.0, help="ignore slowdowns smaller than this")
+    args = parser.parse_args(argv)
+
+    print("Running benchmarks...")
+    suite = Suite(args.repeat)
+    results = suite.run(args.only)
+    for failure in suite.failures:
+        print(f"\nFAILED: {failure}")
+
+    baseline = load_baseline(args.baseline)
+    if args.save or baseline is None:
+        save_baseline(args.baseline, results)
+        return 1 if suite.failures else 0
+
+    regressions = compare(results, baseline['results'], args.tolerance, args.floor_ms)
+    if suite.failures:
+        return 1
+    if regressions:
+        print(f"\n{len(regressions)} benchmark(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
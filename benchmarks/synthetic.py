@@ -0,0 +1,141 @@
+import numpy as np
+import pandas as pd
+from fastf1.core import Laps, Telemetry
+
+DRIVERS = [
+    'VER', 'PER', 'HAM', 'RUS', 'LEC', 'SAI', 'NOR', 'PIA', 'ALO', 'STR',
+    'GAS', 'OCO', 'ALB', 'SAR', 'TSU', 'RIC', 'BOT', 'ZHO', 'MAG', 'HUL',
+]
+T0_DATE = pd.Timestamp('2023-05-07 13:00:00')
+# (compound, share of the race at which the stint ends), alternated across the grid
+STINT_PLANS = [
+    [('MEDIUM', 0.45), ('HARD', 1.0)],
+    [('SOFT', 0.3), ('MEDIUM', 0.65), ('HARD', 1.0)],
+]
+DEGRADATION = {'SOFT': 0.08, 'MEDIUM': 0.05, 'HARD': 0.03}  # s per lap of tyre age
+FUEL_EFFECT = 0.06  # s per lap gained as fuel burns off
+PIT_LOSS = 20.0
+SAFETY_CAR = (30, 33)  # laps under the safety car, when the race is that long
+SAFETY_CAR_LOSS = 35.0
+
+
+# Stands in for fastf1.core.Session: laps are a real Laps frame and car data real Telemetry,
+# so Lap.get_car_data().add_distance() and everything after it run the same code as live data
+class SyntheticSession:
+    def __init__(self, drivers=20, laps=57, lap_seconds=90.0, hz=4.0, seed=0):
+        rng = np.random.default_rng(seed)
+        self.t0_date = T0_DATE
+        self.drivers = DRIVERS[:drivers]
+        self.car_data = {}
+        self.pos_data = {}
+        self.load_calls = []
+
+        rows = []
+        for position, driver in enumerate(self.drivers):
+            number = str(position + 1)
+            stints = self.make_stints(STINT_PLANS[position % len(STINT_PLANS)], laps)
+            lap_times = (lap_seconds + position * 0.15 + rng.normal(0, 0.4, laps)
+                         + stints['degradation'] - FUEL_EFFECT * np.arange(laps)
+                         + PIT_LOSS * stints['out_lap'] + SAFETY_CAR_LOSS * stints['safety_car'])
+            lap_ends = 60.0 + np.cumsum(lap_times)
+            lap_starts = lap_ends - lap_times
+            best = int(np.argmin(lap_times))
+            for lap in range(laps):
+                rows.append({
+                    'Driver': driver, 'DriverNumber': number, 'LapNumber': float(lap + 1),
+                    'LapTime': pd.Timedelta(seconds=lap_times[lap]),
+                    'LapStartTime': pd.Timedelta(seconds=lap_starts[lap]),
+                    'Time': pd.Timedelta(seconds=lap_ends[lap]),
+                    'IsPersonalBest': lap == best,
+                    'Stint': float(stints['stint'][lap]),
+                    'Compound': stints['compound'][lap],
+                    'TyreLife': float(stints['tyre_life'][lap]),
+                    'PitInTime': pd.Timedelta(seconds=lap_ends[lap]) if stints['in_lap'][lap] else pd.NaT,
+                    'PitOutTime': pd.Timedelta(seconds=lap_starts[lap] + 5.0) if stints['out_lap'][lap] else pd.NaT,
+                    'TrackStatus': '4' if stints['safety_car'][lap] else '1',
+                })
+            self.car_data[number] = self.make_car_data(number, lap_ends[-1] + 30.0, hz, lap_seconds, rng)
+            self.pos_data[number] = self.make_pos_data(number, lap_ends[-1] + 30.0, hz, lap_seconds)
+
+        self.laps = Laps(pd.DataFrame(rows), session=self)
+        self.results = pd.DataFrame({'Abbreviation': self.drivers, 'DriverNumber':
+                                     [str(i + 1) for i in range(len(self.drivers))]})
+
+    def make_stints(self, plan, laps):
+        # Per-lap stint number, compound, tyre age and pit/safety car flags for one driver
+        lap = np.arange(1, laps + 1)
+        pit_laps = np.array([max(1, min(laps - 1, round(end * laps))) for _, end in plan[:-1]], dtype=int)
+        stint = 1 + np.searchsorted(pit_laps, lap, side='left')
+        first_lap = np.concatenate([[1], pit_laps + 1])[stint - 1]
+        tyre_life = lap - first_lap + 1
+        compound = np.array([compound for compound, _ in plan])[stint - 1]
+        return {
+            'stint': stint,
+            'compound': compound,
+            'tyre_life': tyre_life,
+            'degradation': np.array([DEGRADATION[c] for c in compound]) * tyre_life,
+            'in_lap': np.isin(lap, pit_laps),
+            'out_lap': np.isin(lap, pit_laps + 1),
+            'safety_car': (lap >= SAFETY_CAR[0]) & (lap <= SAFETY_CAR[1]) & (laps > SAFETY_CAR[1]),
+        }
+
+    def make_car_data(self, number, duration, hz, lap_seconds, rng):
+        t = np.arange(0.0, duration, 1.0 / hz)
+        phase = 2 * np.pi * t / lap_seconds
+        speed = 210 + 90 * np.sin(3 * phase) + rng.normal(0, 2, len(t))
+        throttle = np.clip(60 + 60 * np.sin(3 * phase + 0.3), 0, 100)
+        session_time = pd.to_timedelta(t, unit='s')
+        return Telemetry({
+            'Date': self.t0_date + session_time,
+            'SessionTime': session_time,
+            'Time': session_time,
+            'RPM': 9000 + 30 * speed,
+            'Speed': speed,
+            'nGear': np.clip((speed // 40).astype(int), 1, 8),
+            'Throttle': throttle,
+            'Brake': throttle < 5,
+            'DRS': np.zeros(len(t), dtype=int),
+            'Source': 'car',
+        }, session=self, driver=number)
+
+    def make_pos_data(self, number, duration, hz, lap_seconds):
+        # A lopsided loop in FastF1's 1/10 m units, sampled off the car data clock as live data is
+        t = np.arange(0.11, duration, 1.0 / (hz + 0.5))
+        phase = 2 * np.pi * t / lap_seconds
+        session_time = pd.to_timedelta(t, unit='s')
+        return Telemetry({
+            'Date': self.t0_date + session_time,
+            'SessionTime': session_time,
+            'Time': session_time,
+            'X': 40000 * np.cos(phase) + 8000 * np.cos(3 * phase),
+            'Y': 25000 * np.sin(phase) + 4000 * np.sin(2 * phase),
+            'Z': np.zeros(len(t)),
+            'Status': 'OnTrack',
+            'Source': 'pos',
+        }, session=self, driver=number)
+
+    def load(self, **kwargs):
+        # Everything is already in memory; the tiers are only recorded
+        self.load_calls.append(kwargs)
+
+
+def install(session_factory):
+    # Routes fastf1.get_session through `session_factory(year, round, type)`; returns an undo callable
+    import fastf1
+
+    original = fastf1.get_session
+
+    def get_session(year, round_number, session_type, *args, **kwargs):
+        return session_factory(year, round_number, session_type)
+
+    fastf1.get_session = get_session
+    return lambda: setattr(fastf1, 'get_session', original)
+
+def install_sessions(store_dir=None, **kwargs):
+    # install() for another process: every get_session builds a SyntheticSession(**kwargs),
+    # standing in for FastF1's parse. Picklable through functools.partial, e.g. as a DataWorker setup.
+    from logic import telemetry_store
+
+    if store_dir is not None:
+        telemetry_store.STORE_DIR = store_dir
+    return install(lambda *key: SyntheticSession(**kwargs))
@@ -0,0 +1,33 @@
+import argparse
+import json
+import sys
+
+from logic.exporter import parse_job, render_jobs
+from logic.telemetry_loader import CACHE_DIR
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render RacePulse telemetry charts and CSVs without the UI.")
+    parser.add_argument('jobs', nargs='*',
+                        help='year,round,session[,DRIVER[@LAP],...] e.g. 2023,5,Q,VER,HAM@12')
+    parser.add_argument('--spec', help='JSON file with a list of {year, round, session, drivers, laps} jobs')
+    parser.add_argument('--out', default='exports', help='output directory (default: exports)')
+    parser.add_argument('--format', dest='formats', nargs='+', default=['png'], choices=['png', 'svg', 'pdf'])
+    parser.add_argument('--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--cache', default=CACHE_DIR, help='FastF1 cache directory')
+    args = parser.parse_args(argv)
+
+    jobs = [parse_job(text) for text in args.jobs]
+    if args.spec:
+        with open(args.spec) as f:
+            jobs.extend(dict({'drivers': [], 'laps': {}}, **job) for job in json.load(f))
+    if not jobs:
+        parser.error("no jobs given")
+
+    written = render_jobs(jobs, args.out, args.formats, args.workers, args.cache)
+    print(f"Wrote {len(written)} files to {args.out}")
+    return 0 if written else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,403 @@
+import json
+import os
+import pickle
+import shutil
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import fastf1
+
+from logic import telemetry_store
+from logic.telemetry_loader import (
+    CACHE_DIR, enable_cache, ensure_telemetry, load_session_data, make_session_key, persist_session
+)
+from logic.tracing import span
+
+SESSION_TYPES = ['FP1', 'FP2', 'FP3', 'SQ', 'SS', 'S', 'Q', 'R']
+# Every worker process has its own FastF1 rate limiter, so the API sees up to this many
+# times FastF1's per-process request rate
+DEFAULT_WORKERS = 4
+HTTP_CACHE = 'fastf1_http_cache.sqlite'
+HTTP_TABLES = ('responses', 'redirects')
+# Pickles FastF1 writes for the lap and telemetry tiers; without all of them a load goes online
+REQUIRED_PICKLES = ('session_info', 'driver_info', '_extended_timing_data', 'timing_app_data',
+                    'car_data', 'position_data')
+
+
+def job_name(job):
+    year, round_number, session_type = job['key']
+    return f"{year} R{round_number:02d} {session_type} ({job['event']})"
+
+def season_sessions(years, session_types=SESSION_TYPES):
+    # Every session held in the given seasons, with the directory FastF1 caches it under.
+    # Testing has no round number and is skipped; identifiers that alias one session
+    # (sprint naming changed twice) are kept once.
+    jobs = []
+    for year in years:
+        try:
+            with span('fastf1.schedule', year=year):
+                schedule = fastf1.get_event_schedule(int(year), include_testing=False)
+        except Exception as e:
+            print(f"[Warm] No schedule for {year}: {e}")
+            continue
+        for _, event in schedule.iterrows():
+            seen = set()
+            for session_type in session_types:
+                try:
+                    session = event.get_session(session_type)
+                except ValueError:
+                    continue  # not held at this event
+                if session.api_path in seen:
+                    continue
+                seen.add(session.api_path)
+                jobs.append({'key': make_session_key(year, event['RoundNumber'], session_type),
+                             'event': event['EventName'], 'api_path': session.api_path})
+    return jobs
+
+def store_dir(cache_dir):
+    # The RacePulse store lives inside the FastF1 cache it was converted from, as in the app
+    return os.path.join(cache_dir, os.path.basename(telemetry_store.STORE_DIR))
+
+def pickle_dir(cache_dir, api_path):
+    # Same mapping as FastF1's Cache._get_cache_file_path: the leading '/static/' is dropped
+    return os.path.join(cache_dir, api_path[len('/static/'):])
+
+
+def warm_session(job, cache_dir=CACHE_DIR, offline=False, persist=True):
+    # Runs in a worker process, like exporter.render_job
+    fastf1.set_log_level('WARNING')
+    enable_cache(cache_dir)
+    telemetry_store.STORE_DIR = store_dir(cache_dir)  # persist_session() writes there
+    if offline:
+        fastf1.Cache.offline_mode(True)
+
+    key = job['key']
+    if persist and telemetry_store.has_session(key):
+        return 'already stored'
+
+    start = time.perf_counter()
+    try:
+        session = load_session_data(*key)
+        ensure_telemetry(session)
+        if session.laps.empty or not session.car_data:
+            raise RuntimeError("no lap or car data")
+    except SystemExit:
+        # FastF1's cache layer calls exit() when a download it needs fails
+        raise RuntimeError("download failed") from None
+    if persist:
+        persist_session(session)
+    where = 'stored' if telemetry_store.has_session(key) else 'cached'
+    return f"{where} in {time.perf_counter() - start:.1f}s"
+
+def warm(jobs, cache_dir=CACHE_DIR, workers=DEFAULT_WORKERS, offline=False, persist=True):
+    # -> {session key: status}; a failed session does not stop the others
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(warm_session, job, cache_dir, offline, persist): job for job in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            job = futures[future]
+            try:
+                status = future.result()
+            except Exception as e:
+                status = f"failed: {e}"
+            results[job['key']] = status
+            print(f"[Warm] {done}/{len(jobs)} {job_name(job)}: {status}")
+    return results
+
+
+def pickle_status(path):
+    # 'ok', 'stale' (written by another FastF1 parser version, so FastF1 downloads it again)
+    # or 'corrupt'. Unpickles the file, which runs whatever code it names: only for pickles
+    # FastF1 wrote on this machine or a mirror the user trusts (see ingest_mirror).
+    try:
+        with open(path, 'rb') as f:
+            cached = pickle.load(f)
+        version = cached['version']
+    except Exception as e:  # whatever unpickling raises, FastF1 treats the file as missing
+        return f"corrupt ({type(e).__name__})"
+    # Private to FastF1; without it no version can be confirmed, so nothing counts as current
+    expected = getattr(fastf1.Cache, '_API_CORE_VERSION', None)
+    return 'ok' if expected is not None and version == expected else 'stale'
+
+def store_status(path):
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            version = json.load(f).get('version')
+    except (OSError, ValueError) as e:
+        return f"corrupt (meta.json: {e})"
+    if version != telemetry_store.STORE_VERSION:
+        return 'stale'
+    try:
+        telemetry_store.check_session_dir(path)
+    except ValueError as e:
+        return f"corrupt ({e})"
+    return 'ok'
+
+def http_cache_status(path):
+    try:
+        with sqlite3.connect(path) as db:
+            result = db.execute('PRAGMA quick_check').fetchone()[0]
+    except sqlite3.Error as e:
+        return f"corrupt ({e})"
+    return 'ok' if result == 'ok' else f"corrupt ({result})"
+
+def cached_pickles(cache_dir, years=None):
+    paths = []
+    for year in year_dirs(cache_dir, years):
+        for root, _, files in os.walk(os.path.join(cache_dir, year)):
+            paths.extend(os.path.join(root, name) for name in files if name.endswith('.ff1pkl'))
+    return sorted(paths)
+
+def year_dirs(directory, years=None):
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return []
+    return [name for name in names
+            if name.isdigit() and os.path.isdir(os.path.join(directory, name))
+            and (not years or int(name) in years)]
+
+def scan_cache(cache_dir=CACHE_DIR, workers=DEFAULT_WORKERS):
+    # -> {path: status} for every FastF1 pickle, stored session and the HTTP cache.
+    # Unpickling car data is the slow part, so pickles are checked in parallel.
+    pickles = cached_pickles(cache_dir)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        statuses = dict(zip(pickles, pool.map(pickle_status, pickles, chunksize=8)))
+    store = store_dir(cache_dir)
+    for key in telemetry_store.stored_keys(store):
+        path = telemetry_store.session_dir(key, store)
+        statuses[path] = store_status(path)
+    http_cache = os.path.join(cache_dir, HTTP_CACHE)
+    if os.path.exists(http_cache):
+        statuses[http_cache] = http_cache_status(http_cache)
+    return statuses
+
+def session_status(job, cache_dir, statuses):
+    # -> (status, detail) with status one of stored, cached, partial, missing, stale, corrupt;
+    # a healthy stored session is all the app needs, whatever FastF1 has cached
+    store = statuses.get(telemetry_store.session_dir(job['key'], store_dir(cache_dir)))
+    if store == 'ok':
+        return 'stored', ''
+
+    directory = pickle_dir(cache_dir, job['api_path'])
+    found = {name: statuses.get(os.path.join(directory, f"{name}.ff1pkl")) for name in REQUIRED_PICKLES}
+    found = {name: status for name, status in found.items() if status is not None}
+    corrupt = [name for name, status in found.items() if status.startswith('corrupt')]
+    stale = [name for name, status in found.items() if status == 'stale']
+    missing = [name for name in REQUIRED_PICKLES if name not in found]
+
+    if corrupt or (store or '').startswith('corrupt'):
+        return 'corrupt', ', '.join(corrupt) or store
+    if stale:
+        return 'stale', ', '.join(stale)
+    if not missing:
+        return 'cached', ''
+    if found:
+        return 'partial', f"missing {', '.join(missing)}"
+    return 'missing', ''
+
+
+def copy_file(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    tmp = dst + '.tmp'
+    shutil.copyfile(src, tmp)
+    os.replace(tmp, dst)
+
+def merge_http_cache(source, target):
+    # Adds the mirror's cached responses to ours; rows we already have are kept.
+    # Returns the number of rows added.
+    if not os.path.exists(source):
+        return 0
+    if not os.path.exists(target):
+        copy_file(source, target)
+        with sqlite3.connect(target) as db:
+            return sum(db.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                       for table in tables(db, 'main') if table in HTTP_TABLES)
+
+    db = sqlite3.connect(target)
+    try:
+        db.execute('ATTACH DATABASE ? AS mirror', (source,))
+        before = db.total_changes
+        for table in set(tables(db, 'main')) & set(tables(db, 'mirror')) & set(HTTP_TABLES):
+            db.execute(f'INSERT OR IGNORE INTO main.{table} SELECT * FROM mirror.{table}')
+        db.commit()
+        added = db.total_changes - before
+        db.execute('DETACH DATABASE mirror')
+    finally:
+        db.close()
+    return added
+
+def tables(db, schema):
+    return [row[0] for row in db.execute(f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table'")]
+
+def ingest_mirror(mirror, cache_dir=CACHE_DIR, years=None, workers=DEFAULT_WORKERS, trusted=False):
+    # Pulls stored sessions, and with `trusted` FastF1 pickles and HTTP responses, from another
+    # RacePulse cache directory (a colleague's resources/cache, a USB stick) instead of the
+    # network. Everything is checked before it is copied, so a damaged mirror cannot break
+    # the local cache; a local file with a different size is assumed damaged and replaced.
+    #
+    # Trust boundary: stored sessions are plain .npy arrays and JSON, read without pickle,
+    # so any mirror's can be checked and taken. FastF1 pickles, and the HTTP responses
+    # requests-cache pickles into its database, can only be checked by unpickling them and
+    # are unpickled again by FastF1 later: from a mirror that is not the user's own, that
+    # runs whatever code the files carry. They are only taken when the caller vouches for
+    # the mirror, and listed as skipped otherwise.
+    # Returns (files copied, [skipped mirror paths]).
+    candidates = []
+    for src in cached_pickles(mirror, years) if trusted else []:
+        dst = os.path.join(cache_dir, os.path.relpath(src, mirror))
+        if not os.path.exists(dst) or os.path.getsize(dst) != os.path.getsize(src):
+            candidates.append((src, dst))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(pickle_status, [src for src, _ in candidates], chunksize=8))
+    copied, skipped = 0, []
+    for (src, dst), status in zip(candidates, statuses):
+        if status != 'ok':
+            skipped.append(src)
+            continue
+        copy_file(src, dst)
+        copied += 1
+
+    mirror_store, store = store_dir(mirror), store_dir(cache_dir)
+    for key in telemetry_store.stored_keys(mirror_store):
+        if (years and key[0] not in years) or telemetry_store.has_session(key, store):
+            continue
+        src = telemetry_store.session_dir(key, mirror_store)
+        if store_status(src) != 'ok':
+            skipped.append(src)
+            continue
+        dst = telemetry_store.session_dir(key, store)
+        shutil.rmtree(dst + '.tmp', ignore_errors=True)
+        shutil.copytree(src, dst + '.tmp')
+        shutil.rmtree(dst, ignore_errors=True)
+        os.replace(dst + '.tmp', dst)
+        copied += 1
+
+    if not trusted:
+        skipped.extend(cached_pickles(mirror, years))
+        if os.path.exists(os.path.join(mirror, HTTP_CACHE)):
+            skipped.append(os.path.join(mirror, HTTP_CACHE))
+        return copied, skipped
+    try:
+        rows = merge_http_cache(os.path.join(mirror, HTTP_CACHE), os.path.join(cache_dir, HTTP_CACHE))
+        print(f"[Mirror] {rows} HTTP responses added")
+    except sqlite3.Error as e:
+        skipped.append(os.path.join(mirror, HTTP_CACHE))
+        print(f"[Mirror] Could not merge the HTTP cache: {e}")
+    return copied, skipped
+
+
+def path_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+def last_used(path):
+    # Newest access or write of any file in the entry; relatime still moves atime about daily
+    newest = 0.0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            newest = max(newest, stat.st_atime, stat.st_mtime)
+    return newest
+
+def cache_entries(cache_dir=CACHE_DIR):
+    # One entry per FastF1 session directory (<year>/<event>/<session>) and per stored session
+    entries = []
+    for year in year_dirs(cache_dir):
+        year_path = os.path.join(cache_dir, year)
+        for event in os.listdir(year_path):
+            event_path = os.path.join(year_path, event)
+            if os.path.isdir(event_path):
+                entries.extend(os.path.join(event_path, session) for session in os.listdir(event_path)
+                               if os.path.isdir(os.path.join(event_path, session)))
+    store = store_dir(cache_dir)
+    entries.extend(telemetry_store.session_dir(key, store) for key in telemetry_store.stored_keys(store))
+    return entries
+
+def cache_size(cache_dir=CACHE_DIR):
+    return path_size(cache_dir)  # the store is inside it
+
+def remove(path):
+    size = path_size(path)
+    if os.path.isdir(path):
+        shutil.rmtree(path, ignore_errors=True)
+    else:
+        try:
+            os.remove(path)
+        except OSError:
+            return 0
+    return size
+
+def compact(cache_dir=CACHE_DIR, statuses=None, workers=DEFAULT_WORKERS):
+    # Drops what can never be read again: interrupted writes, stale or corrupt pickles and
+    # stored sessions (FastF1 and the store would fetch those afresh anyway), then VACUUMs
+    # the HTTP cache. Expired HTTP responses are kept: offline they are all there is.
+    # Returns bytes freed.
+    if statuses is None:
+        statuses = scan_cache(cache_dir, workers)
+    freed = 0
+    for path, status in statuses.items():
+        if status != 'ok' and not path.endswith(HTTP_CACHE):
+            freed += remove(path)
+
+    for root, dirs, files in os.walk(cache_dir):  # the store included
+        for name in dirs + files:
+            if name.endswith('.tmp') or name.endswith('.tmp.npy'):
+                freed += remove(os.path.join(root, name))
+
+    http_cache = os.path.join(cache_dir, HTTP_CACHE)
+    if os.path.exists(http_cache) and statuses.get(http_cache, 'ok') == 'ok':
+        before = os.path.getsize(http_cache)
+        db = sqlite3.connect(http_cache)
+        try:
+            db.execute('VACUUM')
+        finally:
+            db.close()
+        freed += before - os.path.getsize(http_cache)
+    return freed
+
+def prune(cache_dir=CACHE_DIR, budget=None):
+    # Removes the least recently used sessions until the cache fits in `budget` bytes.
+    # Returns ([removed paths], bytes freed).
+    total = cache_size(cache_dir)
+    if budget is None or total <= budget:
+        return [], 0
+
+    removed, freed = [], 0
+    for path in sorted(cache_entries(cache_dir), key=last_used):
+        if total - freed <= budget:
+            break
+        freed += remove(path)
+        removed.append(path)
+        event_path = os.path.dirname(path)
+        if event_path != store_dir(cache_dir) and os.path.isdir(event_path) and not os.listdir(event_path):
+            os.rmdir(event_path)
+    return removed, freed
+
+def parse_size(text):
+    # "20G", "512M", "1.5T" or plain bytes
+    text = str(text).strip().upper().rstrip('B')
+    units = {'K': 1 << 10, 'M': 1 << 20, 'G': 1 << 30, 'T': 1 << 40}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(float(text))
+
+def format_size(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} TB"
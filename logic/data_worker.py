@@ -0,0 +1,271 @@
+import atexit
+import itertools
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from logic import telemetry_store
+from logic.telemetry_loader import (
+    CACHE_DIR, LoadCancelled, enable_cache, ensure_telemetry, load_fastf1_session, make_session_key,
+    open_stored_session, progress_reporter,
+)
+from logic.tracing import span
+
+POLL_SECONDS = 0.05  # how often a waiting caller checks whether it was cancelled
+WORKER_SESSIONS = 2  # FastF1 sessions the worker keeps for their telemetry tier
+
+
+# --- Worker process -------------------------------------------------------------------
+# FastF1 parsing (pandas-heavy and GIL-bound for seconds at a time) runs in one spawned
+# process. The GUI gets the lap tier as plain DataFrames and the telemetry tier as the
+# store's channel arrays, copied once into shared memory the GUI allocated, so neither a
+# long parse nor a crash inside FastF1 can stall or take down the event loop.
+
+worker_state = {}
+
+
+def init_worker(cache_dir, progress_queue, cancel_value, setup=None):
+    worker_state.update(progress=progress_queue, cancel=cancel_value, sessions=OrderedDict(), columns={})
+    if setup is not None:
+        setup()
+    if cache_dir:
+        enable_cache(cache_dir)
+
+def worker_reporter(job):
+    state = worker_state
+    return progress_reporter(lambda stage, percent: state['progress'].put((job, stage, percent)),
+                             lambda: state['cancel'].value == job)
+
+def worker_ping(job):
+    return os.getpid()
+
+def worker_session(job, key):
+    sessions = worker_state['sessions']
+    if key in sessions:
+        sessions.move_to_end(key)
+        return sessions[key]
+    session = load_fastf1_session(key, worker_reporter(job))
+    sessions[key] = session
+    while len(sessions) > WORKER_SESSIONS:
+        sessions.popitem(last=False)
+    return session
+
+def worker_load(job, key):
+    # The lap tier, without FastF1's Session back-references so it pickles small
+    import pandas as pd  # loaded in the worker anyway; the GUI imports it on unpickling
+
+    session = worker_session(job, key)
+    return pd.DataFrame(session.laps), pd.DataFrame(session.results)
+
+def worker_telemetry(job, key):
+    # Builds the store columns and returns their layout; worker_fill() hands them over
+    session = worker_session(job, key)
+    ensure_telemetry(session)
+    columns, index = telemetry_store.build_columns(session)
+    worker_state['columns'][key] = (columns, index, [str(a) for a in session.results['Abbreviation']])
+    return {name: (data.shape, data.dtype.str) for name, data in columns.items()}, index
+
+def worker_fill(job, key, blocks):
+    columns = worker_state['columns'][key][0]
+    try:
+        for name, block_name in blocks.items():
+            data = columns[name]
+            block = SharedMemory(name=block_name)
+            try:
+                view = np.ndarray(data.shape, dtype=data.dtype, buffer=block.buf)
+                view[:] = data
+                del view
+            finally:
+                block.close()
+    except BaseException:
+        # No worker_persist() follows a failed fill, so the columns would be held for good
+        worker_state['columns'].pop(key, None)
+        raise
+
+def worker_discard(job, key):
+    worker_state['columns'].pop(key, None)
+
+def worker_persist(job, key):
+    columns, index, results = worker_state['columns'].pop(key)
+    if telemetry_store.has_session(key):
+        return
+    try:
+        telemetry_store.write_columns(key, columns, index, results)
+    except Exception as e:
+        print(f"[Store] Could not persist {key}: {e}")
+
+
+# --- GUI process ----------------------------------------------------------------------
+
+# Unlinked as soon as the worker has filled it; the mapping lives on until the session
+# holding its arrays is dropped
+class SharedBlock(SharedMemory):
+    def __del__(self):
+        try:
+            super().__del__()
+        except (OSError, BufferError):
+            pass
+
+
+class DataWorker:
+    def __init__(self, cache_dir=CACHE_DIR, setup=None):
+        self.cache_dir = cache_dir
+        self.setup = setup  # picklable callable run first in the worker, e.g. by the benchmarks
+        self.context = multiprocessing.get_context('spawn')  # forking a process running Qt is unsafe
+        self.lock = threading.Lock()
+        self.jobs = itertools.count(1)
+        self.callbacks = {}  # job -> progress callback
+        self.pool = None
+        self.progress_queue = None
+        self.cancel_value = None
+
+    def start(self):
+        with self.lock:
+            if self.pool is None:
+                self.launch()
+        return self
+
+    def launch(self):
+        if os.name == 'posix':
+            # Started before the worker so both share one tracker: blocks the worker
+            # attaches to are then not reported as leaked when it exits
+            resource_tracker.ensure_running()
+        self.progress_queue = self.context.Queue()
+        self.cancel_value = self.context.Value('q', 0)
+        self.pool = self.make_pool()
+        threading.Thread(target=self.forward_progress, name='data-worker-progress', daemon=True).start()
+        self.pool.submit(worker_ping, 0)  # spawns the process ahead of the first load
+        atexit.register(self.shutdown)
+
+    def make_pool(self):
+        return ProcessPoolExecutor(max_workers=1, mp_context=self.context, initializer=init_worker,
+                                   initargs=(self.cache_dir, self.progress_queue, self.cancel_value, self.setup))
+
+    def restart(self, pool):
+        with self.lock:
+            if self.pool is pool:
+                self.pool = self.make_pool()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self, wait=False):
+        if self.pool is None:
+            return
+        self.pool.shutdown(wait=wait, cancel_futures=not wait)
+        self.pool = None
+        self.progress_queue.put(None)
+
+    def forward_progress(self):
+        progress_queue = self.progress_queue
+        while True:
+            try:
+                message = progress_queue.get()
+            except Exception:  # the queue is torn down under us at interpreter exit
+                return
+            if message is None:
+                return
+            job, stage, percent = message
+            callback = self.callbacks.get(job)
+            if callback is not None:
+                callback(stage, percent)
+
+    def submit(self, fn, *args):
+        if self.pool is None:
+            self.start()  # a load that came before whoever starts the worker did
+        job = next(self.jobs)
+        return job, self.pool.submit(fn, job, *args)
+
+    def call(self, fn, *args, progress=None, is_cancelled=None):
+        # Runs fn(job, *args) in the worker and waits without blocking cancellation; a
+        # crashed worker is replaced and the call fails like any other load error
+        pool = self.start().pool
+        job = None
+        try:
+            job, future = self.submit(fn, *args)
+            if progress:
+                self.callbacks[job] = progress
+            while True:
+                if is_cancelled and is_cancelled():
+                    if not future.cancel():
+                        self.cancel_value.value = job
+                    raise LoadCancelled(fn.__name__)
+                try:
+                    return future.result(timeout=POLL_SECONDS)
+                except FutureTimeout:
+                    continue
+        except BrokenProcessPool as e:
+            self.restart(pool)
+            raise RuntimeError(f"Data worker stopped unexpectedly and was restarted: {e}") from e
+        finally:
+            self.callbacks.pop(job, None)
+
+    def load_session(self, year, round_number, session_type, progress=None, is_cancelled=None):
+        # Drop-in for load_session_data: the store is still mapped in-process, since that
+        # is only a few file opens; anything that needs FastF1 goes to the worker
+        report = progress_reporter(progress, is_cancelled)
+        key = make_session_key(year, round_number, session_type)
+        session = open_stored_session(key, report)
+        if session is None:
+            with span('worker.load_laps'):
+                laps, results = self.call(worker_load, key, progress=progress, is_cancelled=is_cancelled)
+            session = WorkerSession(self, key, laps, results)
+        report("Done", 100)
+        return session
+
+
+# A session whose FastF1 objects live in the worker. It reads like a StoredSession; its
+# telemetry tier arrives through load(), which is what ensure_telemetry() calls.
+class WorkerSession(telemetry_store.StoredSession):
+    def __init__(self, worker, key, laps, results):
+        super().__init__(key, laps, results)
+        self.worker = worker
+        self.telemetry_lock = threading.Lock()
+        self.blocks = []
+
+    def load(self, telemetry=False, **tiers):
+        if not telemetry or self.channels is not None:
+            return
+        key = self.registry_key
+        with span('worker.build_columns'):
+            layout, index = self.worker.call(worker_telemetry, key)
+
+        blocks = {}
+        try:
+            for name, (shape, dtype) in layout.items():
+                blocks[name] = SharedBlock(create=True, size=max(int(np.prod(shape)) * np.dtype(dtype).itemsize, 1))
+        except BaseException:
+            # Never filled: the worker is still holding the columns for this key
+            for block in blocks.values():
+                block.unlink()
+            try:
+                self.worker.submit(worker_discard, key)
+            except (BrokenProcessPool, RuntimeError):
+                pass  # gone with the worker
+            raise
+        try:
+            with span('worker.fill'):
+                self.worker.call(worker_fill, key, {name: block.name for name, block in blocks.items()})
+        finally:
+            for block in blocks.values():
+                block.unlink()
+
+        self.blocks = list(blocks.values())
+        self.offsets = telemetry_store.lap_offsets(index['driver'], index['number'], index['start'], index['end'])
+        self.channels = {
+            column: np.ndarray(layout[name][0], dtype=layout[name][1], buffer=blocks[name].buf)
+            for name, (column, _) in telemetry_store.CHANNELS.items()
+        }
+        # Written by the worker after this returns, so the next open maps the store instead
+        try:
+            self.worker.submit(worker_persist, key)
+        except (BrokenProcessPool, RuntimeError) as e:
+            print(f"[Store] Could not persist {key}: {e}")
+
+
+data_worker = DataWorker()
@@ -0,0 +1,107 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from logic.telemetry_loader import (
+    enable_cache, load_session_data, ensure_telemetry, persist_session, get_drivers,
+    get_driver_laps, pick_fastest_lap, get_lap_telemetry
+)
+from logic.plotter import CHANNELS, TelemetryPlotter
+from logic.resampling import delta_traces
+
+CSV_COLUMNS = ['Time', 'Distance', 'Speed', 'Throttle', 'Brake', 'nGear']
+
+
+def parse_job(text):
+    # "2023,5,Q" or "2023,5,Q,VER,HAM" or "2023,5,Q,VER@12,HAM" (driver@lap, fastest otherwise)
+    year, round_number, session_type, *drivers = [part.strip() for part in text.split(',')]
+    job = {'year': int(year), 'round': int(round_number), 'session': session_type,
+           'drivers': [], 'laps': {}}
+    for driver in drivers:
+        name, _, lap = driver.partition('@')
+        job['drivers'].append(name)
+        if lap:
+            job['laps'][name] = int(lap)
+    return job
+
+def make_canvases(count, figsize=(10, 4), dpi=150):
+    canvases = []
+    for _ in range(count):
+        canvas = FigureCanvasAgg(Figure(figsize=figsize, dpi=dpi, tight_layout=True))
+        canvas.ax = canvas.figure.add_subplot(111)
+        canvases.append(canvas)
+    return canvases
+
+def job_name(job):
+    drivers = '-'.join(job.get('drivers') or ['ALL'])
+    return f"{job['year']}_{job['round']:02d}_{job['session']}_{drivers}"
+
+def render_job(job, out_dir, formats=('png',), cache_dir=None):
+    # Runs in a worker process: no Qt, Agg canvases only
+    if cache_dir:
+        enable_cache(cache_dir)
+
+    session = load_session_data(job['year'], job['round'], job['session'])
+    ensure_telemetry(session)
+    persist_session(session)
+
+    drivers = job.get('drivers') or get_drivers(session)
+    series = {}
+    labels = {}
+    for driver in drivers:
+        lap_number = job.get('laps', {}).get(driver)
+        if lap_number is None:
+            fastest = pick_fastest_lap(get_driver_laps(session, driver))
+            if fastest is None:
+                print(f"[Export] {job_name(job)}: no timed lap for {driver}")
+                continue
+            lap_number = fastest['LapNumber']
+        labels[driver] = f"{driver} L{int(lap_number)}"
+        series[labels[driver]] = get_lap_telemetry(session, driver, lap_number)
+
+    if not series:
+        raise ValueError("no laps to export")
+
+    target = os.path.join(out_dir, job_name(job))
+    os.makedirs(target, exist_ok=True)
+    written = []
+
+    for label, tel in series.items():
+        path = os.path.join(target, f"{label.replace(' ', '_')}.csv")
+        pd.DataFrame({column: np.asarray(tel[column]) for column in CSV_COLUMNS if column in tel}).to_csv(path, index=False)
+        written.append(path)
+
+    comparison = len(series) > 1
+    canvases = make_canvases(len(CHANNELS) if comparison else len(CHANNELS) - 1)
+    plotter = TelemetryPlotter(canvases)
+    if comparison:
+        # Measured against the first driver's lap, as in the app
+        plotter.plot_comparison(series, delta_traces(series, reference=labels.get(drivers[0])))
+    else:
+        plotter.plot_lap(next(iter(series.values())))
+
+    for canvas, channel in zip(canvases, CHANNELS):
+        canvas.figure.suptitle(f"{job['year']} round {job['round']} {job['session']}: {', '.join(series)}")
+        for fmt in formats:
+            path = os.path.join(target, f"{channel[1].split()[0].lower()}.{fmt}")
+            canvas.figure.savefig(path)
+            written.append(path)
+    return written
+
+def render_jobs(jobs, out_dir, formats=('png',), workers=None, cache_dir=None):
+    written = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(render_job, job, out_dir, formats, cache_dir): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                files = future.result()
+                print(f"[Export] {job_name(job)}: {len(files)} files")
+                written.extend(files)
+            except Exception as e:
+                print(f"[Export] {job_name(job)} failed: {e}")
+    return written
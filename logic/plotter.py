@@ -1,62 +1,247 @@
-def plot_lap_telemetry(lap, speed_canvas, throttle_canvas, brake_canvas, gear_canvas):
-    tel = lap.get_car_data().add_distance()
-
-    speed_canvas.ax.clear()
-    speed_canvas.ax.plot(tel['Distance'], tel['Speed'], color='deepskyblue')
-    speed_canvas.ax.set(title='Speed vs Distance', xlabel='Distance (m)', ylabel='Speed (km/h)')
-    speed_canvas.ax.grid(True)
-    speed_canvas.draw()
-
-    throttle_canvas.ax.clear()
-    throttle_canvas.ax.plot(tel['Distance'], tel['Throttle'], color='lime')
-    throttle_canvas.ax.set(title='Throttle', xlabel='Distance (m)', ylabel='Throttle (%)')
-    throttle_canvas.ax.grid(True)
-    throttle_canvas.draw()
-
-    brake_canvas.ax.clear()
-    brake_canvas.ax.plot(tel['Distance'], tel['Brake'], color='red')
-    brake_canvas.ax.set(title='Brake', xlabel='Distance (m)', ylabel='Brake (boolean)')
-    brake_canvas.ax.grid(True)
-    brake_canvas.draw()
-
-    gear_canvas.ax.clear()
-    gear_canvas.ax.plot(tel['Distance'], tel['nGear'], color='orange')
-    gear_canvas.ax.set(title='Gear', xlabel='Distance (m)', ylabel='Gear')
-    gear_canvas.ax.grid(True)
-    gear_canvas.draw()
-
-def plot_comparison_telemetry(session, drivers, speed_canvas, throttle_canvas, brake_canvas, gear_canvas):
+import numpy as np
+from matplotlib import colormaps
+
+from logic.telemetry_loader import get_lap_telemetry, load_comparison_telemetry
+from logic.resampling import delta_traces
+from logic.tracing import span
+
+# (column, single-lap title, comparison title, single-lap ylabel, comparison ylabel, single-lap color)
+CHANNELS = [
+    ('Speed', 'Speed vs Distance', 'Speed Comparison', 'Speed (km/h)', 'Speed (km/h)', 'deepskyblue'),
+    ('Throttle', 'Throttle', 'Throttle Comparison', 'Throttle (%)', 'Throttle (%)', 'lime'),
+    ('Brake', 'Brake', 'Brake Comparison', 'Brake (boolean)', 'Brake (0/1)', 'red'),
+    ('nGear', 'Gear', 'Gear Comparison', 'Gear', 'Gear', 'orange'),
+    ('Delta', 'Delta', 'Delta to Reference', 'Delta (s)', 'Delta (s)', 'white'),
+]
+COMPARISON_COLORS = ['dodgerblue', 'orangered', 'limegreen', 'purple', 'gold']
+MIN_LOD_WIDTH = 200  # px, used before a canvas has been laid out
+
+
+def comparison_color(i, count):
+    # The original five colours for small comparisons, tab20 once the whole grid is on
+    if count <= len(COMPARISON_COLORS):
+        return COMPARISON_COLORS[i]
+    return colormaps['tab20'](i % 20)
+
+def is_canvas_visible(canvas):
+    # Qt canvases on a hidden tab report False; headless canvases are always "visible"
+    is_visible = getattr(canvas, 'isVisible', None)
+    return is_visible() if is_visible else True
+
+
+def downsample_minmax(x, y, x0, x1, width):
+    # Keeps the first, last, min and max sample of every pixel-wide bucket in the visible
+    # range, so brake spikes and gear steps survive while the point count tracks `width`
+    x = np.asarray(x)
+    y = np.asarray(y)
+    lo = max(np.searchsorted(x, x0, side='left') - 1, 0)
+    hi = min(np.searchsorted(x, x1, side='right') + 1, len(x))
+    n = hi - lo
+    width = max(int(width), 1)
+    if n <= 4 * width:
+        return x[lo:hi], y[lo:hi]
+
+    per_bucket = n // width
+    buckets = n // per_bucket
+    end = lo + buckets * per_bucket
+    grouped = y[lo:end].reshape(buckets, per_bucket)
+    starts = lo + np.arange(buckets) * per_bucket
+
+    idx = np.concatenate([
+        starts,
+        starts + grouped.argmin(axis=1),
+        starts + grouped.argmax(axis=1),
+        starts + per_bucket - 1,
+        np.arange(end, hi),
+    ])
+    idx = np.unique(idx)
+    return x[idx], y[idx]
+
+
+# Canvases may be attached after the plotter is built (None until then), e.g. when a tab
+# is first shown: the last plot is replayed onto them, and data is kept for every channel
+# either way so readouts work whatever has been drawn.
+class TelemetryPlotter:
+    def __init__(self, canvases):
+        self.canvases = list(canvases)
+        self.lines = [{} for _ in self.canvases]  # per canvas: series label -> Line2D
+        self.data = [{} for _ in self.canvases]  # per canvas: series label -> full-res (x, y)
+        self.modes = [None for _ in self.canvases]  # mode each canvas was last styled for
+        self.connections = [[] for _ in self.canvases]  # per canvas: (callback registry, cid)
+        self.mode = None
+        self.last = None  # (all_series, mode, delta) of the last plot
+        self.dirty = set()
+        self.suspended = False  # e.g. while a Playground panel is scrolled out of view
+        self.on_attach = []  # called with (index, canvas), e.g. by the crosshair
+        self.on_detach = []
+
+        for index, canvas in enumerate(self.canvases):
+            if canvas is not None:
+                self._connect(index, canvas)
+
+    def attach(self, index, canvas):
+        self.detach(index)
+        self.canvases[index] = canvas
+        self._connect(index, canvas)
+        for hook in self.on_attach:
+            hook(index, canvas)
+        if self.last is not None:
+            with span('plot.artists', mode=self.last[1], series=len(self.last[0])):
+                self._update_canvas(index, *self.last)
+
+    def detach(self, index):
+        # Leaves the canvas as it was before attach(), ready for someone else
+        canvas = self.canvases[index]
+        if canvas is None:
+            return
+        for hook in self.on_detach:
+            hook(index, canvas)
+        for registry, cid in self.connections[index]:
+            registry.disconnect(cid)
+        self.connections[index] = []
+        for line in self.lines[index].values():
+            line.remove()
+        self.lines[index] = {}
+        if canvas.ax.get_legend() is not None:
+            canvas.ax.get_legend().remove()
+        self.modes[index] = None
+        self.dirty.discard(canvas)
+        self.canvases[index] = None
+
+    def clear(self):
+        # Detaches every canvas and drops the plotted data
+        for index in range(len(self.canvases)):
+            self.detach(index)
+        self.data = [{} for _ in self.canvases]
+        self.last = None
+        self.mode = None
+
+    def _connect(self, index, canvas):
+        self.connections[index] = [
+            (canvas.ax.callbacks, canvas.ax.callbacks.connect('xlim_changed', lambda ax: self.refresh_lod(index))),
+            (canvas.callbacks, canvas.mpl_connect('resize_event', lambda event: self.refresh_lod(index))),
+        ]
+
+    def plot_lap(self, tel):
+        self._update({'lap': tel}, 'single', {})
+
+    def plot_comparison(self, series, delta=None, reference=None):
+        # `reference` is the label of the lap the delta is measured against, normally the
+        # first selected driver's
+        if delta is None and len(self.canvases) > 4:
+            delta = delta_traces(series, reference=reference)
+        self._update(series, 'comparison', delta or {})
+
+    def flush(self):
+        # Render canvases that changed while their tab was hidden or the plotter suspended
+        for canvas in self.canvases:
+            if canvas in self.dirty and self.can_draw(canvas):
+                self.dirty.discard(canvas)
+                canvas.draw_idle()
+
+    def suspend(self, suspended):
+        # Artists keep updating while suspended; only the draws wait, and catch up on resume
+        self.suspended = suspended
+        if not suspended:
+            self.flush()
+
+    def can_draw(self, canvas):
+        return not self.suspended and is_canvas_visible(canvas)
+
+    def refresh_lod(self, index):
+        ax = self.canvases[index].ax
+        x0, x1 = sorted(ax.get_xlim())
+        width = max(ax.bbox.width, MIN_LOD_WIDTH)
+        with span('plot.lod'):
+            for label, line in self.lines[index].items():
+                x, y = self.data[index][label]
+                line.set_data(*downsample_minmax(x, y, x0, x1, width))
+
+    def _update(self, all_series, mode, delta):
+        self.last = (all_series, mode, delta)
+        with span('plot.artists', mode=mode, series=len(all_series)):
+            for index in range(len(self.canvases)):
+                self._update_canvas(index, all_series, mode, delta)
+        self.mode = mode
+
+    def _update_canvas(self, index, all_series, mode, delta):
+        canvas, lines, data = self.canvases[index], self.lines[index], self.data[index]
+        column, single_title, comparison_title, single_ylabel, comparison_ylabel, single_color = CHANNELS[index]
+        series = delta if column == 'Delta' else all_series
+
+        for label in [label for label in data if label not in series]:
+            data.pop(label)
+        for label, tel in series.items():
+            data[label] = (np.asarray(tel['Distance'], dtype=float), np.asarray(tel[column], dtype=float))
+        if canvas is None:
+            return
+
+        ax = canvas.ax
+        labels_changed = set(lines) != set(series)
+        width = max(ax.bbox.width, MIN_LOD_WIDTH)
+
+        for label in [label for label in lines if label not in series]:
+            lines.pop(label).remove()
+
+        for i, label in enumerate(series):
+            color = single_color if mode == 'single' else comparison_color(i, len(series))
+            line = lines.get(label)
+            if line is None:
+                line, = ax.plot([], [], label=label)
+                lines[label] = line
+            # Reduced over the whole lap; autoscale below narrows it via xlim_changed
+            line.set_data(*downsample_minmax(*data[label], -np.inf, np.inf, width))
+            line.set_color(color)
+
+        if mode != self.modes[index]:
+            ax.set(title=single_title if mode == 'single' else comparison_title,
+                   xlabel='Distance (m)',
+                   ylabel=single_ylabel if mode == 'single' else comparison_ylabel)
+            ax.grid(True)
+
+        if mode == 'comparison' and series and (labels_changed or mode != self.modes[index]):
+            # A fixed corner: 'best' searches every line for a spot, and the legend has to stay
+            # put in the background cached while zooming
+            ax.legend(loc='upper right', ncol=1 if len(series) <= 5 else 2,
+                      fontsize='small' if len(series) > 5 else None)
+        elif (mode == 'single' or not series) and ax.get_legend() is not None:
+            ax.get_legend().remove()
+        self.modes[index] = mode
+
+        # New data resets any zoom, as a fresh plot would
+        ax.relim()
+        ax.set_autoscale_on(True)
+        ax.autoscale_view()
+        self._request_draw(canvas)
+
+    def _request_draw(self, canvas):
+        if self.can_draw(canvas):
+            self.dirty.discard(canvas)
+            canvas.draw_idle()
+        else:
+            self.dirty.add(canvas)
+
+
+def get_plotter(speed_canvas, throttle_canvas, brake_canvas, gear_canvas, delta_canvas=None):
+    plotter = getattr(speed_canvas, 'plotter', None)
+    if plotter is None:
+        canvases = [speed_canvas, throttle_canvas, brake_canvas, gear_canvas]
+        if delta_canvas is not None:
+            canvases.append(delta_canvas)
+        plotter = TelemetryPlotter(canvases)
+        speed_canvas.plotter = plotter
+    return plotter
+
+def plot_lap_telemetry(session, driver, lap_number, speed_canvas, throttle_canvas, brake_canvas, gear_canvas):
+    tel = get_lap_telemetry(session, driver, lap_number)
+    get_plotter(speed_canvas, throttle_canvas, brake_canvas, gear_canvas).plot_lap(tel)
+
+def plot_comparison_telemetry(session, drivers, speed_canvas, throttle_canvas, brake_canvas, gear_canvas,
+                              delta_canvas=None):
     if not drivers:
         return
 
-    colors = ['dodgerblue', 'orangered', 'limegreen', 'purple', 'gold']
-
-    # Clear all
-    for canvas in [speed_canvas, throttle_canvas, brake_canvas, gear_canvas]:
-        canvas.ax.clear()
-
-    for i, driver in enumerate(drivers):
-        try:
-            lap = session.laps.pick_driver(driver).pick_fastest()
-            tel = lap.get_car_data().add_distance()
-            c = colors[i % len(colors)]
-
-            speed_canvas.ax.plot(tel['Distance'], tel['Speed'], label=driver, color=c)
-            throttle_canvas.ax.plot(tel['Distance'], tel['Throttle'], label=driver, color=c)
-            brake_canvas.ax.plot(tel['Distance'], tel['Brake'], label=driver, color=c)
-            gear_canvas.ax.plot(tel['Distance'], tel['nGear'], label=driver, color=c)
-
-        except Exception as e:
-            print(f"[Comparison Plot Error] {driver}: {e}")
-
-    for canvas, title, ylab in zip(
-        [speed_canvas, throttle_canvas, brake_canvas, gear_canvas],
-        ["Speed Comparison", "Throttle Comparison", "Brake Comparison", "Gear Comparison"],
-        ["Speed (km/h)", "Throttle (%)", "Brake (0/1)", "Gear"]):
-
-        canvas.ax.set_title(title)
-        canvas.ax.set_xlabel("Distance (m)")
-        canvas.ax.set_ylabel(ylab)
-        canvas.ax.legend()
-        canvas.ax.grid(True)
-        canvas.draw()
+    series = load_comparison_telemetry(session, drivers)
+    delta = delta_traces(series, reference=drivers[0]) if delta_canvas is not None else None
+    get_plotter(speed_canvas, throttle_canvas, brake_canvas, gear_canvas,
+                delta_canvas).plot_comparison(series, delta)
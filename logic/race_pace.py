@@ -0,0 +1,205 @@
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection, PolyCollection
+
+from logic.plotter import comparison_color, is_canvas_visible
+from logic.telemetry_cache import telemetry_cache
+from logic.telemetry_loader import session_cache_key
+from logic.telemetry_store import lap_column
+from logic.tracing import span, traced
+
+ROLLING_LAPS = 5
+PACE_CUTOFF = 1.07  # laps slower than 107% of the driver's median clean lap are not race pace
+MIN_FIT_LAPS = 3
+FUEL_CORRECTION = 0.06  # s per lap gained from fuel burn-off, added back before fitting degradation
+NEUTRALISED = '[4567]'  # TrackStatus codes for safety car, red flag and VSC
+WHISKER_IQR = 1.5
+BOX_WIDTH = 0.3  # half width, in driver slots
+
+
+def race_pace(laps, window=ROLLING_LAPS, fuel_correction=FUEL_CORRECTION):
+    # Lap-time analytics for every driver, as grouped operations over session.laps:
+    #   'laps'    one row per lap: Seconds, Stint, TyreLife, Clean and a rolling median of clean laps
+    #   'stints'  one row per (driver, stint): laps, compound, median pace and a linear fit of
+    #             fuel-corrected lap time against tyre age (Slope is degradation in s per lap)
+    #   'drivers' ordered by median clean pace
+    #   'distribution' box plot statistics of clean laps per driver, in that order
+    # Clean laps exclude lap 1, in/out laps, laps under SC/VSC/red flag and anything slower
+    # than PACE_CUTOFF of the driver's median.
+    pit_in = lap_column(laps, 'PitInTime', np.nan)
+    pit_out = lap_column(laps, 'PitOutTime', np.nan)
+    frame = pd.DataFrame({
+        'Driver': np.asarray(laps['Driver'], dtype=str),
+        'LapNumber': lap_column(laps, 'LapNumber', np.nan),
+        'Seconds': lap_column(laps, 'LapTime', np.nan),
+        'Stint': lap_column(laps, 'Stint', np.nan),
+        'Compound': lap_column(laps, 'Compound', ''),
+        'TyreLife': lap_column(laps, 'TyreLife', np.nan),
+        'PitOut': ~np.isnan(pit_out),
+        'Pit': ~np.isnan(pit_in) | ~np.isnan(pit_out),
+        'Neutralised': pd.Series(lap_column(laps, 'TrackStatus', '')).str.contains(NEUTRALISED).to_numpy(),
+    }).sort_values(['Driver', 'LapNumber'], kind='stable', ignore_index=True)
+    driver = frame['Driver']
+
+    # FastF1's stint and tyre age where it has them, otherwise counted from pit-out laps
+    frame['Stint'] = frame['Stint'].fillna(frame['PitOut'].astype(int).groupby(driver).cumsum() + 1)
+    frame['TyreLife'] = frame['TyreLife'].fillna(frame.groupby(['Driver', 'Stint']).cumcount() + 1.0)
+
+    clean = frame['Seconds'].notna() & ~frame['Pit'] & ~frame['Neutralised'] & (frame['LapNumber'] > 1)
+    median = frame['Seconds'].where(clean).groupby(driver).transform('median')
+    clean &= frame['Seconds'] <= PACE_CUTOFF * median
+    frame['Clean'] = clean
+    pace = frame['Seconds'].where(clean)
+    frame['Rolling'] = (pace.groupby(driver).rolling(window, min_periods=1, center=True).median()
+                        .reset_index(level=0, drop=True))
+
+    # Least squares per stint from grouped sums: slope = (nΣxy - ΣxΣy) / (nΣx² - (Σx)²)
+    age = frame['TyreLife'].where(clean)
+    corrected = pace + fuel_correction * (frame['LapNumber'] - 1)
+    sums = pd.DataFrame({'Driver': driver, 'Stint': frame['Stint'], 'n': clean.astype(int),
+                         'x': age, 'y': corrected, 'xy': age * corrected, 'xx': age * age}
+                        ).groupby(['Driver', 'Stint'], sort=False).sum()
+    denominator = sums['n'] * sums['xx'] - sums['x'] ** 2
+    fit = (sums['n'] >= MIN_FIT_LAPS) & (denominator > 0)
+    slope = ((sums['n'] * sums['xy'] - sums['x'] * sums['y']) / denominator).where(fit)
+
+    stints = frame.groupby(['Driver', 'Stint'], sort=False).agg(
+        Compound=('Compound', 'first'), FirstLap=('LapNumber', 'min'), LastLap=('LapNumber', 'max'),
+        Laps=('LapNumber', 'size'), FirstAge=('TyreLife', 'min'), LastAge=('TyreLife', 'max'),
+    )
+    stints['CleanLaps'] = sums['n']
+    stints['MedianSeconds'] = pace.groupby([driver, frame['Stint']], sort=False).median()
+    stints['Slope'] = slope
+    stints['Intercept'] = (sums['y'] - slope * sums['x']) / sums['n']
+
+    # Tukey box plot: whiskers reach the furthest clean lap within WHISKER_IQR of the box
+    quartiles = pace.groupby(driver).quantile([0.25, 0.5, 0.75]).unstack()
+    distribution = pd.DataFrame({'Q1': quartiles[0.25], 'Median': quartiles[0.5], 'Q3': quartiles[0.75]})
+    reach = WHISKER_IQR * (distribution['Q3'] - distribution['Q1'])
+    distribution['Low'] = pace.where(pace >= driver.map(distribution['Q1'] - reach)).groupby(driver).min()
+    distribution['High'] = pace.where(pace <= driver.map(distribution['Q3'] + reach)).groupby(driver).max()
+
+    drivers = distribution['Median'].sort_values(na_position='last').index.tolist()
+    return {'laps': frame, 'stints': stints.reset_index(), 'drivers': drivers,
+            'distribution': distribution.reindex(drivers), 'fuel_correction': fuel_correction}
+
+@traced('get_race_pace')
+def get_race_pace(session, window=ROLLING_LAPS):
+    key = (session_cache_key(session), 'race_pace', window)
+    return telemetry_cache.get_or_compute(key, lambda: race_pace(session.laps, window))
+
+
+# Lap-time series on the left, the distribution of clean laps per driver on the right, on
+# one shared lap-time axis. Series lines are reused across sessions like TelemetryPlotter's;
+# the stint fits and the box plot are a few collections, whatever the number of drivers.
+class RacePacePlotter:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ax = canvas.ax
+        grid = canvas.figure.add_gridspec(1, 2, width_ratios=(3, 1))
+        self.ax.set_subplotspec(grid[0])
+        self.dist_ax = canvas.figure.add_subplot(grid[1], sharey=self.ax)
+        self.dist_ax.tick_params(labelleft=False)
+
+        self.points = {}  # driver -> Line2D of clean laps
+        self.rolling = {}  # driver -> Line2D of the rolling median
+        self.fits = LineCollection([], linewidths=1.2, linestyles='--', zorder=3)
+        self.ax.add_collection(self.fits)
+        self.boxes = PolyCollection([], edgecolors='black', linewidths=0.8, alpha=0.8, zorder=2)
+        self.whiskers = LineCollection([], colors='black', linewidths=0.8, zorder=3)
+        self.dist_ax.add_collection(self.boxes)
+        self.dist_ax.add_collection(self.whiskers)
+        self.dirty = False
+        self._style()
+
+    def _style(self):
+        self.ax.set_title("Race Pace")
+        self.ax.set_xlabel("Lap")
+        self.ax.set_ylabel("Lap time (s)")
+        self.ax.grid(True, alpha=0.3)
+        self.dist_ax.set_title("Clean laps")
+        self.dist_ax.grid(True, axis='y', alpha=0.3)
+
+    def plot(self, pace):
+        laps = pace['laps']
+        drivers = pace['drivers']
+        with span('pace.artists', drivers=len(drivers)):
+            colors = {driver: comparison_color(i, len(drivers)) for i, driver in enumerate(drivers)}
+            self._update_series(laps, drivers, colors)
+            self._update_fits(pace['stints'], colors, pace['fuel_correction'])
+            self._update_distribution(pace['distribution'], colors)
+
+            self.ax.relim()
+            self.ax.autoscale_view()
+            clean = laps['Clean'].sum()
+            self.ax.set_title(f"Race Pace: {len(drivers)} drivers, {clean} clean laps, "
+                              f"{ROLLING_LAPS}-lap rolling median and stint fits")
+        self._request_draw()
+
+    def _update_series(self, laps, drivers, colors):
+        for driver in [d for d in self.points if d not in colors]:
+            self.points.pop(driver).remove()
+            self.rolling.pop(driver).remove()
+
+        # Drivers are contiguous after the sort in race_pace, so each one is a slice
+        starts = np.flatnonzero(np.r_[True, laps['Driver'].to_numpy()[1:] != laps['Driver'].to_numpy()[:-1]])
+        bounds = dict(zip(laps['Driver'].to_numpy()[starts], zip(starts, np.r_[starts[1:], len(laps)])))
+        lap_numbers = laps['LapNumber'].to_numpy()
+        seconds = laps['Seconds'].where(laps['Clean']).to_numpy()
+        rolling = laps['Rolling'].to_numpy()
+
+        for driver in drivers:
+            a, b = bounds[driver]
+            if driver not in self.points:
+                self.points[driver], = self.ax.plot([], [], linestyle='none', marker='.', markersize=4, alpha=0.4)
+                self.rolling[driver], = self.ax.plot([], [], linewidth=1.5)
+            self.points[driver].set_data(lap_numbers[a:b], seconds[a:b])
+            self.points[driver].set_color(colors[driver])
+            self.rolling[driver].set_data(lap_numbers[a:b], rolling[a:b])
+            self.rolling[driver].set_color(colors[driver])
+
+    def _update_fits(self, stints, colors, fuel_correction):
+        # Fit lines are drawn against lap number on the raw lap times, so the fuel correction
+        # is taken back out; both tyre age and lap number advance one per lap within a stint
+        stints = stints[stints['Slope'].notna()]
+        first = (stints['Intercept'] + stints['Slope'] * stints['FirstAge']
+                 - fuel_correction * (stints['FirstLap'] - 1))
+        last = (stints['Intercept'] + stints['Slope'] * stints['LastAge']
+                - fuel_correction * (stints['LastLap'] - 1))
+        segments = np.stack([np.column_stack([stints['FirstLap'], first]),
+                             np.column_stack([stints['LastLap'], last])], axis=1)
+        self.fits.set_segments(list(segments))
+        self.fits.set_color([colors[driver] for driver in stints['Driver']])
+
+    def _update_distribution(self, distribution, colors):
+        x = np.arange(1, len(distribution) + 1, dtype=float)
+        q1, median, q3 = (distribution[column].to_numpy() for column in ('Q1', 'Median', 'Q3'))
+        low, high = distribution['Low'].to_numpy(), distribution['High'].to_numpy()
+        left, right = x - BOX_WIDTH, x + BOX_WIDTH
+
+        self.boxes.set_verts(np.stack([np.column_stack(corner) for corner in
+                                       ((left, q1), (right, q1), (right, q3), (left, q3))], axis=1))
+        self.boxes.set_facecolor([colors[driver] for driver in distribution.index])
+        # Per driver: two whiskers, two caps and the median; drivers without clean laps are NaN
+        segments = [((x, low), (x, q1)), ((x, q3), (x, high)),
+                    ((x - BOX_WIDTH / 2, low), (x + BOX_WIDTH / 2, low)),
+                    ((x - BOX_WIDTH / 2, high), (x + BOX_WIDTH / 2, high)),
+                    ((left, median), (right, median))]
+        self.whiskers.set_segments(np.concatenate([
+            np.stack([np.column_stack(start), np.column_stack(end)], axis=1) for start, end in segments
+        ]) if len(x) else [])
+
+        self.dist_ax.set_xticks(x, distribution.index, rotation=90, fontsize='small')
+        self.dist_ax.set_xlim(0.5, len(x) + 0.5)
+
+    def flush(self):
+        if self.dirty and is_canvas_visible(self.canvas):
+            self.dirty = False
+            self.canvas.draw_idle()
+
+    def _request_draw(self):
+        if is_canvas_visible(self.canvas):
+            self.dirty = False
+            self.canvas.draw_idle()
+        else:
+            self.dirty = True
@@ -0,0 +1,138 @@
+import numpy as np
+
+from logic import telemetry_store
+from logic.telemetry_cache import telemetry_cache
+from logic.telemetry_loader import ensure_telemetry, get_driver_laps, get_drivers, session_cache_key
+from logic.tracing import span, traced
+
+REPLAY_HZ = 10  # samples per second of session time on the common time base
+SPEEDS = [0.25, 0.5, 1, 2, 4, 8, 16, 32, 64]
+
+
+def stored_samples(session, driver):
+    # The store keeps car data per lap, relative to the lap start
+    laps = get_driver_laps(session, driver).sort_values('LapNumber')
+    chunks = {column: [] for column in ('t', 'X', 'Y', 'Speed')}
+    starts, ends, numbers = [], [], []
+    for lap_number, start, lap_time in zip(laps['LapNumber'], laps['LapStartTime'].dt.total_seconds(),
+                                           laps['LapTime'].dt.total_seconds()):
+        tel = session.lap_telemetry(driver, lap_number)
+        if not len(tel['Time']) or np.isnan(start):
+            continue
+        t = start + np.asarray(tel['Time'], dtype=np.float64)
+        chunks['t'].append(t)
+        for column in ('X', 'Y', 'Speed'):
+            chunks[column].append(np.asarray(tel[column], dtype=np.float64))
+        starts.append(start)
+        ends.append(start + lap_time if lap_time >= t[-1] - start else t[-1])
+        numbers.append(lap_number)
+    if not starts:
+        return None
+    samples = {column: np.concatenate(values) for column, values in chunks.items()}
+    samples.update(lap_starts=np.array(starts), lap_ends=np.array(ends), lap_numbers=np.array(numbers))
+    return samples
+
+def fastf1_samples(session, driver):
+    # Car data over the driver's laps, with X/Y on its timestamps as in the store
+    laps = get_driver_laps(session, driver).sort_values('LapNumber')
+    car = session.car_data.get(str(laps['DriverNumber'].iloc[0])) if len(laps) else None
+    if car is None or car.empty:
+        return None
+    try:
+        pos = (session.pos_data or {}).get(str(laps['DriverNumber'].iloc[0]))
+    except Exception:  # FastF1 raises DataNotLoadedError when a session has no position data
+        pos = None
+
+    starts = laps['LapStartTime'].dt.total_seconds().to_numpy()
+    ends = laps['Time'].dt.total_seconds().to_numpy()
+    valid = ~(np.isnan(starts) | np.isnan(ends))
+    if not valid.any():
+        return None
+    starts, ends, numbers = starts[valid], ends[valid], laps['LapNumber'].to_numpy(dtype=float)[valid]
+
+    t = car['SessionTime'].dt.total_seconds().to_numpy()
+    keep = (t >= starts[0]) & (t <= ends[-1])
+    t = t[keep]
+    x, y = telemetry_store.positions_at(pos, t)
+    return {'t': t, 'X': x.astype(np.float64), 'Y': y.astype(np.float64),
+            'Speed': car['Speed'].to_numpy(dtype=np.float64)[keep],
+            'lap_starts': starts, 'lap_ends': ends, 'lap_numbers': numbers}
+
+def driver_samples(session, driver):
+    if isinstance(session, telemetry_store.StoredSession):
+        return stored_samples(session, driver)
+    return fastf1_samples(session, driver)
+
+
+def build_timeline(session, rate=REPLAY_HZ):
+    # Every driver's position, lap and lap distance resampled onto one session-time grid,
+    # as (drivers, samples) float32 arrays; NaN where a driver is not on a lap. Lap distance
+    # comes from an odometer integrated over the whole session, so interpolating it never
+    # blends across the reset at a lap boundary. 'spans' maps (driver, lap) to its
+    # (start, end) session time.
+    with span('replay.samples'):
+        samples = {driver: driver_samples(session, driver) for driver in get_drivers(session)}
+    samples = {driver: s for driver, s in samples.items() if s is not None and len(s['t']) > 1}
+    if not samples:
+        raise ValueError("no car data to replay")
+
+    start = min(s['lap_starts'][0] for s in samples.values())
+    end = max(s['t'][-1] for s in samples.values())
+    time = np.arange(start, end + 0.5 / rate, 1.0 / rate)
+    shape = (len(samples), len(time))
+    timeline = {'time': time, 'rate': float(rate), 'drivers': list(samples), 'spans': {}}
+    for column in ('X', 'Y', 'Distance', 'Lap'):
+        timeline[column] = np.full(shape, np.nan, dtype=np.float32)
+
+    with span('replay.resample', drivers=len(samples), samples=len(time)):
+        for i, (driver, s) in enumerate(samples.items()):
+            t = s['t']
+            timeline['X'][i] = np.interp(time, t, s['X'], left=np.nan, right=np.nan)
+            timeline['Y'][i] = np.interp(time, t, s['Y'], left=np.nan, right=np.nan)
+
+            odometer = np.cumsum(s['Speed'] / 3.6 * np.diff(t, prepend=t[0]))
+            lap = np.searchsorted(s['lap_starts'], time, side='right') - 1
+            on_lap = (lap >= 0) & (time <= s['lap_ends'][np.maximum(lap, 0)])
+            lap = np.maximum(lap, 0)
+            lap_origin = np.interp(s['lap_starts'], t, odometer)
+            timeline['Lap'][i] = np.where(on_lap, s['lap_numbers'][lap], np.nan)
+            timeline['Distance'][i] = np.where(on_lap, np.interp(time, t, odometer) - lap_origin[lap], np.nan)
+
+            for lap_number, lap_start, lap_end in zip(s['lap_numbers'], s['lap_starts'], s['lap_ends']):
+                timeline['spans'][(driver, int(lap_number))] = (float(lap_start), float(lap_end))
+    return timeline
+
+@traced('get_replay_timeline')
+def get_replay_timeline(session, rate=REPLAY_HZ):
+    key = (session_cache_key(session), 'replay', rate)
+
+    def compute():
+        ensure_telemetry(session)
+        return build_timeline(session, rate)
+
+    return telemetry_cache.get_or_compute(key, compute)
+
+
+def timeline_frame(timeline, t):
+    # Positions at session time t, blended between the two nearest grid samples so playback
+    # stays smooth at any speed; lap and lap distance are not blended across a lap change
+    time = timeline['time']
+    position = np.clip((t - time[0]) * timeline['rate'], 0, len(time) - 1)
+    i0 = int(position)
+    i1 = min(i0 + 1, len(time) - 1)
+    f = np.float32(position - i0)
+
+    x0, x1 = timeline['X'][:, i0], timeline['X'][:, i1]
+    y0, y1 = timeline['Y'][:, i0], timeline['Y'][:, i1]
+    lap0, lap1 = timeline['Lap'][:, i0], timeline['Lap'][:, i1]
+    d0, d1 = timeline['Distance'][:, i0], timeline['Distance'][:, i1]
+    same_lap = lap0 == lap1
+    return {
+        'X': x0 + (x1 - x0) * f,
+        'Y': y0 + (y1 - y0) * f,
+        'Lap': lap0 if f < 0.5 else lap1,
+        'Distance': np.where(same_lap, d0 + (d1 - d0) * f, d0 if f < 0.5 else d1),
+    }
+
+def timeline_bounds(timeline):
+    return float(timeline['time'][0]), float(timeline['time'][-1])
@@ -0,0 +1,55 @@
+import numpy as np
+
+from logic.tracing import traced
+
+DEFAULT_STEP = 2.0  # metres between grid points
+
+
+def to_seconds(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.timedelta64):
+        return values.astype('timedelta64[ns]').astype(np.float64) / 1e9
+    return values.astype(np.float64)
+
+# Interpolates every lap in `series` (label -> telemetry) onto one shared distance grid.
+# The laps are laid end to end on a single axis, each shifted past the previous one, so one
+# np.interp call per channel resamples the whole set. The grid only covers distance every
+# lap reaches, which keeps each lap's query points inside its own segment. Laps without
+# samples have no distance to share and are left out of `labels`.
+# Returns (grid, labels, {column: array of shape (len(labels), len(grid))}).
+def resample_to_distance(series, columns=('Time', 'Speed', 'Throttle', 'Brake', 'nGear'), step=DEFAULT_STEP):
+    labels = [label for label in series if len(series[label]['Distance'])]
+    if not labels:
+        return np.empty(0), labels, {column: np.empty((0, 0)) for column in columns}
+
+    distances = [np.asarray(series[label]['Distance'], dtype=np.float64) for label in labels]
+    start = max(d[0] for d in distances)
+    end = min(d[-1] for d in distances)
+    grid = np.arange(start, end, step) if end > start else np.array([start])
+
+    span = max(d[-1] for d in distances) - min(d[0] for d in distances) + 1.0
+    offsets = np.arange(len(labels)) * span
+    xp = np.concatenate([d + offset for d, offset in zip(distances, offsets)])
+    query = (grid[None, :] + offsets[:, None]).ravel()
+
+    resampled = {}
+    for column in columns:
+        fp = np.concatenate([to_seconds(series[label][column]) if column == 'Time'
+                             else np.asarray(series[label][column], dtype=np.float64)
+                             for label in labels])
+        resampled[column] = np.interp(query, xp, fp).reshape(len(labels), len(grid))
+    return grid, labels, resampled
+
+@traced('resample.delta')
+def delta_traces(series, reference=None, step=DEFAULT_STEP):
+    # Cumulative time gap to the reference lap at each point of the shared grid;
+    # positive means slower than the reference up to that distance. A lap without samples
+    # gets an empty trace, and the first lap with samples stands in for an empty reference.
+    grid, labels, resampled = resample_to_distance(series, columns=('Time',), step=step)
+    if not labels:
+        return {label: {'Distance': np.empty(0), 'Delta': np.empty(0)} for label in series}
+    reference = reference if reference in labels else labels[0]
+    times = resampled['Time']
+    delta = times - times[labels.index(reference)]
+    return {label: {'Distance': grid, 'Delta': delta[labels.index(label)]} if label in labels
+            else {'Distance': np.empty(0), 'Delta': np.empty(0)} for label in series}
@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+from logic.telemetry_loader import get_fastf1
+from logic.telemetry_store import STORE_DIR
+from logic.tracing import span
+
+SUPPORTED_YEARS = [2021, 2022, 2023, 2024]
+INDEX_PATH = os.path.join(STORE_DIR, 'schedules.json')
+SCHEDULE_TTL = timedelta(hours=12)  # how long the running season's schedule is trusted
+
+
+def fetch_schedule(year):
+    import pandas as pd  # loaded with FastF1 by now
+
+    with span('fastf1.schedule', year=year):
+        schedule = get_fastf1().get_event_schedule(year)
+    # Events not yet dated (testing, postponed rounds) come as NaT and are kept as None
+    return [
+        {'name': name, 'round': int(round_number), 'circuit': circuit,
+         'country': country, 'date': None if pd.isna(date) else date.to_pydatetime()}
+        for name, round_number, circuit, country, date in zip(
+            schedule['EventName'], schedule['RoundNumber'], schedule['Location'],
+            schedule['Country'], schedule['EventDate'])
+    ]
+
+
+def parse_date(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class ScheduleService:
+    def __init__(self, index_path=INDEX_PATH):
+        self.index_path = index_path
+        self.lock = threading.Lock()
+        self.fetch_lock = threading.Lock()
+        self.schedules = {}  # year -> list of event dicts
+        self.fetched = {}  # year -> when its schedule was fetched, None if not known
+        self.load_index()
+
+    def load_index(self):
+        # Plain datetimes, so the schedule is on screen before pandas has been imported. A
+        # date that does not parse only loses that event's date, not the whole index. Indexes
+        # written before fetch times were kept hold a bare event list per year
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return
+        schedules, fetched = {}, {}
+        for year, entry in index.items():
+            if isinstance(entry, list):
+                entry = {'events': entry}
+            for event in entry['events']:
+                event['date'] = parse_date(event.get('date'))
+            schedules[int(year)] = entry['events']
+            fetched[int(year)] = parse_date(entry.get('fetched'))
+        with self.lock:
+            self.schedules.update(schedules)
+            self.fetched.update(fetched)
+
+    def save_index(self):
+        with self.lock:
+            index = {
+                str(year): {
+                    'fetched': self.fetched[year].isoformat() if self.fetched.get(year) is not None else None,
+                    'events': [dict(event, date=event['date'].isoformat() if event['date'] is not None else None)
+                               for event in events],
+                }
+                for year, events in self.schedules.items()
+            }
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        tmp = self.index_path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, self.index_path)
+
+    def get_cached(self, year):
+        with self.lock:
+            return self.schedules.get(int(year))
+
+    def get(self, year):
+        events = self.get_cached(year)
+        if events is not None:
+            return events
+
+        # One network fetch at a time; whoever waited behind it usually finds the year ready
+        with self.fetch_lock:
+            events = self.get_cached(year)
+            if events is None:
+                events = self.fetch(year)
+        return events
+
+    def fetch(self, year):
+        # Callers hold fetch_lock
+        events = fetch_schedule(int(year))
+        with self.lock:
+            self.schedules[int(year)] = events
+            self.fetched[int(year)] = datetime.now()
+        self.save_index()
+        return events
+
+    def is_stale(self, year):
+        # Past seasons are final; the running one gains dates and reschedules as it goes
+        if int(year) < datetime.now().year:
+            return False
+        with self.lock:
+            if int(year) not in self.schedules:
+                return False
+            fetched = self.fetched.get(int(year))
+        return fetched is None or datetime.now() - fetched > SCHEDULE_TTL
+
+    def refresh(self, year):
+        # Keeps serving the stored schedule until the new one is in
+        with self.fetch_lock:
+            if self.is_stale(year):
+                return self.fetch(year)
+        return self.get_cached(year)
+
+    def warm(self, years=SUPPORTED_YEARS):
+        for year in years:
+            try:
+                if self.is_stale(year):
+                    self.refresh(year)
+                else:
+                    self.get(year)
+            except Exception as e:
+                print(f"[Schedule] Could not prefetch {year}: {e}")
+
+    def warm_async(self, years=SUPPORTED_YEARS):
+        thread = threading.Thread(target=self.warm, args=(list(years),), daemon=True)
+        thread.start()
+        return thread
+
+
+schedule_service = ScheduleService()
@@ -0,0 +1,99 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from logic.telemetry_loader import load_session_data, make_session_key, LoadCancelled
+from logic.telemetry_cache import telemetry_cache
+
+
+class SessionRegistry:
+    def __init__(self, max_sessions=4):
+        self.max_sessions = max_sessions
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()  # key -> session, least recently used first
+        self.refcounts = {}
+        self.loading = {}  # key -> Future of the single in-flight load
+        self.loader = load_session_data  # or DataWorker.load_session, which takes FastF1 out of process
+
+    def acquire(self, year, round_number, session_type, progress=None, is_cancelled=None):
+        key = make_session_key(year, round_number, session_type)
+
+        while True:
+            with self.lock:
+                if key in self.sessions:
+                    return self._checkout(key, self.sessions[key])
+
+                future = self.loading.get(key)
+                owner = future is None
+                if owner:
+                    future = Future()
+                    self.loading[key] = future
+
+            if owner:
+                return self._load(key, future, progress, is_cancelled)
+
+            if progress:
+                progress("Waiting for shared load", 0)
+            try:
+                session = future.result()
+            except LoadCancelled:
+                # The request that owned the load gave up; take it over unless we did too
+                if is_cancelled and is_cancelled():
+                    raise
+                continue
+
+            with self.lock:
+                return self._checkout(key, session)
+
+    def release(self, session):
+        key = getattr(session, 'registry_key', None)
+        with self.lock:
+            if key not in self.refcounts:
+                return
+            self.refcounts[key] = max(0, self.refcounts[key] - 1)
+            self._evict()
+
+    def stats(self):
+        with self.lock:
+            return {
+                'sessions': list(self.sessions),
+                'refcounts': dict(self.refcounts),
+                'loading': list(self.loading),
+            }
+
+    def _load(self, key, future, progress, is_cancelled):
+        try:
+            session = self.loader(*key, progress=progress, is_cancelled=is_cancelled)
+        except BaseException as e:
+            with self.lock:
+                del self.loading[key]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            del self.loading[key]
+            self.refcounts[key] = 0
+            self._checkout(key, session)
+        future.set_result(session)
+        return session
+
+    def _checkout(self, key, session):
+        # Caller holds the lock. The session may have been evicted between a coalesced
+        # load finishing and this waiter waking up, so put it back if needed.
+        self.sessions[key] = session
+        self.sessions.move_to_end(key)
+        self.refcounts[key] = self.refcounts.get(key, 0) + 1
+        self._evict()
+        return session
+
+    def _evict(self):
+        for key in list(self.sessions):
+            if len(self.sessions) <= self.max_sessions:
+                break
+            if self.refcounts.get(key, 0) == 0:
+                del self.sessions[key]
+                self.refcounts.pop(key, None)
+                telemetry_cache.invalidate_session(key)
+
+
+session_registry = SessionRegistry()
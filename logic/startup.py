@@ -0,0 +1,54 @@
+import json
+import os
+import platform
+import time
+
+from logic.tracing import tracer
+
+STARTUP_ENV = 'RACEPULSE_STARTUP_REPORT'
+
+
+# Milestones of one launch, in ms since main.py started: Qt up, window built, window first
+# painted, plots ready. Each is also a startup.* span from the one before it when tracing.
+# With RACEPULSE_STARTUP_REPORT=<path> the report is appended to that file as a JSON line
+# and the app quits once the plots are ready, which is what the startup benchmark runs.
+class StartupReport:
+    def __init__(self):
+        self.started = time.perf_counter_ns()
+        self.last = self.started
+        self.marks = {}  # milestone -> ms since start, in the order reached
+
+    def start(self, started_ns):
+        self.started = self.last = started_ns
+
+    def mark(self, name):
+        if name in self.marks:
+            return
+        now = time.perf_counter_ns()
+        self.marks[name] = (now - self.started) / 1e6
+        if tracer.enabled:
+            tracer.record(f'startup.{name}', self.last, now, {})
+        self.last = now
+
+    def summary(self):
+        return "Startup: " + " · ".join(f"{name} {ms:.0f} ms" for name, ms in self.marks.items())
+
+    def report_path(self):
+        return os.environ.get(STARTUP_ENV, '').strip() or None
+
+    def finish(self):
+        # True when the launch was only run to be measured
+        print(f"[{self.summary()}]")
+        path = self.report_path()
+        if path is None:
+            return False
+        with open(path, 'a') as f:
+            f.write(json.dumps({
+                'marks': self.marks,
+                'python': platform.python_version(),
+                'created': time.strftime('%Y-%m-%d %H:%M:%S'),
+            }) + '\n')
+        return True
+
+
+startup_report = StartupReport()
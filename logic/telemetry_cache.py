@@ -0,0 +1,93 @@
+import threading
+from collections import OrderedDict
+
+
+def frame_nbytes(frame):
+    # DataFrames, dicts of arrays, and dicts of those (analytics results)
+    try:
+        return int(frame.memory_usage(index=True, deep=True).sum())
+    except AttributeError:
+        return sum(frame_nbytes(col) if isinstance(col, dict) or hasattr(col, 'memory_usage')
+                   else getattr(col, 'nbytes', 0) for col in frame.values())
+
+
+class TelemetryCache:
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()  # key -> (telemetry, nbytes), least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rejections = 0  # entries too large to keep at all
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, telemetry):
+        nbytes = frame_nbytes(telemetry)
+        with self.lock:
+            if key in self.entries:
+                self.total_bytes -= self.entries.pop(key)[1]
+            if nbytes > self.max_bytes:
+                self.rejections += 1
+                return telemetry
+            self.entries[key] = (telemetry, nbytes)
+            self.total_bytes += nbytes
+            self._evict()
+        return telemetry
+
+    def get_or_compute(self, key, compute):
+        # Keys start with the session's key; a session without one is computed every time
+        if key[0] is None:
+            return compute()
+        telemetry = self.get(key)
+        if telemetry is None:
+            telemetry = self.put(key, compute())
+        return telemetry
+
+    def resize(self, max_bytes):
+        with self.lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def invalidate_session(self, session_key):
+        with self.lock:
+            for key in [k for k in self.entries if k[0] == session_key]:
+                self.total_bytes -= self.entries.pop(key)[1]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self.entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'rejections': self.rejections,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self.entries:
+            _, (_, nbytes) = self.entries.popitem(last=False)
+            self.total_bytes -= nbytes
+            self.evictions += 1
+
+
+telemetry_cache = TelemetryCache()
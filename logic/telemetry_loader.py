@@ -1,9 +1,199 @@
-import fastf1
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-def load_session_data(year, round_number, session_type):
-    session = fastf1.get_session(year, round_number, session_type)
-    session.load()
+from logic.telemetry_cache import telemetry_cache
+from logic import telemetry_store
+from logic.tracing import span, traced
+
+CACHE_DIR = './resources/cache'
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+# Sessions load in two tiers. The lap tier (laps, results and the race control messages
+# that flag deleted laps) is all the dropdowns need; the telemetry tier (car + position
+# data) is only fetched once a plot asks for it.
+LAP_TIER = dict(laps=True, telemetry=False, weather=False, messages=True)
+TELEMETRY_TIER = dict(laps=False, telemetry=True, weather=False, messages=False)
+
+
+cache_state = {'dir': None}  # FastF1's cache directory, once one is enabled
+cache_lock = threading.Lock()
+
+
+def enable_cache(cache_dir=CACHE_DIR):
+    import fastf1
+    os.makedirs(cache_dir, exist_ok=True)  # FastF1 refuses a directory that does not exist
+    fastf1.Cache.enable_cache(cache_dir)
+    cache_state['dir'] = cache_dir
+
+def get_fastf1():
+    # FastF1, with pandas and requests behind it, is imported on first use rather than with
+    # this module, so the window can open before it has loaded; the first use also enables
+    # the default cache unless a caller chose one already
+    import fastf1
+    with cache_lock:
+        if cache_state['dir'] is None:
+            enable_cache()
+    return fastf1
+
+def make_session_key(year, round_number, session_type):
+    return (int(year), int(round_number), session_type)
+
+def progress_reporter(progress=None, is_cancelled=None):
+    def report(stage, percent):
+        if is_cancelled and is_cancelled():
+            raise LoadCancelled(stage)
+        if progress:
+            progress(stage, percent)
+    return report
+
+def open_stored_session(key, report):
+    # None when the store has no usable copy of the session
+    if not telemetry_store.has_session(key):
+        return None
+    report("Mapping stored telemetry", 50)
+    try:
+        with span('store.open'):
+            return telemetry_store.open_session(key)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[Store] Falling back to FastF1 for {key}: {e}")
+        return None
+
+def load_fastf1_session(key, report):
+    report("Fetching session", 0)
+    with span('fastf1.get_session'):
+        session = get_fastf1().get_session(*key)
+    session.registry_key = key
+
+    report("Loading laps", 20)
+    with span('fastf1.load_laps'):
+        session.load(**LAP_TIER)
+    session.telemetry_loaded = False
+    session.telemetry_lock = threading.Lock()
     return session
 
+def load_session_data(year, round_number, session_type, progress=None, is_cancelled=None):
+    report = progress_reporter(progress, is_cancelled)
+    key = make_session_key(year, round_number, session_type)
+    session = open_stored_session(key, report) or load_fastf1_session(key, report)
+    report("Done", 100)
+    return session
+
+def has_telemetry(session):
+    # Sessions that did not come through load_session_data were loaded in full
+    return getattr(session, 'telemetry_loaded', True)
+
+def ensure_telemetry(session, progress=None):
+    if has_telemetry(session):
+        return session
+
+    with session.telemetry_lock:
+        if not session.telemetry_loaded:
+            if progress:
+                progress("Loading telemetry", 0)
+            with span('fastf1.load_telemetry'):
+                session.load(**TELEMETRY_TIER)
+            session.telemetry_loaded = True
+            if progress:
+                progress("Loading telemetry", 100)
+    return session
+
+def persist_session(session):
+    # Converts a FastF1 session into the columnar store so the next open skips FastF1
+    key = getattr(session, 'registry_key', None)
+    if key is None or isinstance(session, telemetry_store.StoredSession):
+        return
+    if telemetry_store.has_session(key):
+        return
+    try:
+        ensure_telemetry(session)
+        with span('store.write'):
+            telemetry_store.write_session(session, key)
+    except Exception as e:
+        print(f"[Store] Could not persist {key}: {e}")
+
+def session_cache_key(session):
+    # None for a session opened outside the registry: an id() can be reused once the session
+    # is freed, and the cache would hand its laps to whatever session gets the same id
+    return getattr(session, 'registry_key', None)
+
+@traced('get_lap_telemetry')
+def get_lap_telemetry(session, driver, lap_number):
+    if isinstance(session, telemetry_store.StoredSession):
+        ensure_telemetry(session)
+        return session.lap_telemetry(driver, lap_number)
+
+    key = (session_cache_key(session), driver, int(lap_number))
+
+    def compute():
+        ensure_telemetry(session)
+        laps = get_driver_laps(session, driver)
+        lap = laps[laps['LapNumber'] == lap_number].iloc[0]
+        with span('get_car_data'):
+            car_data = lap.get_car_data()
+        with span('add_distance'):
+            return car_data.add_distance()
+
+    return telemetry_cache.get_or_compute(key, compute)
+
+@traced('get_lap_positions')
+def get_lap_positions(session, driver, lap_number):
+    # X/Y on the car data time base with the speed and gear at each point, as in the store
+    if isinstance(session, telemetry_store.StoredSession):
+        tel = get_lap_telemetry(session, driver, lap_number)
+        return {column: tel[column] for column in ('X', 'Y', 'Speed', 'nGear')}
+
+    key = (session_cache_key(session), driver, int(lap_number), 'positions')
+
+    def compute():
+        tel = get_lap_telemetry(session, driver, lap_number)
+        laps = get_driver_laps(session, driver)
+        lap = laps[laps['LapNumber'] == lap_number].iloc[0]
+        with span('get_pos_data'):
+            pos = lap.get_pos_data()
+        x, y = telemetry_store.positions_at(pos, tel['SessionTime'].dt.total_seconds().to_numpy())
+        return {'X': x, 'Y': y, 'Speed': tel['Speed'].to_numpy(), 'nGear': tel['nGear'].to_numpy()}
+
+    return telemetry_cache.get_or_compute(key, compute)
+
+def get_fastest_lap_telemetry(session, driver):
+    lap = pick_fastest_lap(get_driver_laps(session, driver))
+    if lap is None:
+        raise ValueError(f"no timed lap for {driver}")
+    return get_lap_telemetry(session, driver, lap['LapNumber'])
+
+@traced('load_comparison_telemetry')
+def load_comparison_telemetry(session, drivers, max_workers=None):
+    # Each driver's fastest lap is sliced concurrently; the result keeps the caller's order
+    ensure_telemetry(session)
+
+    def extract(driver):
+        try:
+            return get_fastest_lap_telemetry(session, driver)
+        except Exception as e:
+            print(f"[Comparison Error] {driver}: {e}")
+            return None
+
+    workers = max_workers or min(len(drivers), os.cpu_count() or 4) or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(extract, drivers))
+    return {driver: tel for driver, tel in zip(drivers, results) if tel is not None}
+
+def get_drivers(session):
+    return sorted(session.laps['Driver'].unique())
+
 def get_driver_laps(session, driver):
-    return session.laps.pick_driver(driver)
\ No newline at end of file
+    return session.laps[session.laps['Driver'] == driver]
+
+def pick_fastest_lap(laps):
+    # Mirrors Laps.pick_fastest(): personal bests only, so deleted laps never win
+    if 'IsPersonalBest' in laps.columns:
+        laps = laps[laps['IsPersonalBest'] == True]  # noqa: E712
+    laps = laps[laps['LapTime'].notna()]
+    if laps.empty:
+        return None
+    return laps.loc[laps['LapTime'].idxmin()]
@@ -0,0 +1,246 @@
+import json
+import os
+import shutil
+
+import numpy as np
+
+STORE_DIR = os.path.join('resources', 'cache', 'racepulse')
+STORE_VERSION = 4
+
+# store file -> (FastF1 column, dtype)
+CHANNELS = {
+    'time': ('Time', np.float32),
+    'distance': ('Distance', np.float32),
+    'speed': ('Speed', np.float32),
+    'throttle': ('Throttle', np.float32),
+    'gear': ('nGear', np.int8),
+    'brake': ('Brake', np.int8),
+    'x': ('X', np.float32),  # position data, interpolated onto the car data timestamps
+    'y': ('Y', np.float32),
+}
+# lap index file -> dtype; the strategy columns are kept as FastF1 has them
+LAP_COLUMNS = {
+    'driver': 'U3', 'number': np.int16, 'start': np.int64, 'end': np.int64, 'time': np.float64,
+    'personal_best': bool, 'start_time': np.float64, 'stint': np.float32, 'compound': 'U12', 'tyre_life': np.float32,
+    'pit_in': np.float64, 'pit_out': np.float64, 'track_status': 'U8',
+}
+
+
+def session_dir(key, store_dir=None):
+    year, round_number, session_type = key
+    return os.path.join(store_dir or STORE_DIR, f"{year}_{round_number:02d}_{session_type}")
+
+def parse_session_dir(name):
+    # "2023_05_Q" -> (2023, 5, 'Q'); None for temporaries and anything else
+    year, _, rest = name.partition('_')
+    round_number, _, session_type = rest.partition('_')
+    if name.endswith('.tmp') or not (year.isdigit() and round_number.isdigit() and session_type):
+        return None
+    return (int(year), int(round_number), session_type)
+
+def stored_keys(store_dir=None):
+    try:
+        names = os.listdir(store_dir or STORE_DIR)
+    except OSError:
+        return []
+    return sorted(key for key in map(parse_session_dir, names) if key is not None)
+
+def has_session(key, store_dir=None):
+    path = os.path.join(session_dir(key, store_dir), 'meta.json')
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path) as f:
+            return json.load(f).get('version') == STORE_VERSION
+    except (OSError, ValueError):
+        return False
+
+
+# A session as the rest of the app sees it once FastF1 is out of the picture: a lap table,
+# results and the channel arrays, sliced per lap through `offsets`. Usually memory-mapped
+# from the store; the data worker hands over the same arrays in shared memory.
+class StoredSession:
+    def __init__(self, key, laps, results, channels=None, offsets=None):
+        self.registry_key = key
+        self.laps = laps
+        self.results = results
+        self.channels = channels  # FastF1 column -> array
+        self.offsets = offsets  # (driver, lap number) -> (start, end) into the channels
+        self.telemetry_loaded = channels is not None
+
+    def lap_telemetry(self, driver, lap_number):
+        start, end = self.offsets[(driver, int(lap_number))]
+        return {column: data[start:end] for column, data in self.channels.items()}
+
+
+def lap_offsets(drivers, lap_numbers, starts, ends):
+    return {(str(d), int(n)): (int(a), int(b)) for d, n, a, b in zip(drivers, lap_numbers, starts, ends)}
+
+def open_session(key):
+    import pandas as pd  # on first use, not at start-up (see main.py)
+
+    path = session_dir(key)
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+
+    channels = {
+        column: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+        for name, (column, _) in CHANNELS.items()
+    }
+    index = {name: np.load(os.path.join(path, f"lap_{name}.npy")) for name in LAP_COLUMNS}
+    laps = pd.DataFrame({
+        'Driver': index['driver'].astype(str),
+        'LapNumber': index['number'].astype(float),
+        'LapTime': pd.to_timedelta(index['time'], unit='s'),
+        'IsPersonalBest': index['personal_best'],
+        'LapStartTime': pd.to_timedelta(index['start_time'], unit='s'),
+        'Stint': index['stint'].astype(float),
+        'Compound': index['compound'].astype(str),
+        'TyreLife': index['tyre_life'].astype(float),
+        'PitInTime': pd.to_timedelta(index['pit_in'], unit='s'),
+        'PitOutTime': pd.to_timedelta(index['pit_out'], unit='s'),
+        'TrackStatus': index['track_status'].astype(str),
+    })
+    results = pd.DataFrame({'Abbreviation': meta['results']})
+    offsets = lap_offsets(index['driver'], index['number'], index['start'], index['end'])
+    return StoredSession(key, laps, results, channels, offsets)
+
+def check_session_dir(path):
+    # Raises ValueError when a stored session is from another version, incomplete or
+    # inconsistent; mmap also catches truncated arrays
+    try:
+        with open(os.path.join(path, 'meta.json')) as f:
+            meta = json.load(f)
+        if meta.get('version') != STORE_VERSION:
+            raise ValueError(f"store version {meta.get('version')}, expected {STORE_VERSION}")
+        lengths = {name: len(np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')) for name in CHANNELS}
+        laps = {name: np.load(os.path.join(path, f"lap_{name}.npy")) for name in LAP_COLUMNS}
+    except (OSError, EOFError) as e:
+        raise ValueError(f"unreadable: {e}") from e
+
+    if len(set(lengths.values())) > 1:
+        raise ValueError(f"channel lengths differ: {lengths}")
+    if len({len(column) for column in laps.values()}) > 1:
+        raise ValueError("lap index columns differ in length")
+    samples = next(iter(lengths.values()))
+    if len(laps['end']) and (laps['start'].min() < 0 or laps['end'].max() > samples
+                             or (laps['end'] < laps['start']).any()):
+        raise ValueError("lap offsets outside the channel data")
+
+def positions_at(pos, t):
+    # X/Y sampled at the car data timestamps `t`, so both share one set of lap offsets
+    if pos is None or pos.empty:
+        missing = np.full(len(t), np.nan, dtype=np.float32)
+        return missing, missing
+    pos_t = pos['SessionTime'].dt.total_seconds().to_numpy()
+    return (np.interp(t, pos_t, pos['X'].to_numpy(dtype=np.float64)).astype(np.float32),
+            np.interp(t, pos_t, pos['Y'].to_numpy(dtype=np.float64)).astype(np.float32))
+
+def lap_column(laps, column, default):
+    # Sessions loaded without some lap columns (or synthetic ones) get a neutral value
+    if column not in laps.columns:
+        return np.full(len(laps), default, dtype=object if isinstance(default, str) else float)
+    values = laps[column]
+    if values.dtype.kind == 'm':
+        return values.dt.total_seconds().to_numpy()
+    if isinstance(default, str):
+        return values.fillna(default).astype(str).to_numpy()
+    return values.to_numpy(dtype=float, na_value=np.nan)
+
+def build_columns(session):
+    chunks = {name: [] for name in CHANNELS}
+    index = {name: [] for name in LAP_COLUMNS}
+    offset = 0
+    try:
+        pos_data = session.pos_data or {}
+    except Exception:  # FastF1 raises DataNotLoadedError when a session has no position data
+        pos_data = {}
+
+    for driver_number, laps in session.laps.groupby('DriverNumber'):
+        car = session.car_data.get(str(driver_number))
+        if car is None or car.empty:
+            continue
+
+        laps = laps.sort_values('LapNumber')
+        t = car['SessionTime'].dt.total_seconds().to_numpy()
+        speed = car['Speed'].to_numpy(dtype=np.float64)
+        throttle = car['Throttle'].to_numpy(dtype=np.float32)
+        gear = car['nGear'].to_numpy().astype(np.int8)
+        brake = car['Brake'].to_numpy().astype(np.int8)
+        x, y = positions_at(pos_data.get(str(driver_number)), t)
+
+        lap_starts = laps['LapStartTime'].dt.total_seconds().to_numpy()
+        lap_ends = laps['Time'].dt.total_seconds().to_numpy()
+        valid = ~(np.isnan(lap_starts) | np.isnan(lap_ends))
+        lo = np.searchsorted(t, np.where(valid, lap_starts, 0), side='left')
+        hi = np.searchsorted(t, np.where(valid, lap_ends, 0), side='right')
+
+        lap_times = laps['LapTime'].dt.total_seconds().to_numpy()
+        personal_best = laps['IsPersonalBest'].fillna(False).to_numpy(dtype=bool)
+        strategy = {
+            'stint': lap_column(laps, 'Stint', np.nan),
+            'compound': lap_column(laps, 'Compound', ''),
+            'tyre_life': lap_column(laps, 'TyreLife', np.nan),
+            'pit_in': lap_column(laps, 'PitInTime', np.nan),
+            'pit_out': lap_column(laps, 'PitOutTime', np.nan),
+            'track_status': lap_column(laps, 'TrackStatus', ''),
+        }
+
+        for row, (driver, lap_number) in enumerate(zip(laps['Driver'], laps['LapNumber'])):
+            a, b = lo[row], hi[row]
+            if not valid[row] or b <= a:
+                continue
+
+            # Same integration as FastF1's add_distance(): first step runs from lap start
+            rel = t[a:b] - lap_starts[row]
+            dt = np.diff(rel, prepend=0.0)
+            chunks['time'].append(rel.astype(np.float32))
+            chunks['distance'].append(np.cumsum(speed[a:b] / 3.6 * dt).astype(np.float32))
+            chunks['speed'].append(speed[a:b].astype(np.float32))
+            chunks['throttle'].append(throttle[a:b])
+            chunks['gear'].append(gear[a:b])
+            chunks['brake'].append(brake[a:b])
+            chunks['x'].append(x[a:b])
+            chunks['y'].append(y[a:b])
+
+            index['driver'].append(driver)
+            index['number'].append(int(lap_number))
+            index['start'].append(offset)
+            index['end'].append(offset + b - a)
+            index['time'].append(lap_times[row])
+            index['personal_best'].append(personal_best[row])
+            index['start_time'].append(lap_starts[row])
+            for name, values in strategy.items():
+                index[name].append(values[row])
+            offset += b - a
+
+    columns = {
+        name: np.concatenate(chunks[name]).astype(dtype) if chunks[name] else np.empty(0, dtype)
+        for name, (_, dtype) in CHANNELS.items()
+    }
+    return columns, index
+
+def write_session(session, key):
+    columns, index = build_columns(session)
+    write_columns(key, columns, index, [str(a) for a in session.results['Abbreviation']])
+
+def write_columns(key, columns, index, results):
+    path = session_dir(key)
+    tmp = path + '.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    for name, data in columns.items():
+        np.save(os.path.join(tmp, f"{name}.npy"), data)
+    for name, dtype in LAP_COLUMNS.items():
+        np.save(os.path.join(tmp, f"lap_{name}.npy"), np.array(index[name], dtype=dtype))
+
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump({
+            'version': STORE_VERSION,
+            'key': list(key),
+            'results': list(results),
+        }, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp, path)
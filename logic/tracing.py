@@ -0,0 +1,203 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+TRACE_ENV = 'RACEPULSE_TRACE'
+DEFAULT_TRACE_PATH = 'racepulse_trace.json'
+MAX_EVENTS = 200_000
+
+
+# Returned by span() while tracing is off, so an instrumented block costs one attribute
+# check and a no-op `with`
+class NullSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Span:
+    __slots__ = ('tracer', 'name', 'args', 'start')
+
+    def __init__(self, tracer, name, args):
+        self.tracer = tracer
+        self.name = name
+        self.args = args
+        self.start = 0
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.record(self.name, self.start, time.perf_counter_ns(), self.args)
+        return False
+
+
+# A user action ("Lap selected") and every span that finished after it, on any thread,
+# until the next one begins. Nested spans each count their own full time.
+class Operation:
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter_ns()
+        self.stages = {}  # span name -> [total ns, calls], in first-seen order
+
+    def add(self, name, duration):
+        stage = self.stages.setdefault(name, [0, 0])
+        stage[0] += duration
+        stage[1] += 1
+
+    def summary(self, limit=6):
+        parts = []
+        for name, (total, calls) in list(self.stages.items())[:limit]:
+            count = f" ×{calls}" if calls > 1 else ""
+            parts.append(f"{name} {total / 1e6:.1f} ms{count}")
+        if len(self.stages) > limit:
+            parts.append(f"+{len(self.stages) - limit} more")
+        return f"{self.name}: " + (" · ".join(parts) if parts else "no traced work")
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.path = DEFAULT_TRACE_PATH
+        self.lock = threading.Lock()
+        self.events = deque(maxlen=MAX_EVENTS)
+        self.thread_names = {}
+        self.operation = None
+        self.listeners = []
+        self.epoch = time.perf_counter_ns()
+        self.save_at_exit = False
+
+    def enable(self, path=None):
+        self.path = path or self.path
+        self.enabled = True
+        if not self.save_at_exit:
+            self.save_at_exit = True
+            atexit.register(self._save_at_exit)
+
+    def disable(self):
+        self.enabled = False
+
+    def span(self, name, **args):
+        if not self.enabled:
+            return NULL_SPAN
+        return Span(self, name, args)
+
+    def begin_operation(self, name):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.operation = Operation(name)
+            self.events.append(('i', name, self.operation.start, 0, threading.get_ident(), {}))
+        self._notify()
+
+    def last_operation(self):
+        with self.lock:
+            return self.operation.summary() if self.operation else None
+
+    def record(self, name, start, end, args):
+        tid = threading.get_ident()
+        with self.lock:
+            if tid not in self.thread_names:
+                self.thread_names[tid] = threading.current_thread().name
+            self.events.append(('X', name, start, end - start, tid, args))
+            if self.operation is not None and start >= self.operation.start:
+                self.operation.add(name, end - start)
+        self._notify()
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify(self):
+        for listener in list(self.listeners):
+            listener()
+
+    def chrome_events(self):
+        pid = os.getpid()
+        with self.lock:
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+
+        trace = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': name}}
+                 for tid, name in thread_names.items()]
+        for phase, name, start, duration, tid, args in events:
+            event = {'name': name, 'cat': name.split('.')[0], 'ph': phase, 'pid': pid, 'tid': tid,
+                     'ts': (start - self.epoch) / 1000, 'args': args}
+            if phase == 'X':
+                event['dur'] = duration / 1000
+            else:
+                event['s'] = 'g'
+            trace.append(event)
+        return trace
+
+    def save(self, path=None):
+        # Chrome trace-event JSON; open it in chrome://tracing or ui.perfetto.dev
+        path = path or self.path
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': self.chrome_events(), 'displayTimeUnit': 'ms'}, f, default=str)
+        return path
+
+    def _save_at_exit(self):
+        if self.events:
+            self.save()
+
+
+tracer = Tracer()
+
+
+def span(name, **args):
+    if not tracer.enabled:
+        return NULL_SPAN
+    return Span(tracer, name, args)
+
+def traced(name=None):
+    def decorate(fn):
+        label = name or fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return fn(*args, **kwargs)
+            with Span(tracer, label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def trace_canvas(canvas, name='canvas.draw'):
+    # Shadows the bound draw() so draw_idle and direct draws are both timed
+    draw = canvas.draw
+
+    def traced_draw(*args, **kwargs):
+        if not tracer.enabled:
+            return draw(*args, **kwargs)
+        with Span(tracer, name, {'title': canvas.ax.get_title() if hasattr(canvas, 'ax') else ''}):
+            return draw(*args, **kwargs)
+
+    canvas.draw = traced_draw
+    return canvas
+
+def configure_from_env():
+    # RACEPULSE_TRACE=1 traces to racepulse_trace.json, any other value is taken as the path
+    value = os.environ.get(TRACE_ENV, '').strip()
+    if value and value.lower() not in ('0', 'false', 'no'):
+        tracer.enable(None if value.lower() in ('1', 'true', 'yes') else value)
+    return tracer.enabled
@@ -0,0 +1,298 @@
+import os
+import threading
+
+import numpy as np
+from matplotlib import colormaps
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
+from matplotlib.colors import BoundaryNorm, Normalize
+from matplotlib.image import AxesImage
+
+from logic.plotter import is_canvas_visible
+from logic.telemetry_loader import get_lap_positions, pick_fastest_lap
+from logic.telemetry_store import STORE_DIR
+from logic.tracing import span
+
+OUTLINE_DIR = os.path.join(STORE_DIR, 'circuits')
+OUTLINE_POINTS = 1000
+MAP_MARGIN = 0.05
+SPEED_RANGE = (50.0, 350.0)  # km/h; fixed so laps can be coloured on their own and compared
+SPEED_LEVELS = 32
+GEARS = 8
+SNAPSHOT_INSET = 2  # px
+
+
+def speed_levels(speed):
+    low, high = SPEED_RANGE
+    level = np.floor((np.nan_to_num(speed, nan=low) - low) / (high - low) * SPEED_LEVELS)
+    return np.clip(level, 0, SPEED_LEVELS - 1).astype(int)
+
+def speed_of_level(level):
+    low, high = SPEED_RANGE
+    return low + (level + 0.5) * (high - low) / SPEED_LEVELS
+
+def gear_levels(gear):
+    return np.clip(np.nan_to_num(gear, nan=1), 1, GEARS).astype(int) - 1
+
+def gear_of_level(level):
+    return level + 1.0
+
+
+# colour mode -> (column, colour bar label, sample -> level, level -> value, colormap, norm)
+COLOR_MODES = {
+    'Speed': ('Speed', 'Speed (km/h)', speed_levels, speed_of_level,
+              colormaps['plasma'], Normalize(*SPEED_RANGE)),
+    'Gear': ('nGear', 'Gear', gear_levels, gear_of_level,
+             colormaps['viridis'].resampled(GEARS), BoundaryNorm(np.arange(0.5, GEARS + 1.5), GEARS)),
+}
+
+
+def level_paths(x, y, level):
+    # Colour is quantised to a few levels, so a lap becomes one polyline per level instead of
+    # one path per segment. Consecutive segments on the same level form a run; a level's runs
+    # are joined into one vertex array with NaN breaks, which matplotlib draws as gaps.
+    # Returns (list of (n, 2) vertex arrays, level of each).
+    points = np.column_stack([np.asarray(x, dtype=float), np.asarray(y, dtype=float)])
+    if len(points) < 2:
+        return [], np.empty(0, dtype=int)
+    level = np.asarray(level)[:-1]  # a segment takes the level of its first sample
+
+    starts = np.flatnonzero(np.diff(level, prepend=-1))
+    ends = np.append(starts[1:], len(level))
+    run_level = level[starts]
+    order = np.argsort(run_level, kind='stable')
+    starts, ends, run_level = starts[order], ends[order], run_level[order]
+
+    # A run over segments [s, e) uses points s..e, followed by one break
+    lengths = ends - starts + 2
+    offsets = np.cumsum(lengths) - lengths
+    idx = np.arange(lengths.sum()) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    vertices = points[np.minimum(idx, len(points) - 1)]
+    vertices[offsets + lengths - 1] = np.nan
+
+    levels, first_run = np.unique(run_level, return_index=True)
+    return np.split(vertices, offsets[first_run[1:]]), levels
+
+def lap_layers(positions):
+    # Everything the map needs for one lap, built off the GUI thread: the paths for every
+    # colour mode and the lap's extent
+    x = np.asarray(positions['X'], dtype=float)
+    y = np.asarray(positions['Y'], dtype=float)
+    layers = {}
+    for mode, (column, _, to_level, of_level, _, _) in COLOR_MODES.items():
+        paths, levels = level_paths(x, y, to_level(np.asarray(positions[column], dtype=float)))
+        layers[mode] = (paths, of_level(levels))
+    finite = np.isfinite(x) & np.isfinite(y)
+    layers['bounds'] = ((x[finite].min(), x[finite].max(), y[finite].min(), y[finite].max())
+                        if finite.any() else None)
+    return layers
+
+def compute_outline(x, y, points=OUTLINE_POINTS):
+    # The reference lap resampled to evenly spaced points along its length, closed into a loop
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = np.isfinite(x) & np.isfinite(y)
+    x, y = x[keep], y[keep]
+    if len(x) < 2:
+        return np.empty((0, 2), dtype=np.float32)
+
+    along = np.concatenate([[0.0], np.cumsum(np.hypot(np.diff(x), np.diff(y)))])
+    grid = np.linspace(0.0, along[-1], points)
+    outline = np.column_stack([np.interp(grid, along, x), np.interp(grid, along, y)])
+    return np.vstack([outline, outline[:1]]).astype(np.float32)
+
+def reference_outline(session):
+    lap = pick_fastest_lap(session.laps)
+    if lap is None:
+        return np.empty((0, 2), dtype=np.float32)
+    positions = get_lap_positions(session, lap['Driver'], lap['LapNumber'])
+    return compute_outline(positions['X'], positions['Y'])
+
+
+# Circuit outlines keyed by (year, circuit): computed from the first session that needs
+# one, then kept in memory and as a small .npy next to the columnar store
+class OutlineCache:
+    def __init__(self, directory=OUTLINE_DIR):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.outlines = {}
+
+    def path(self, circuit_key):
+        year, circuit = circuit_key
+        name = ''.join(c if c.isalnum() else '_' for c in str(circuit)).strip('_').lower()
+        return os.path.join(self.directory, f"{year}_{name}.npy")
+
+    def get(self, circuit_key, compute):
+        with self.lock:
+            outline = self.outlines.get(circuit_key)
+        if outline is not None:
+            return outline
+
+        path = self.path(circuit_key)
+        try:
+            outline = np.load(path)
+        except (OSError, ValueError):
+            with span('trackmap.outline'):
+                outline = compute()
+            if not len(outline):
+                return outline  # no position data; try again with the next session
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = path + '.tmp.npy'
+            np.save(tmp, outline)
+            os.replace(tmp, path)
+
+        with self.lock:
+            self.outlines[circuit_key] = outline
+        return outline
+
+
+outline_cache = OutlineCache()
+
+
+def circuit_outline(session, circuit_key=None):
+    if circuit_key is None:
+        return reference_outline(session)
+    return outline_cache.get(circuit_key, lambda: reference_outline(session))
+
+def load_track_map(session, laps, circuit_key=None):
+    # laps is a list of (driver, lap number); returns ({label: lap_layers}, outline)
+    with span('trackmap.layers', laps=len(laps)):
+        layers = {
+            f"{driver} L{int(lap_number)}": lap_layers(get_lap_positions(session, driver, lap_number))
+            for driver, lap_number in laps
+        }
+    return layers, circuit_outline(session, circuit_key)
+
+
+# One LineCollection per lap, holding a path per colour level, reused across updates like
+# TelemetryPlotter's lines. The outline is a plain thick line behind them. While the canvas
+# is being zoomed or panned, the last render is frozen into an image that moves with the
+# data, so a frame costs one image blit however many laps are overlaid.
+class TrackMapPlotter:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ax = canvas.ax
+        self.collections = {}  # lap label -> LineCollection
+        self.layers = {}
+        self.color_by = 'Speed'
+        self.dirty = False
+
+        self.outline_line, = self.ax.plot([], [], color='#4d4d4d', linewidth=9,
+                                          solid_capstyle='round', solid_joinstyle='round', zorder=0)
+        _, _, _, _, cmap, norm = COLOR_MODES[self.color_by]
+        self.mappable = ScalarMappable(norm=norm, cmap=cmap)
+        self.colorbar = canvas.figure.colorbar(self.mappable, ax=self.ax, fraction=0.035, pad=0.01)
+        self.ax.set_aspect('equal', adjustable='box')
+        self.ax.set_xticks([])
+        self.ax.set_yticks([])
+
+        self.snapshot = AxesImage(self.ax, interpolation='bilinear', origin='upper', zorder=3)
+        self.snapshot.set_visible(False)
+        self.ax.add_image(self.snapshot)
+        interaction = getattr(canvas, 'interaction', None)
+        if interaction is not None:
+            interaction.on_begin.append(self.freeze)
+            interaction.on_end.append(self.thaw)
+
+    def plot(self, layers, outline):
+        self.layers = layers
+        with span('trackmap.artists', laps=len(layers)):
+            if outline is not None and len(outline):
+                self.outline_line.set_data(outline[:, 0], outline[:, 1])
+            else:
+                self.outline_line.set_data([], [])
+            self._update_collections()
+            self._fit_view()
+        self._request_draw()
+
+    def set_color_by(self, mode):
+        if mode == self.color_by or mode not in COLOR_MODES:
+            return
+        self.color_by = mode
+        self._update_collections()
+        self._request_draw()
+
+    def freeze(self):
+        if not self.collections or not hasattr(self.canvas, 'buffer_rgba'):
+            return
+        # Crops the axes out of the canvas buffer, which still holds the last full render;
+        # the crop is inset so the spines are not dragged along with the data
+        buffer = np.asarray(self.canvas.buffer_rgba())
+        height, width = buffer.shape[:2]
+        x0, y0, x1, y1 = np.round(self.ax.bbox.extents).astype(int) + [SNAPSHOT_INSET, SNAPSHOT_INSET,
+                                                                       -SNAPSHOT_INSET, -SNAPSHOT_INSET]
+        x0, y0, x1, y1 = max(x0, 0), max(y0, 0), min(x1, width), min(y1, height)
+        if x1 <= x0 or y1 <= y0:
+            return
+        (left, bottom), (right, top) = self.ax.transData.inverted().transform([(x0, y0), (x1, y1)])
+        self.snapshot.set_data(buffer[height - y1:height - y0, x0:x1].copy())
+        self.snapshot.set_extent((left, right, bottom, top))
+        self.snapshot.set_visible(True)
+        self.outline_line.set_visible(False)
+        for collection in self.collections.values():
+            collection.set_visible(False)
+
+    def thaw(self):
+        if not self.snapshot.get_visible():
+            return
+        self.snapshot.set_visible(False)
+        self.outline_line.set_visible(True)
+        for collection in self.collections.values():
+            collection.set_visible(True)
+
+    def flush(self):
+        if self.dirty and is_canvas_visible(self.canvas):
+            self.dirty = False
+            self.canvas.draw_idle()
+
+    def _update_collections(self):
+        _, bar_label, _, _, cmap, norm = COLOR_MODES[self.color_by]
+
+        for label in [label for label in self.collections if label not in self.layers]:
+            self.collections.pop(label).remove()
+
+        for label, layers in self.layers.items():
+            paths, values = layers[self.color_by]
+            collection = self.collections.get(label)
+            if collection is None:
+                collection = LineCollection([], linewidths=2, joinstyle='round', zorder=2)
+                self.ax.add_collection(collection)
+                self.collections[label] = collection
+            collection.set_segments(paths)
+            collection.set_array(values)
+            collection.set_cmap(cmap)
+            collection.set_norm(norm)
+
+        self.mappable.set_cmap(cmap)
+        self.mappable.set_norm(norm)
+        self.colorbar.update_normal(self.mappable)
+        self.colorbar.set_label(bar_label)
+        if self.color_by == 'Gear':
+            self.colorbar.set_ticks(range(1, GEARS + 1))
+
+        laps = len(self.layers)
+        self.ax.set_title(f"Track Map: {laps} lap{'s' if laps != 1 else ''} coloured by {self.color_by.lower()}"
+                          if laps else "Track Map")
+
+    def _fit_view(self):
+        # Collections are not part of relim(), so the view is fitted to the lap extents;
+        # like a fresh telemetry plot, new laps reset any zoom
+        bounds = [layers['bounds'] for layers in self.layers.values() if layers['bounds'] is not None]
+        outline = np.asarray(self.outline_line.get_xydata(), dtype=float).reshape(-1, 2)
+        if len(outline):
+            bounds.append((outline[:, 0].min(), outline[:, 0].max(), outline[:, 1].min(), outline[:, 1].max()))
+        if not bounds:
+            return
+        bounds = np.array(bounds)
+        x0, x1 = bounds[:, 0].min(), bounds[:, 1].max()
+        y0, y1 = bounds[:, 2].min(), bounds[:, 3].max()
+        pad = MAP_MARGIN * max(x1 - x0, y1 - y0, 1.0)
+        self.ax.set_xlim(x0 - pad, x1 + pad)
+        self.ax.set_ylim(y0 - pad, y1 + pad)
+
+    def _request_draw(self):
+        if is_canvas_visible(self.canvas):
+            self.dirty = False
+            self.canvas.draw_idle()
+        else:
+            self.dirty = True
@@ -0,0 +1,22 @@
+import numpy as np
+
+
+def format_lap_times(lap_times):
+    import pandas as pd  # on first use, not at start-up (see main.py)
+
+    # m:ss.mmm for a whole column at once, "N/A" where the lap has no time
+    seconds = pd.to_timedelta(pd.Series(lap_times)).dt.total_seconds().to_numpy()
+    valid = ~np.isnan(seconds)
+    total_ms = np.round(np.where(valid, seconds, 0) * 1000).astype(np.int64)
+
+    text = (pd.Series(total_ms // 60000).astype(str) + ':'
+            + pd.Series(total_ms // 1000 % 60).astype(str).str.zfill(2) + '.'
+            + pd.Series(total_ms % 1000).astype(str).str.zfill(3))
+    return np.where(valid, text.to_numpy(dtype=str), 'N/A')
+
+def lap_labels(laps):
+    import pandas as pd
+
+    numbers = laps['LapNumber'].to_numpy()
+    prefix = pd.Series(numbers).fillna(0).astype(int).astype(str).to_numpy(dtype=str)
+    return np.char.add(np.char.add('Lap ', prefix), np.char.add(' - ', format_lap_times(laps['LapTime'])))
@@ -1,9 +1,50 @@
+import time
+
+STARTED_NS = time.perf_counter_ns()  # start of the startup report's clock
+
+import os
 import sys
-from PyQt5.QtWidgets import QApplication
-from ui.main_window import RacePulseApp
 
-if __name__ == "__main__":
+from logic.startup import startup_report
+from logic.tracing import configure_from_env
+
+DATA_WORKER_ENV = 'RACEPULSE_DATA_WORKER'
+
+
+# Qt and the UI are imported inside main() so the data worker, which is spawned and
+# re-imports this module, starts without them. Nothing on the way to the first frame
+# imports FastF1, pandas or matplotlib: the window loads its plotting stack once it is
+# painted, and the data stack is imported where it is first used.
+def main():
+    startup_report.start(STARTED_NS)
+    configure_from_env()
+    from PyQt5.QtWidgets import QApplication
+    from ui.main_window import RacePulseApp
+    from logic.session_registry import session_registry
+    startup_report.mark('imports')
+
     app = QApplication(sys.argv)
+    startup_report.mark('qt')
     window = RacePulseApp()
+    startup_report.mark('window')
+    window.first_painted.connect(lambda: startup_report.mark('visible'))
+    window.plots_ready.connect(lambda: on_plots_ready(app))
+
+    # The worker process is spawned once the plots are up, so its FastF1 import does not
+    # compete with theirs; a load asked for before then starts it early
+    if os.environ.get(DATA_WORKER_ENV, '1') != '0':
+        from logic.data_worker import data_worker
+        session_registry.loader = data_worker.load_session
+        window.plots_ready.connect(data_worker.start)
+
     window.show()
-    sys.exit(app.exec_())
\ No newline at end of file
+    return app.exec_()
+
+def on_plots_ready(app):
+    startup_report.mark('plots')
+    if startup_report.finish():
+        app.quit()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+import math
+
+import numpy as np
+from PyQt5.QtCore import Qt, QTimer
+
+FRAME_MS = 16
+SETTLE_MS = 150
+ZOOM_SCALE = 1.2
+SCROLL_INSET = 2  # px of the plot area left out of a scroll, so the spines are not dragged along
+
+
+# While the user scrolls or drags, the lines and axes are marked animated so one full draw
+# caches everything else as a background, the legend included: it has a fixed place and
+# redrawing it every frame cost more than the lines. Each frame restores that background
+# and blits only the moving artists. Mouse bursts are merged into at most one frame per
+# FRAME_MS, and a normal full draw runs once the interaction settles.
+#
+# A drag only translates the view, so after its first frame the plot area already on the
+# canvas is scrolled by whole pixels instead: only the strip it uncovers and the tick band
+# of the axis that moved are drawn again, which keeps the frame cost flat in the number of
+# traces. Zoom steps, and frames with overlays or other artists pinned inside the axes,
+# are drawn in full.
+class CanvasInteraction:
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.ax = canvas.ax
+        self.background = None
+        self.drawn = None  # (xlim, ylim) of the frame on the canvas, while one is
+        self.legend_bbox = None  # display bbox of the legend in the background
+        self.tick_boxes = {}  # axis -> {(tick location, label): display bbox} as on the canvas
+        self.animated = []
+        self.press = None
+        self.pending_limits = None
+        self.on_begin = []  # called before the background is captured, e.g. to swap in a raster
+        self.on_end = []  # called before the settle redraw
+        self.overlays = []  # artists animated by someone else, e.g. replay markers, drawn on every frame
+
+        self.frame_timer = QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_MS)
+        self.frame_timer.timeout.connect(self.render_frame)
+
+        self.settle_timer = QTimer()
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(SETTLE_MS)
+        self.settle_timer.timeout.connect(self.end)
+
+        canvas.mpl_connect('scroll_event', self.on_scroll)
+        canvas.mpl_connect('button_press_event', self.on_press)
+        canvas.mpl_connect('motion_notify_event', self.on_motion)
+        canvas.mpl_connect('button_release_event', self.on_release)
+
+    def moving_artists(self):
+        artists = (list(self.ax.lines) + list(self.ax.collections) + list(self.ax.images)
+                   + [self.ax.xaxis, self.ax.yaxis])
+        return artists
+
+    def begin(self):
+        if self.background is not None:
+            return
+        for hook in self.on_begin:
+            hook()
+        # Artists that are already animated (cursors, markers) belong to their owner and stay so
+        self.animated = [artist for artist in self.moving_artists() if not artist.get_animated()]
+        for artist in self.animated:
+            artist.set_animated(True)
+        self.canvas.draw()
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.drawn = None
+        self.tick_boxes = {}
+        legend = self.ax.get_legend()
+        self.legend_bbox = (legend.get_window_extent(self.canvas.get_renderer()).padded(1)
+                            if legend is not None and legend.get_visible() else None)
+
+    def end(self):
+        if self.background is None:
+            return
+        if self.pending_limits is not None:
+            self.apply_limits()
+        for hook in self.on_end:
+            hook()
+        for artist in self.animated:
+            artist.set_animated(False)
+        self.animated = []
+        self.background = None
+        self.drawn = None
+        self.canvas.draw_idle()
+
+    def schedule(self, xlim, ylim):
+        self.pending_limits = (xlim, ylim)
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def apply_limits(self):
+        xlim, ylim = self.pending_limits
+        self.pending_limits = None
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+
+    def render_frame(self):
+        if self.pending_limits is None or self.background is None:
+            return
+        drawn = self.drawn
+        self.apply_limits()
+        shift = self.pixel_shift(drawn)
+        if shift is not None:
+            self.scroll(*shift)
+        else:
+            self.tick_boxes = {}
+            self.canvas.restore_region(self.background)
+            for artist in self.animated + self.overlays:
+                self.ax.draw_artist(artist)
+        self.drawn = (self.ax.get_xlim(), self.ax.get_ylim())
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def pixel_shift(self, drawn):
+        # (dx, dy) in whole pixels when the new limits only translate the frame on the
+        # canvas, or None when it has to be drawn in full
+        ax = self.ax
+        if drawn is None or ax.get_xscale() != 'linear' or ax.get_yscale() != 'linear':
+            return None
+        if ax.xaxis.get_ticks_position() != 'bottom' or ax.yaxis.get_ticks_position() != 'left':
+            return None
+        pinned = list(ax.texts) + list(ax.patches) + list(ax.artists) + list(ax.tables) + self.overlays
+        if any(artist.get_visible() for artist in pinned):
+            return None
+
+        shift = []
+        for (old0, old1), (new0, new1), size in zip(drawn, (ax.get_xlim(), ax.get_ylim()),
+                                                     (ax.bbox.width, ax.bbox.height)):
+            span = old1 - old0
+            if span == 0 or abs((new1 - new0) - span) > 1e-9 * abs(span):
+                return None  # zoomed
+            pixels = (old0 - new0) / span * size
+            if abs(pixels - round(pixels)) > 1e-3 or abs(pixels) > size / 2:
+                return None
+            shift.append(int(round(pixels)))
+        return shift
+
+    def scroll(self, dx, dy):
+        from matplotlib.transforms import Bbox  # with the canvas, after start-up
+
+        ax, canvas = self.ax, self.canvas
+        width, height = canvas.figure.bbox.width, canvas.figure.bbox.height
+        x0, y0, x1, y1 = ax.bbox.extents
+        outer = Bbox.from_extents(round(x0), round(y0), round(x1), round(y1))
+        inner = Bbox.from_extents(math.ceil(x0) + SCROLL_INSET, math.ceil(y0) + SCROLL_INSET,
+                                  math.floor(x1) - SCROLL_INSET, math.floor(y1) - SCROLL_INSET)
+
+        # Region extents are in image coordinates, whose rows run downwards
+        region = canvas.copy_from_bbox(inner)
+        left, top, right, bottom = region.get_extents()
+        canvas.restore_region(region, bbox=(left + max(-dx, 0), top + max(dy, 0),
+                                            right - max(dx, 0), bottom - max(-dy, 0)),
+                              xy=(left + dx, top - dy))
+        # The inset ring keeps the spines; whatever of the data was in it is cleared
+        for ring in ((outer.x0, outer.y0, inner.x0, outer.y1), (inner.x1, outer.y0, outer.x1, outer.y1),
+                     (inner.x0, outer.y0, inner.x1, inner.y0), (inner.x0, inner.y1, inner.x1, outer.y1)):
+            self.restore(Bbox.from_extents(*ring))
+
+        xticks, yticks = ax.xaxis._update_ticks(), ax.yaxis._update_ticks()
+        ticks = xticks + yticks
+        data = sorted((artist for artist in self.animated if artist not in (ax.xaxis, ax.yaxis)),
+                      key=lambda artist: artist.get_zorder())
+        strips = []
+        if dx:
+            strips.append((inner.x0, inner.y0, inner.x0 + dx, inner.y1) if dx > 0
+                          else (inner.x1 + dx, inner.y0, inner.x1, inner.y1))
+        if dy:
+            strips.append((inner.x0, inner.y0, inner.x1, inner.y0 + dy) if dy > 0
+                          else (inner.x0, inner.y1 + dy, inner.x1, inner.y1))
+        for strip in map(lambda extents: Bbox.from_extents(*extents), strips):
+            self.restore(strip)
+            self.draw_clipped([tick.gridline for tick in ticks], strip)
+            self.draw_strip(data, strip)
+
+        # Tick labels move with the data but live outside the axes, below it for x and left
+        # of it for y
+        renderer = canvas.get_renderer()
+        if dx:
+            self.scroll_ticks(ax.xaxis, xticks, (dx, 0), Bbox.from_extents(0, 0, width, outer.y0),
+                              ax.yaxis, yticks, renderer)
+        if dy:
+            self.scroll_ticks(ax.yaxis, yticks, (0, dy), Bbox.from_extents(0, 0, outer.x0, height),
+                              ax.xaxis, xticks, renderer)
+
+        if self.legend_bbox is not None:
+            self.restore(self.legend_bbox)
+
+    def scroll_ticks(self, axis, ticks, shift, band, other_axis, other_ticks, renderer):
+        # Labels still in view are copied along with the scroll and only those coming into
+        # view are drawn. The whole band is drawn again on the first scroll, and whenever a
+        # label would cross one of the other axis or the edge of the canvas.
+        from matplotlib.transforms import Bbox
+
+        previous = self.tick_boxes.get(axis)
+        current = {(tick.get_loc(), tick.label1.get_text()): tick for tick in ticks}
+        if previous is not None and not axis.major.formatter.get_offset():
+            moved = {key: box.translated(*shift) for key, box in previous.items() if key in current}
+            entered = {key: self.tick_box(tick, renderer) for key, tick in current.items() if key not in previous}
+            boxes = list(previous.values()) + list(moved.values()) + list(entered.values())
+            others = self.tick_boxes.get(other_axis)
+            if others is None:
+                others = self.tick_boxes[other_axis] = self.tick_boxes_of(other_ticks, renderer)
+            canvas = Bbox.from_extents(0, 0, self.canvas.figure.bbox.width, self.canvas.figure.bbox.height)
+            if all(canvas.containsx(box.x0) and canvas.containsx(box.x1) and canvas.containsy(box.y0)
+                   and canvas.containsy(box.y1) and not any(box.overlaps(other) for other in others.values())
+                   for box in boxes):
+                height = self.canvas.figure.bbox.height
+                copies = [(self.canvas.copy_from_bbox(previous[key]), box) for key, box in moved.items()]
+                for box in previous.values():
+                    self.restore(box)
+                for region, box in copies:
+                    self.canvas.restore_region(region, xy=(int(box.x0), int(height - box.y1)))
+                for key in entered:
+                    self.ax.draw_artist(current[key].tick1line)
+                    self.ax.draw_artist(current[key].label1)
+                self.tick_boxes[axis] = {**moved, **entered}
+                return
+
+        labels = [tick.label1 for tick in other_ticks] + [other_axis.label, other_axis.offsetText]
+        marks = ([artist for tick in ticks for artist in (tick.tick1line, tick.label1)] + [axis.label, axis.offsetText]
+                 + [tick.tick1line for tick in other_ticks]
+                 + [label for label in labels if label.get_visible() and label.get_text()
+                    and label.get_window_extent(renderer).overlaps(band)])
+        self.restore(band)
+        self.draw_clipped([artist for artist in marks if artist.get_visible()], band)
+        self.tick_boxes[axis] = self.tick_boxes_of(ticks, renderer)
+
+    def tick_boxes_of(self, ticks, renderer):
+        return {(tick.get_loc(), tick.label1.get_text()): self.tick_box(tick, renderer) for tick in ticks}
+
+    def tick_box(self, tick, renderer):
+        # Whole pixels around a tick's label and mark, with a pixel to spare for antialiasing
+        from matplotlib.transforms import Bbox
+
+        extents = [artist.get_window_extent(renderer) for artist in (tick.tick1line, tick.label1)
+                   if artist.get_visible()]
+        box = Bbox.union(extents) if extents else Bbox.null()
+        return Bbox.from_extents(math.floor(box.x0) - 1, math.floor(box.y0) - 1,
+                                 math.ceil(box.x1) + 1, math.ceil(box.y1) + 1)
+
+    def draw_strip(self, artists, strip):
+        # Agg rasterises the whole of a clipped path, so plain lines along x (every telemetry
+        # trace) are cut down to the samples around the strip and drawn as one collection
+        from matplotlib.collections import LineCollection
+        from matplotlib.colors import to_rgba
+
+        (x0, _), (x1, _) = self.ax.transData.inverted().transform([(strip.x0, strip.y0), (strip.x1, strip.y1)])
+        x0, x1 = min(x0, x1), max(x0, x1)
+        batch = []
+
+        def flush():
+            if batch:
+                collection = LineCollection(
+                    [segment for segment, _ in batch], transform=self.ax.transData,
+                    colors=[to_rgba(line.get_color(), line.get_alpha()) for _, line in batch],
+                    linewidths=[line.get_linewidth() for _, line in batch],
+                    antialiaseds=[line.get_antialiased() for _, line in batch])
+                self.draw_clipped([collection], strip)
+                batch.clear()
+
+        for artist in artists:
+            segment = self.strip_segment(artist, x0, x1)
+            if segment is None:
+                flush()
+                self.draw_clipped([artist], strip)
+            elif len(segment):
+                batch.append((segment, artist))
+        flush()
+
+    def strip_segment(self, artist, x0, x1):
+        # The samples of a plain, x-sorted data line around [x0, x1], or None for anything else
+        from matplotlib.lines import Line2D
+
+        if (not isinstance(artist, Line2D) or not artist.get_visible()
+                or artist.get_transform() is not self.ax.transData or artist.get_linestyle() != '-'
+                or artist.get_marker() not in ('None', '', None) or artist.get_drawstyle() != 'default'):
+            return None
+        x, y = (np.asarray(values, dtype=float) for values in artist.get_data())
+        if x.ndim != 1 or len(x) < 2 or np.any(x[1:] < x[:-1]):
+            return None
+        lo = max(np.searchsorted(x, x0, side='left') - 1, 0)
+        hi = np.searchsorted(x, x1, side='right') + 1
+        return np.column_stack([x[lo:hi], y[lo:hi]])
+
+    def restore(self, bbox):
+        # Puts back the background inside a display-space bbox
+        height = self.canvas.figure.bbox.height
+        x0, y0, x1, y1 = (int(math.floor(bbox.x0)), int(math.floor(height - bbox.y1)),
+                          int(math.ceil(bbox.x1)), int(math.ceil(height - bbox.y0)))
+        if x1 > x0 and y1 > y0:
+            self.canvas.restore_region(self.background, bbox=(x0, y0, x1, y1))
+
+    def draw_clipped(self, artists, bbox):
+        for artist in artists:
+            clip_box, clip_on = artist.get_clip_box(), artist.get_clip_on()
+            artist.set_clip_box(bbox)
+            artist.set_clip_on(True)
+            self.ax.draw_artist(artist)
+            artist.set_clip_box(clip_box)
+            artist.set_clip_on(clip_on)
+
+    def on_scroll(self, event):
+        if event.inaxes is not self.ax:
+            return
+        self.begin()
+
+        xlim, ylim = self.pending_limits or (self.ax.get_xlim(), self.ax.get_ylim())
+        scale = 1 / ZOOM_SCALE if event.button == 'up' else ZOOM_SCALE
+        x0, x1 = xlim
+        y0, y1 = ylim
+        relx = (event.xdata - x0) / (x1 - x0)
+        rely = (event.ydata - y0) / (y1 - y0)
+        width = (x1 - x0) * scale
+        height = (y1 - y0) * scale
+
+        self.schedule(
+            (event.xdata - width * relx, event.xdata + width * (1 - relx)),
+            (event.ydata - height * rely, event.ydata + height * (1 - rely)),
+        )
+        self.settle_timer.start()
+
+    def on_press(self, event):
+        if event.button != 1 or event.inaxes is not self.ax:
+            return
+        self.settle_timer.stop()
+        self.begin()
+        # Pan in pixel space against the limits at press time, so the data under the
+        # cursor stays put even though the transform changes on every frame
+        self.press = (event.x, event.y, self.ax.get_xlim(), self.ax.get_ylim())
+
+    def on_motion(self, event):
+        if self.press is None:
+            return
+        x, y, (x0, x1), (y0, y1) = self.press
+        bbox = self.ax.bbox
+        # Whole pixels, so consecutive frames differ by a scroll
+        dx = round(event.x - x) * (x1 - x0) / bbox.width
+        dy = round(event.y - y) * (y1 - y0) / bbox.height
+        self.schedule((x0 - dx, x1 - dx), (y0 - dy, y1 - dy))
+
+    def on_release(self, event):
+        if self.press is None:
+            return
+        self.press = None
+        self.frame_timer.stop()
+        self.end()
+
+
+def blit_figure(canvas):
+    # Qt's paintEvent runs a pending draw_idle first, so blits from a draw_event can land
+    # inside a paint; the buffer is painted right after, and repainting there would recurse
+    if not canvas.testAttribute(Qt.WA_WState_InPaintEvent):
+        canvas.blit(canvas.figure.bbox)
+
+
+def enable_zoom_pan(canvas):
+    # mpl_connect only keeps weak references to bound methods, so the canvas owns it
+    canvas.interaction = CanvasInteraction(canvas)
+    return canvas.interaction
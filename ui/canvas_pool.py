@@ -0,0 +1,76 @@
+from PyQt5.QtCore import Qt
+from matplotlib import style
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+from ui.canvas_interaction import enable_zoom_pan
+from logic.tracing import trace_canvas
+
+MAX_IDLE = 5  # one Playground panel's worth of canvases is kept warm
+PANEL_FACE = '#2d2d2d'
+
+
+# Dark telemetry canvases for Playground panels. A panel takes one when a tab is first
+# shown and gives it back when it closes; the figure, axes, zoom/pan and draw tracing are
+# kept, so the next panel skips building them. Canvases beyond MAX_IDLE are destroyed.
+class CanvasPool:
+    def __init__(self, max_idle=MAX_IDLE):
+        self.max_idle = max_idle
+        self.idle = []
+        self.created = 0
+
+    def acquire(self, title):
+        canvas = self.idle.pop() if self.idle else self.create()
+        canvas.ax.set_title(title, color='#ffffff', pad=10, fontsize=11, fontweight='bold')
+        return canvas
+
+    def release(self, canvas):
+        interaction = canvas.interaction
+        interaction.frame_timer.stop()
+        interaction.settle_timer.stop()
+        interaction.press = None
+        interaction.end()
+        canvas.ax.set(xlim=(0, 1), ylim=(0, 1), xlabel='', ylabel='')
+        canvas.ax.set_autoscale_on(True)
+        canvas.setParent(None)
+        if len(self.idle) < self.max_idle:
+            self.idle.append(canvas)
+        else:
+            self.destroy(canvas)
+
+    def clear(self):
+        while self.idle:
+            self.destroy(self.idle.pop())
+
+    def create(self):
+        # The dark style only applies while the figure and axes are built, not app-wide
+        with style.context('dark_background'):
+            fig = Figure(figsize=(8, 4), tight_layout=True)
+            fig.set_facecolor(PANEL_FACE)
+            canvas = FigureCanvas(fig)
+            ax = fig.add_subplot(111)
+
+        ax.set_facecolor(PANEL_FACE)
+        ax.grid(True, color='#4d4d4d', linestyle='--', alpha=0.5)
+        for spine in ax.spines.values():
+            spine.set_visible(False)
+        ax.tick_params(axis='x', colors='#ffffff')
+        ax.tick_params(axis='y', colors='#ffffff')
+        ax.xaxis.label.set_color('#ffffff')
+        ax.yaxis.label.set_color('#ffffff')
+        ax.title.set_color('#ffffff')
+
+        canvas.ax = ax
+        canvas.setFocusPolicy(Qt.ClickFocus)
+        enable_zoom_pan(canvas)
+        trace_canvas(canvas)
+        self.created += 1
+        return canvas
+
+    def destroy(self, canvas):
+        canvas.figure.clear()
+        canvas.interaction = None
+        canvas.deleteLater()
+
+
+canvas_pool = CanvasPool()
@@ -0,0 +1,135 @@
+import numpy as np
+from PyQt5.QtCore import QTimer
+from matplotlib.lines import Line2D
+
+from ui.canvas_interaction import blit_figure
+
+FRAME_MS = 16
+
+
+def value_at(x, y, distance):
+    # x is the cumulative lap distance, so it is sorted and a binary search finds the sample
+    if len(x) == 0:
+        return np.nan
+    i = np.searchsorted(x, distance)
+    if i >= len(x):
+        i = len(x) - 1
+    elif i > 0 and distance - x[i - 1] < x[i] - distance:
+        i -= 1
+    return y[i]
+
+
+# One vertical cursor per canvas, all driven by whichever canvas the mouse is over. The
+# cursor and readout are animated artists blitted over a background cached after each full
+# draw, so hovering never triggers a full redraw or matplotlib hit-testing. Canvases come
+# and go with the plotter's attach()/detach().
+class TelemetryCrosshair:
+    def __init__(self, plotter):
+        self.plotter = plotter
+        self.distance = None
+        self.backgrounds = {}
+        self.artists = {}  # canvas -> (cursor, readout)
+        self.connections = {}  # canvas -> mpl connection ids
+
+        self.frame_timer = QTimer()
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(FRAME_MS)
+        self.frame_timer.timeout.connect(self.render)
+
+        for index, canvas in enumerate(plotter.canvases):
+            if canvas is not None:
+                self.attach(index, canvas)
+        plotter.on_attach.append(self.attach)
+        plotter.on_detach.append(self.detach)
+
+    def attach(self, index, canvas):
+        ax = canvas.ax
+        cursor = Line2D([0, 0], [0, 1], transform=ax.get_xaxis_transform(),
+                        color='white', linewidth=0.8, alpha=0.8, animated=True, visible=False)
+        ax.add_artist(cursor)
+        readout = ax.text(0.01, 0.98, '', transform=ax.transAxes, va='top', ha='left',
+                          family='monospace', fontsize=8, animated=True, visible=False,
+                          bbox=dict(facecolor='black', alpha=0.6, edgecolor='none'))
+        self.artists[canvas] = (cursor, readout)
+        self.connections[canvas] = [
+            canvas.mpl_connect('draw_event', lambda event: self.on_draw(canvas)),
+            canvas.mpl_connect('motion_notify_event', self.on_motion),
+            canvas.mpl_connect('axes_leave_event', self.on_leave),
+        ]
+
+    def detach(self, index, canvas):
+        for cid in self.connections.pop(canvas, []):
+            canvas.mpl_disconnect(cid)
+        for artist in self.artists.pop(canvas, ()):
+            artist.remove()
+        self.backgrounds.pop(canvas, None)
+
+    def is_panning(self, canvas):
+        interaction = getattr(canvas, 'interaction', None)
+        return interaction is not None and bool(interaction.animated)
+
+    def on_draw(self, canvas):
+        if self.is_panning(canvas):
+            self.backgrounds.pop(canvas, None)
+            return
+        self.backgrounds[canvas] = canvas.copy_from_bbox(canvas.figure.bbox)
+        self.blit(canvas)
+
+    def on_motion(self, event):
+        if event.inaxes is None or event.button is not None or self.is_panning(event.canvas):
+            return
+        self.distance = event.xdata
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def on_leave(self, event):
+        self.distance = None
+        self.render()
+
+    def show_distance(self, distance):
+        # Driven by replay playback rather than the mouse; None hides the cursor
+        self.distance = distance
+        self.render()
+
+    def readout_text(self):
+        lines = []
+        columns = self.plotter.data
+        for label in columns[0]:
+            values = []
+            for channel in columns:
+                x, y = channel.get(label, ((), ()))
+                values.append(value_at(x, y, self.distance))
+            speed, throttle, brake, gear = values[:4]
+            name = '' if label == 'lap' else f"{label:<4}"
+            line = f"{name}{speed:5.0f} km/h  thr {throttle:3.0f}%  brk {brake:1.0f}  gear {gear:1.0f}"
+            if len(values) > 4 and not np.isnan(values[4]):
+                line += f"  Δ {values[4]:+6.3f}s"
+            lines.append(line)
+        return f"{self.distance:7.0f} m\n" + "\n".join(lines)
+
+    def render(self):
+        visible = self.distance is not None and bool(self.plotter.data[0])
+        text = self.readout_text() if visible else ''
+        for canvas, (cursor, readout) in self.artists.items():
+            cursor.set_visible(visible)
+            readout.set_visible(visible)
+            if visible:
+                cursor.set_xdata([self.distance, self.distance])
+                readout.set_text(text)
+            self.blit(canvas)
+
+    def blit(self, canvas):
+        background = self.backgrounds.get(canvas)
+        if background is None or not canvas.isVisible():
+            return
+        cursor, readout = self.artists[canvas]
+        canvas.restore_region(background)
+        canvas.ax.draw_artist(cursor)
+        canvas.ax.draw_artist(readout)
+        blit_figure(canvas)
+
+
+def attach_crosshair(plotter):
+    # Callbacks are held weakly by matplotlib, so the plotter keeps the crosshair alive
+    plotter.crosshair = TelemetryCrosshair(plotter)
+    return plotter.crosshair
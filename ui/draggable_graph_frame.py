@@ -1,7 +1,10 @@
 from PyQt5.QtWidgets import QFrame, QVBoxLayout, QPushButton, QHBoxLayout
-from PyQt5.QtCore import Qt, QPoint, QSize
+from PyQt5.QtCore import Qt, QPoint, QSize, pyqtSignal
 
 class DraggableGraphFrame(QFrame):
+    geometry_changed = pyqtSignal()  # moved or resized
+    closed = pyqtSignal(object)
+
     def __init__(self, inner_widget, parent=None):
         super().__init__(parent)
         self.inner_widget = inner_widget
@@ -25,7 +28,7 @@ class DraggableGraphFrame(QFrame):
 
         close_btn = QPushButton("❌")
         close_btn.setFixedSize(20, 20)
-        close_btn.clicked.connect(self.deleteLater)
+        close_btn.clicked.connect(self.close_frame)
 
         header.addWidget(self.title)
         header.addStretch()
@@ -37,6 +40,25 @@ class DraggableGraphFrame(QFrame):
 
         self.setLayout(wrapper_layout)
 
+    def close_frame(self):
+        # Tear the panel down now rather than whenever Qt deletes it
+        if hasattr(self.inner_widget, 'teardown'):
+            self.inner_widget.teardown()
+        self.closed.emit(self)
+        self.deleteLater()
+
+    def set_on_screen(self, on_screen):
+        if hasattr(self.inner_widget, 'set_on_screen'):
+            self.inner_widget.set_on_screen(on_screen)
+
+    def moveEvent(self, event):
+        super().moveEvent(event)
+        self.geometry_changed.emit()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.geometry_changed.emit()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.LeftButton:
             if self.cursor().shape() == Qt.SizeFDiagCursor:
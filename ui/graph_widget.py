@@ -3,18 +3,20 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPalette, QColor
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import mplcursors
-import fastf1
-import matplotlib.pyplot as plt
-from matplotlib import style
-
-from logic.telemetry_loader import load_session_data, get_driver_laps
-from logic.plotter import plot_lap_telemetry, plot_comparison_telemetry
+
+from logic.telemetry_loader import get_drivers, get_driver_laps, get_lap_telemetry, pick_fastest_lap, has_telemetry
+from logic.session_registry import session_registry
+from logic.schedule_service import schedule_service, SUPPORTED_YEARS
+from logic.plotter import TelemetryPlotter
 from ui.settings_dialog import ComparisonSettingsDialog
+from ui.session_loader import SessionLoader
+from ui.render_scheduler import RenderScheduler
+from ui.canvas_pool import canvas_pool
+from ui.crosshair import attach_crosshair
+from ui.lap_model import LapListModel
+from logic.tracing import tracer, span
 
-fastf1.Cache.enable_cache('./resources/cache')
+TABS = ["Speed", "Throttle", "Brake", "Gear", "Delta"]
 
 class GraphWidget(QWidget):
     def __init__(self, parent=None, session=None):
@@ -22,6 +24,25 @@ class GraphWidget(QWidget):
         self.session = session
         self.comparison_drivers = []
         self.event_schedule = {}
+
+        self.session_loader = SessionLoader(self)
+        self.session_loader.progress.connect(self.on_load_progress)
+        self.session_loader.loaded.connect(self.on_session_loaded)
+        self.session_loader.failed.connect(self.on_session_failed)
+        self.session_loader.cancelled.connect(self.reset_load_button)
+        self.session_loader.telemetry_loaded.connect(self.on_telemetry_loaded)
+        self.session_loader.comparison_ready.connect(self.on_comparison_ready)
+        self.session_loader.schedule_loaded.connect(self.on_schedule_loaded)
+        self.session_loader.schedule_failed.connect(self.on_schedule_failed)
+        self.pending_stages = set()  # stages waiting for the telemetry tier
+        self.on_screen = True  # cleared by the Playground while the panel is scrolled out of view
+
+        # Same coalescing as RacePulseApp: selector signals mark stages, each runs once per turn
+        self.scheduler = RenderScheduler(self)
+        for name, stage in [('schedule', self.load_event_schedule), ('circuit', self.update_circuit_info),
+                            ('laps', self.populate_lap_dropdown), ('lap', self.plot_selected_lap),
+                            ('comparison', self.plot_comparison)]:
+            self.scheduler.add_stage(name, stage)
         
         self.setStyleSheet("""
             QWidget {
@@ -67,6 +88,7 @@ class GraphWidget(QWidget):
         
         self.setup_ui()
         self.init_plot()
+        self.scheduler.request('schedule')
 
     def setup_ui(self):
         main_layout = QVBoxLayout()
@@ -86,18 +108,21 @@ class GraphWidget(QWidget):
         top_row.addWidget(self.mode_dropdown)
 
         self.year_dropdown = QComboBox()
-        self.year_dropdown.addItems(["2021", "2022", "2023", "2024"])
-        self.year_dropdown.currentIndexChanged.connect(self.load_event_schedule)
+        self.year_dropdown.addItems([str(year) for year in SUPPORTED_YEARS])
+        self.year_dropdown.currentIndexChanged.connect(lambda: self.scheduler.request('schedule'))
+        self.year_dropdown.currentIndexChanged.connect(self.session_loader.cancel)
         top_row.addWidget(QLabel("Year:"))
         top_row.addWidget(self.year_dropdown)
 
         self.race_dropdown = QComboBox()
-        self.race_dropdown.currentIndexChanged.connect(self.update_circuit_info)
+        self.race_dropdown.currentIndexChanged.connect(lambda: self.scheduler.request('circuit'))
+        self.race_dropdown.currentIndexChanged.connect(self.session_loader.cancel)
         top_row.addWidget(QLabel("GP:"))
         top_row.addWidget(self.race_dropdown)
 
         self.session_dropdown = QComboBox()
         self.session_dropdown.addItems(["Q", "R", "FP1", "FP2"])
+        self.session_dropdown.currentIndexChanged.connect(self.session_loader.cancel)
         top_row.addWidget(QLabel("Session:"))
         top_row.addWidget(self.session_dropdown)
 
@@ -111,9 +136,11 @@ class GraphWidget(QWidget):
         self.driver_dropdown = QComboBox()
         second_row.addWidget(QLabel("Driver:"))
         second_row.addWidget(self.driver_dropdown)
-        self.driver_dropdown.currentIndexChanged.connect(self.populate_lap_dropdown)
+        self.driver_dropdown.currentIndexChanged.connect(self.on_driver_selected)
 
         self.lap_dropdown = QComboBox()
+        self.lap_model = LapListModel(self)
+        self.lap_dropdown.setModel(self.lap_model)
         second_row.addWidget(QLabel("Lap:"))
         second_row.addWidget(self.lap_dropdown)
         self.lap_dropdown.currentIndexChanged.connect(self.on_lap_selected)
@@ -157,48 +184,53 @@ class GraphWidget(QWidget):
         main_layout.addWidget(self.circuit_info_label)
 
     def init_plot(self):
+        # Tabs start as empty pages; a pooled canvas goes in the first time each one is shown
         self.tabs = QTabWidget()
-        self.speed_canvas = self.create_plot_canvas("Speed")
-        self.throttle_canvas = self.create_plot_canvas("Throttle")
-        self.brake_canvas = self.create_plot_canvas("Brake")
-        self.gear_canvas = self.create_plot_canvas("Gear")
+        for title in TABS:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.tabs.addTab(page, title)
 
-        self.tabs.addTab(self.speed_canvas, "Speed")
-        self.tabs.addTab(self.throttle_canvas, "Throttle")
-        self.tabs.addTab(self.brake_canvas, "Brake")
-        self.tabs.addTab(self.gear_canvas, "Gear")
+        self.plotter = TelemetryPlotter([None] * len(TABS))
+        self.tabs.currentChanged.connect(self.ensure_canvas)
+        self.tabs.currentChanged.connect(self.plotter.flush)
+        attach_crosshair(self.plotter)
 
         self.layout().addWidget(self.tabs)
 
-    def create_plot_canvas(self, title):
-        # Set dark theme for matplotlib
-        plt.style.use('dark_background')
-        
-        fig = Figure(figsize=(8, 4), tight_layout=True)
-        fig.set_facecolor('#2d2d2d')
-        canvas = FigureCanvas(fig)
-        ax = fig.add_subplot(111)
-        
-        # Style the plot - remove borders and adjust colors
-        ax.set_facecolor('#2d2d2d')
-        ax.grid(True, color='#4d4d4d', linestyle='--', alpha=0.5)
-        
-        # Remove the border (spines)
-        for spine in ax.spines.values():
-            spine.set_visible(False)
-            
-        ax.tick_params(axis='x', colors='#ffffff')
-        ax.tick_params(axis='y', colors='#ffffff')
-        ax.xaxis.label.set_color('#ffffff')
-        ax.yaxis.label.set_color('#ffffff')
-        ax.title.set_color('#ffffff')
-        
-        # Set title with better styling
-        ax.set_title(title, color='#ffffff', pad=10, fontsize=11, fontweight='bold')
-        
-        canvas.ax = ax
-        mplcursors.cursor(ax, hover=True)
-        return canvas
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.ensure_canvas(self.tabs.currentIndex())
+
+    def set_on_screen(self, on_screen):
+        # Off screen, plots still update but their draws wait; they catch up once the panel
+        # scrolls back into view. A panel added off screen takes its canvas only then.
+        self.on_screen = on_screen
+        if on_screen and self.isVisible():
+            self.ensure_canvas(self.tabs.currentIndex())
+        self.plotter.suspend(not on_screen)
+
+    def ensure_canvas(self, index):
+        # Also reached from tab switches, which an off-screen panel still gets; the current
+        # tab's canvas is built when set_on_screen brings the panel back
+        if index < 0 or not self.on_screen or self.plotter.canvases[index] is not None:
+            return
+        with span('ui.panel_canvas', tab=TABS[index]):
+            canvas = canvas_pool.acquire(TABS[index])
+            self.tabs.widget(index).layout().addWidget(canvas)
+            canvas.show()
+            self.plotter.attach(index, canvas)
+
+    def teardown(self):
+        # The panel is closing: drop pending work and the session, and hand the canvases
+        # back to the pool with nothing of this panel left on them
+        self.scheduler.cancel()
+        self.session_loader.shutdown()
+        self.release_session()
+        canvases = [canvas for canvas in self.plotter.canvases if canvas is not None]
+        self.plotter.clear()
+        for canvas in canvases:
+            canvas_pool.release(canvas)
 
     def on_mode_changed(self):
         is_comparison = self.mode_dropdown.currentText() == "Comparison Mode"
@@ -208,28 +240,39 @@ class GraphWidget(QWidget):
 
     def load_event_schedule(self):
         year = int(self.year_dropdown.currentText())
-        try:
-            schedule = fastf1.get_event_schedule(year)
-            self.event_schedule.clear()
-            self.race_dropdown.clear()
-            for _, event in schedule.iterrows():
-                self.race_dropdown.addItem(event['EventName'])
-                self.event_schedule[event['EventName']] = {
-                    'round': event['RoundNumber'],
-                    'circuit': event['Location'],
-                    'country': event['Country'],
-                    'date': event['EventDate']
-                }
-        except Exception as e:
+        events = schedule_service.get_cached(year)
+        if events is not None:
+            self.show_event_schedule(events)
+            return
+
+        self.race_dropdown.clear()
+        self.race_dropdown.addItem("Loading...")
+        self.session_loader.load_schedule(year)
+
+    def on_schedule_loaded(self, year, events):
+        if year == int(self.year_dropdown.currentText()):
+            self.show_event_schedule(events)
+
+    def on_schedule_failed(self, year, message):
+        if year == int(self.year_dropdown.currentText()):
             self.race_dropdown.clear()
             self.race_dropdown.addItem("Error loading")
-            print(f"[ERROR] {e}")
+        print(f"[ERROR] {message}")
+
+    def show_event_schedule(self, events):
+        self.event_schedule = {event['name']: event for event in events}
+        self.race_dropdown.blockSignals(True)
+        self.race_dropdown.clear()
+        self.race_dropdown.addItems(list(self.event_schedule))
+        self.race_dropdown.blockSignals(False)
+        self.scheduler.request('circuit')
 
     def update_circuit_info(self):
         event = self.event_schedule.get(self.race_dropdown.currentText())
         if event:
+            date = event['date'].date() if event['date'] is not None else "date TBA"
             self.circuit_info_label.setText(
-                f"Circuit Info: {event['circuit']}, {event['country']} ({event['date'].date()})"
+                f"Circuit Info: {event['circuit']}, {event['country']} ({date})"
             )
 
     def load_session(self):
@@ -242,64 +285,123 @@ class GraphWidget(QWidget):
             QMessageBox.warning(self, "Error", "Invalid race selection.")
             return
 
+        tracer.begin_operation("Load session")
+
         self.load_button.setEnabled(False)
         self.load_button.setText("Loading...")
+        self.session_loader.load(year, event['round'], session_type)
+
+    def on_load_progress(self, stage, percent):
+        self.load_button.setText(f"{percent}%")
 
+    def on_session_loaded(self, session):
+        self.reset_load_button()
+        self.release_session()
         try:
-            self.session = load_session_data(year, event['round'], session_type)
-            drivers = sorted(self.session.laps['Driver'].unique())
+            self.session = session
+            drivers = get_drivers(self.session)
 
+            # Refill silently; the lap list is filled once for the new driver list
+            self.driver_dropdown.blockSignals(True)
             self.driver_dropdown.clear()
             self.driver_dropdown.addItems(drivers)
-            self.populate_lap_dropdown()
-            self.update_circuit_info()
+            self.driver_dropdown.blockSignals(False)
+            self.scheduler.request('laps', 'circuit')
 
         except Exception as e:
             QMessageBox.critical(self, "Load Failed", str(e))
-        finally:
-            self.load_button.setEnabled(True)
-            self.load_button.setText("Load Telemetry")
+
+    def release_session(self):
+        if self.session is not None:
+            session_registry.release(self.session)
+            self.session = None
+            self.pending_stages.clear()
+
+    def on_session_failed(self, message):
+        self.reset_load_button()
+        QMessageBox.critical(self, "Load Failed", message)
+
+    def reset_load_button(self):
+        self.load_button.setEnabled(True)
+        self.load_button.setText("Load Telemetry")
+
+    def on_driver_selected(self):
+        tracer.begin_operation("Driver selected")
+        self.scheduler.request('laps')
 
     def populate_lap_dropdown(self):
         driver = self.driver_dropdown.currentText()
         if not driver or not self.session:
             return
+
         try:
             laps = get_driver_laps(self.session, driver)
-            self.lap_dropdown.clear()
-            for _, lap in laps.iterlaps():
-                lap_num = lap['LapNumber']
-                lap_time = str(lap['LapTime']).split('.')[0]
-                self.lap_dropdown.addItem(f"Lap {lap_num} - {lap_time}", userData=lap_num)
-            if not laps.empty:
-                self.plot_lap(laps.pick_fastest())
+            fastest = pick_fastest_lap(laps)
+
+            # The model swap and index move are silent; the fastest lap is plotted in this flush
+            with span('ui.lap_dropdown', laps=len(laps)):
+                self.lap_dropdown.blockSignals(True)
+                self.lap_model.set_laps(laps)
+                if fastest is not None:
+                    self.lap_dropdown.setCurrentIndex(self.lap_model.row_for_lap(fastest['LapNumber']))
+                self.lap_dropdown.blockSignals(False)
+
+            if fastest is not None:
+                self.scheduler.request('lap')
+
         except Exception as e:
             print(f"[ERROR] Lap populate: {e}")
 
     def on_lap_selected(self):
-        driver = self.driver_dropdown.currentText()
+        if self.session and self.lap_dropdown.currentData() is not None:
+            tracer.begin_operation("Lap selected")
+            self.scheduler.request('lap')
+
+    def plot_selected_lap(self):
         lap_number = self.lap_dropdown.currentData()
-        laps = get_driver_laps(self.session, driver)
-        lap = laps[laps['LapNumber'] == lap_number]
-        if not lap.empty:
-            self.plot_lap(lap.iloc[0])
+        if self.session and lap_number is not None:
+            self.plot_lap(self.driver_dropdown.currentText(), lap_number)
+
+    def plot_lap(self, driver, lap_number):
+        self.with_telemetry('lap', lambda: self.plotter.plot_lap(
+            get_lap_telemetry(self.session, driver, lap_number)))
+
+    def with_telemetry(self, stage, plot):
+        # Telemetry is loaded on first use; the stage runs again, on the selection of the
+        # moment, once it arrives
+        if has_telemetry(self.session):
+            plot()
+            return
+        self.pending_stages.add(stage)
+        self.session_loader.load_telemetry(self.session)
 
-    def plot_lap(self, lap):
-        plot_lap_telemetry(lap, self.speed_canvas, self.throttle_canvas,
-                           self.brake_canvas, self.gear_canvas)
+    def on_telemetry_loaded(self, session):
+        if not self.session_loader.is_loading():
+            self.reset_load_button()
+        if session is not self.session or not self.pending_stages:
+            return
+        self.scheduler.request(*self.pending_stages)
+        self.pending_stages.clear()
 
     def open_comparison_settings(self):
         if not self.session:
             QMessageBox.information(self, "No Session", "Load a session first.")
             return
 
-        drivers = sorted(self.session.laps['Driver'].unique())
+        drivers = get_drivers(self.session)
         dialog = ComparisonSettingsDialog(drivers, self.comparison_drivers, self)
         if dialog.exec_():
             self.comparison_drivers = dialog.get_selected_drivers()
-            self.plot_comparison()
+            self.scheduler.request('comparison')
 
     def plot_comparison(self):
-        plot_comparison_telemetry(self.session, self.comparison_drivers,
-                                  self.speed_canvas, self.throttle_canvas,
-                                  self.brake_canvas, self.gear_canvas)
+        if not self.comparison_drivers:
+            return
+        tracer.begin_operation(f"Comparison ({len(self.comparison_drivers)} drivers)")
+        # Per-driver extraction runs on the worker pool; only the redraw happens here
+        self.with_telemetry('comparison', lambda: self.session_loader.prepare_comparison(
+            self.session, self.comparison_drivers))
+
+    def on_comparison_ready(self, session, series, delta):
+        if session is self.session:
+            self.plotter.plot_comparison(series, delta)
@@ -0,0 +1,40 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+
+from logic.utils import lap_labels
+
+
+class LapListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.labels = np.empty(0, dtype=str)
+        self.lap_numbers = np.empty(0)
+
+    def set_laps(self, laps):
+        # One reset for the whole table instead of an addItem (and a signal) per lap
+        self.beginResetModel()
+        self.labels = lap_labels(laps)
+        self.lap_numbers = laps['LapNumber'].to_numpy()
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self.labels = np.empty(0, dtype=str)
+        self.lap_numbers = np.empty(0)
+        self.endResetModel()
+
+    def row_for_lap(self, lap_number):
+        rows = np.flatnonzero(self.lap_numbers == lap_number)
+        return int(rows[0]) if len(rows) else -1
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.labels)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return str(self.labels[index.row()])
+        if role == Qt.UserRole:
+            return float(self.lap_numbers[index.row()])
+        return None
@@ -1,23 +1,38 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
-    QPushButton, QTabWidget, QMessageBox
+    QPushButton, QTabWidget, QMessageBox, QSlider
 )
-from PyQt5.QtCore import Qt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import fastf1
-import mplcursors
+from PyQt5.QtCore import Qt, pyqtSignal
+import numpy as np
 
 from .settings_dialog import ComparisonSettingsDialog
-from logic.telemetry_loader import load_session_data, get_driver_laps
-from logic.plotter import plot_lap_telemetry, plot_comparison_telemetry
+from logic.telemetry_loader import get_drivers, get_driver_laps, get_lap_telemetry, pick_fastest_lap, has_telemetry
+from logic.session_registry import session_registry
+from logic.schedule_service import schedule_service, SUPPORTED_YEARS
+from logic.replay import SPEEDS, timeline_bounds
 from ui.playground_area import PlaygroundArea
-from ui.graph_widget import GraphWidget
+from ui.session_loader import SessionLoader
+from ui.render_scheduler import RenderScheduler
+from ui.canvas_interaction import enable_zoom_pan
+from ui.lap_model import LapListModel
+from logic.tracing import tracer, span, trace_canvas
+from ui.trace_overlay import TraceOverlay
 
-fastf1.Cache.enable_cache('./resources/cache')
+REPLAY_STEPS = 1000  # slider resolution over the replayed span
+
+# matplotlib and everything drawn with it. Nothing here is imported with this module: the
+# window opens with its selectors, these load on a background thread once it is painted,
+# and init_plot() then builds the canvases from them; methods import what they use.
+PLOT_MODULES = [
+    'matplotlib.backends.backend_qt5agg', 'matplotlib.figure', 'logic.plotter', 'logic.track_map',
+    'logic.race_pace', 'ui.crosshair', 'ui.replay_player', 'ui.graph_widget',
+]
 
 
 class RacePulseApp(QWidget):
+    first_painted = pyqtSignal()
+    plots_ready = pyqtSignal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("RacePulse - Motorsport Telemetry")
@@ -29,35 +44,88 @@ class RacePulseApp(QWidget):
         self.session = None
         self.comparison_drivers = []
         self.event_schedule = {}
+        self.pending_session_type = None
+        self.pending_circuit = None
+        self.session_circuit = None
+        self.track_overlays = []  # (driver, lap number) drawn on the map besides the selected lap
+        self.pace_session = None  # session the Race Pace tab currently shows
+        self.replay_session = None  # session the replay timeline was built for
+        self.painted = False
+        self.plots_built = False
+
+        self.session_loader = SessionLoader(self)
+        self.session_loader.progress.connect(self.on_load_progress)
+        self.session_loader.loaded.connect(self.on_session_loaded)
+        self.session_loader.failed.connect(self.on_session_failed)
+        self.session_loader.cancelled.connect(self.reset_load_button)
+        self.session_loader.telemetry_loaded.connect(self.on_telemetry_loaded)
+        self.session_loader.comparison_ready.connect(self.on_comparison_ready)
+        self.session_loader.track_map_ready.connect(self.on_track_map_ready)
+        self.session_loader.replay_ready.connect(self.on_replay_ready)
+        self.session_loader.schedule_loaded.connect(self.on_schedule_loaded)
+        self.session_loader.schedule_failed.connect(self.on_schedule_failed)
+        self.session_loader.modules_loaded.connect(lambda modules: self.init_plot())
+        self.pending_stages = set()  # stages waiting for the telemetry tier
+
+        # Selector signals only mark what changed; each stage runs at most once per
+        # event-loop turn, in this order, on the final state of the selectors. The stages
+        # that draw are added by init_plot(); until then their requests wait.
+        self.scheduler = RenderScheduler(self)
+        for name, stage in [('schedule', self.load_event_schedule), ('circuit', self.update_circuit_info),
+                            ('laps', self.populate_lap_dropdown)]:
+            self.scheduler.add_stage(name, stage)
 
         self.init_ui()
-        self.init_plot()
+
+        # Stands in for the tabs and the track map until init_plot() has built them; sessions
+        # can be picked and loaded meanwhile, switching modes waits for the plots
+        self.plot_placeholder = QLabel("Loading plots...")
+        self.plot_placeholder.setAlignment(Qt.AlignCenter)
+        self.layout.addWidget(self.plot_placeholder, 1)
+        self.mode_dropdown.setEnabled(False)
+
+        self.trace_overlay = TraceOverlay(self)
+        self.layout.addWidget(self.trace_overlay)
+
+        self.scheduler.request('schedule')
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.painted:
+            self.painted = True
+            self.first_painted.emit()
+            self.session_loader.load_modules(PLOT_MODULES)
 
     def init_ui(self):
         self.top_bar = QHBoxLayout()
 
         # Mode
         self.mode_dropdown = QComboBox()
-        self.mode_dropdown.addItems(["Single Driver", "Comparison Mode", "Playground"])
+        self.mode_dropdown.addItems(["Single Driver", "Comparison Mode", "Track Map", "Replay", "Playground"])
         self.mode_dropdown.currentIndexChanged.connect(self.on_mode_changed)
         self.top_bar.addWidget(QLabel("Mode:"))
         self.top_bar.addWidget(self.mode_dropdown)
 
         # Other dropdowns (hidden in Playground)
         self.year_dropdown = QComboBox()
-        self.year_dropdown.addItems(["2021", "2022", "2023", "2024"])
-        self.year_dropdown.currentIndexChanged.connect(self.load_event_schedule)
+        self.year_dropdown.addItems([str(year) for year in SUPPORTED_YEARS])
+        self.year_dropdown.currentIndexChanged.connect(lambda: self.scheduler.request('schedule'))
+        self.year_dropdown.currentIndexChanged.connect(self.session_loader.cancel)
 
         self.race_dropdown = QComboBox()
-        self.race_dropdown.currentIndexChanged.connect(self.update_circuit_info)
+        self.race_dropdown.currentIndexChanged.connect(lambda: self.scheduler.request('circuit'))
+        self.race_dropdown.currentIndexChanged.connect(self.session_loader.cancel)
 
         self.session_dropdown = QComboBox()
         self.session_dropdown.addItems(["Q", "R", "FP1", "FP2"])
+        self.session_dropdown.currentIndexChanged.connect(self.session_loader.cancel)
 
         self.driver_dropdown = QComboBox()
-        self.driver_dropdown.currentIndexChanged.connect(self.populate_lap_dropdown)
+        self.driver_dropdown.currentIndexChanged.connect(self.on_driver_selected)
 
         self.lap_dropdown = QComboBox()
+        self.lap_model = LapListModel(self)
+        self.lap_dropdown.setModel(self.lap_model)
         self.lap_dropdown.currentIndexChanged.connect(self.on_lap_selected)
 
         self.load_button = QPushButton("Load Telemetry")
@@ -69,6 +137,40 @@ class RacePulseApp(QWidget):
         self.add_graph_button = QPushButton("➕ Add Graph")
         self.add_graph_button.clicked.connect(self.add_graph_to_playground)
 
+        self.color_label = QLabel("Color by:")
+        self.color_dropdown = QComboBox()  # filled by init_plot()
+
+        self.overlay_button = QPushButton("➕ Overlay Lap")
+        self.overlay_button.clicked.connect(self.add_track_overlay)
+
+        self.clear_overlay_button = QPushButton("🧹 Clear Overlay")
+        self.clear_overlay_button.clicked.connect(self.clear_track_overlays)
+
+        self.track_map_widgets = [self.color_label, self.color_dropdown,
+                                  self.overlay_button, self.clear_overlay_button]
+
+        self.play_button = QPushButton("▶ Play")
+        self.play_button.clicked.connect(self.toggle_replay)
+
+        self.replay_slider = QSlider(Qt.Horizontal)
+        self.replay_slider.setRange(0, REPLAY_STEPS)
+        self.replay_slider.setMinimumWidth(200)
+        self.replay_slider.valueChanged.connect(self.on_replay_scrubbed)
+
+        self.speed_dropdown = QComboBox()
+        self.speed_dropdown.addItems([f"{speed:g}x" for speed in SPEEDS])
+        self.speed_dropdown.setCurrentIndex(SPEEDS.index(1))
+        self.speed_dropdown.currentIndexChanged.connect(self.on_replay_speed_changed)
+
+        self.replay_range_dropdown = QComboBox()
+        self.replay_range_dropdown.addItems(["Selected Lap", "Whole Session"])
+        self.replay_range_dropdown.currentIndexChanged.connect(lambda: self.scheduler.request('replay_range'))
+
+        self.replay_time_label = QLabel("")
+
+        self.replay_widgets = [self.play_button, self.replay_slider, self.speed_dropdown,
+                               self.replay_range_dropdown, self.replay_time_label]
+
         self.circuit_info_label = QLabel("Circuit Info:")
 
         for w in [
@@ -80,10 +182,15 @@ class RacePulseApp(QWidget):
             self.load_button,
             self.settings_button,
             self.add_graph_button,
+            *self.track_map_widgets,
+            *self.replay_widgets,
             self.circuit_info_label
         ]:
             self.top_bar.addWidget(w)
 
+        for w in self.track_map_widgets + self.replay_widgets:
+            w.setVisible(False)
+
         self.layout.addLayout(self.top_bar)
 
         self.podium_label = QLabel("")
@@ -95,20 +202,70 @@ class RacePulseApp(QWidget):
         self.playground_area.setVisible(False)
 
     def init_plot(self):
+        if self.plots_built:
+            return
+        from logic.plotter import get_plotter
+        from logic.race_pace import RacePacePlotter
+        from logic.track_map import TrackMapPlotter, COLOR_MODES
+        from ui.crosshair import attach_crosshair
+        from ui.replay_player import ReplayPlayer
+
         self.tabs = QTabWidget()
-        self.layout.addWidget(self.tabs)
 
         self.speed_canvas = self.create_plot_canvas("Speed")
         self.throttle_canvas = self.create_plot_canvas("Throttle")
         self.brake_canvas = self.create_plot_canvas("Brake")
         self.gear_canvas = self.create_plot_canvas("Gear")
+        self.delta_canvas = self.create_plot_canvas("Delta")
+        self.pace_canvas = self.create_plot_canvas("Race Pace")
 
         self.tabs.addTab(self.speed_canvas, "Speed")
         self.tabs.addTab(self.throttle_canvas, "Throttle")
         self.tabs.addTab(self.brake_canvas, "Brake")
         self.tabs.addTab(self.gear_canvas, "Gear")
+        self.tabs.addTab(self.delta_canvas, "Delta")
+        self.tabs.addTab(self.pace_canvas, "Race Pace")
+
+        self.plotter = get_plotter(self.speed_canvas, self.throttle_canvas,
+                                   self.brake_canvas, self.gear_canvas, self.delta_canvas)
+        self.tabs.currentChanged.connect(self.plotter.flush)
+        self.crosshair = attach_crosshair(self.plotter)
+
+        self.pace_plotter = RacePacePlotter(self.pace_canvas)
+        self.tabs.currentChanged.connect(lambda: self.scheduler.request('race_pace'))
+
+        self.track_canvas = self.create_plot_canvas("Track Map")
+        self.track_plotter = TrackMapPlotter(self.track_canvas)
+        self.track_canvas.setVisible(False)
+        self.color_dropdown.addItems(list(COLOR_MODES))
+        self.color_dropdown.currentTextChanged.connect(self.on_track_color_changed)
+
+        self.replay_player = ReplayPlayer(self.track_canvas, self)
+        self.replay_player.frame.connect(self.on_replay_frame)
+        self.replay_player.playing_changed.connect(self.on_replay_playing_changed)
+
+        # Into the placeholder's place, above the status bar
+        index = self.layout.indexOf(self.plot_placeholder)
+        self.layout.insertWidget(index, self.tabs)
+        self.layout.insertWidget(index + 1, self.track_canvas)
+        self.plot_placeholder.deleteLater()
+        self.plot_placeholder = None
+
+        for name, stage in [('lap', self.plot_selected_lap), ('comparison', self.plot_comparison),
+                            ('track_map', self.update_track_map), ('race_pace', self.update_race_pace),
+                            ('replay', self.update_replay), ('replay_range', self.apply_replay_range)]:
+            self.scheduler.add_stage(name, stage)
+        self.mode_dropdown.setEnabled(True)
+        self.plots_built = True
+        self.plots_ready.emit()
+
+        # Network prefetch of the other seasons' schedules, kept out of the way of start-up
+        schedule_service.warm_async()
 
     def create_plot_canvas(self, title):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
         fig = Figure(figsize=(6, 4), tight_layout=True)
         canvas = FigureCanvas(fig)
         ax = fig.add_subplot(111)
@@ -116,86 +273,52 @@ class RacePulseApp(QWidget):
         canvas.ax = ax
         canvas.setFocusPolicy(Qt.ClickFocus)
         canvas.setFocus()
-        mplcursors.cursor(ax, hover=True)
-
-        def zoom(event):
-            if event.inaxes is None:
-                return
-            base_scale = 1.2
-            ax = event.inaxes
-            x_min, x_max = ax.get_xlim()
-            y_min, y_max = ax.get_ylim()
-            x_range = x_max - x_min
-            y_range = y_max - y_min
-
-            scale_factor = 1 / base_scale if event.button == 'up' else base_scale
-            new_width = x_range * scale_factor
-            new_height = y_range * scale_factor
-            relx = (event.xdata - x_min) / x_range
-            rely = (event.ydata - y_min) / y_range
-
-            ax.set_xlim([
-                event.xdata - new_width * relx,
-                event.xdata + new_width * (1 - relx)
-            ])
-            ax.set_ylim([
-                event.ydata - new_height * rely,
-                event.ydata + new_height * (1 - rely)
-            ])
-            canvas.draw()
-
-        def pan_start(event):
-            if event.button == 1 and event.inaxes:
-                canvas._pan_start = event
-
-        def pan_move(event):
-            if event.button == 1 and hasattr(canvas, "_pan_start"):
-                dx = canvas._pan_start.xdata - event.xdata
-                dy = canvas._pan_start.ydata - event.ydata
-                ax = canvas._pan_start.inaxes
-                ax.set_xlim(ax.get_xlim()[0] + dx, ax.get_xlim()[1] + dx)
-                ax.set_ylim(ax.get_ylim()[0] + dy, ax.get_ylim()[1] + dy)
-                canvas.draw()
-
-        fig.canvas.mpl_connect('scroll_event', zoom)
-        fig.canvas.mpl_connect('button_press_event', pan_start)
-        fig.canvas.mpl_connect('motion_notify_event', pan_move)
-
+        enable_zoom_pan(canvas)
+        trace_canvas(canvas)
         return canvas
 
     def load_event_schedule(self):
         year = int(self.year_dropdown.currentText())
-        try:
-            schedule = fastf1.get_event_schedule(year)
-            self.event_schedule.clear()
-            self.race_dropdown.clear()
+        events = schedule_service.get_cached(year)
+        if events is not None:
+            self.show_event_schedule(events)
+            return
 
-            for _, event in schedule.iterrows():
-                name = event['EventName']
-                self.race_dropdown.addItem(name)
-                self.event_schedule[name] = {
-                    'round': event['RoundNumber'],
-                    'circuit': event['Location'],
-                    'country': event['Country'],
-                    'date': event['EventDate']
-                }
+        self.race_dropdown.clear()
+        self.race_dropdown.addItem("Loading...")
+        self.session_loader.load_schedule(year)
 
-        except Exception as e:
+    def on_schedule_loaded(self, year, events):
+        if year == int(self.year_dropdown.currentText()):
+            self.show_event_schedule(events)
+
+    def on_schedule_failed(self, year, message):
+        if year == int(self.year_dropdown.currentText()):
             self.race_dropdown.clear()
             self.race_dropdown.addItem("Error loading")
-            print(f"[Schedule ERROR]: {e}")
+        print(f"[Schedule ERROR]: {message}")
+
+    def show_event_schedule(self, events):
+        self.event_schedule = {event['name']: event for event in events}
+        self.race_dropdown.blockSignals(True)
+        self.race_dropdown.clear()
+        self.race_dropdown.addItems(list(self.event_schedule))
+        self.race_dropdown.blockSignals(False)
+        self.scheduler.request('circuit')
 
     def update_circuit_info(self):
         event = self.event_schedule.get(self.race_dropdown.currentText())
         if event:
+            date = event['date'].date() if event['date'] is not None else "date TBA"
             self.circuit_info_label.setText(
-                f"Circuit Info: {event['circuit']}, {event['country']} ({event['date'].date()})"
+                f"Circuit Info: {event['circuit']}, {event['country']} ({date})"
             )
 
     def on_mode_changed(self):
         mode = self.mode_dropdown.currentText()
         playground = mode == "Playground"
-        comparison = mode == "Comparison Mode"
+        track_map = mode == "Track Map"
+        replay = mode == "Replay"
 
         # Toggle visibility
         for widget in [
@@ -203,12 +326,30 @@ class RacePulseApp(QWidget):
             self.session_dropdown, self.driver_dropdown,
             self.lap_dropdown, self.load_button,
             self.settings_button, self.circuit_info_label,
-            self.podium_label, self.tabs
+            self.podium_label
         ]:
             widget.setVisible(not playground)
 
+        # Replay shows the map above the telemetry, which follows the selected driver
+        self.tabs.setVisible(not playground and not track_map)
+        self.track_canvas.setVisible(track_map or replay)
+        for widget in self.track_map_widgets:
+            widget.setVisible(track_map)
+        for widget in self.replay_widgets:
+            widget.setVisible(replay)
+
         self.add_graph_button.setVisible(playground)
         self.playground_area.setVisible(playground)
+        if track_map or replay:
+            self.scheduler.request('track_map')
+        if replay:
+            self.scheduler.request('replay')
+        else:
+            self.replay_player.pause()
+            self.crosshair.show_distance(None)
+        if not playground and not track_map:
+            self.plotter.flush()
+            self.scheduler.request('race_pace')
 
     def on_load_clicked(self):
         year = int(self.year_dropdown.currentText())
@@ -220,26 +361,55 @@ class RacePulseApp(QWidget):
             QMessageBox.warning(self, "Error", "Invalid race selection.")
             return
 
+        tracer.begin_operation("Load session")
+
         self.load_button.setEnabled(False)
         self.load_button.setText("Loading...")
 
+        self.pending_session_type = session_type
+        self.pending_circuit = (year, event['circuit'])
+        self.session_loader.load(year, event['round'], session_type)
+
+    def on_load_progress(self, stage, percent):
+        self.load_button.setText(f"{stage}... {percent}%")
+
+    def on_session_loaded(self, session):
+        self.reset_load_button()
+        self.release_session()
         try:
-            self.session = load_session_data(year, event['round'], session_type)
-            drivers = sorted(self.session.laps['Driver'].unique())
+            self.session = session
+            self.session_circuit = self.pending_circuit
+            self.track_overlays = []
+            drivers = get_drivers(self.session)
 
+            # Refill silently; the lap list is filled once for the new driver list
+            self.driver_dropdown.blockSignals(True)
             self.driver_dropdown.clear()
             self.driver_dropdown.addItems(drivers)
+            self.driver_dropdown.blockSignals(False)
 
-            self.populate_lap_dropdown()
-            self.update_circuit_info()
-            self.display_session_highlights(session_type)
+            self.scheduler.request('laps', 'race_pace', 'replay', 'circuit')
+            self.display_session_highlights(self.pending_session_type)
 
         except Exception as e:
             QMessageBox.critical(self, "Session Load Failed", str(e))
 
-        finally:
-            self.load_button.setEnabled(True)
-            self.load_button.setText("Load Telemetry")
+    def release_session(self):
+        if self.session is not None:
+            session_registry.release(self.session)
+            self.session = None
+            self.pending_stages.clear()
+            self.replay_session = None
+            if self.plots_built:
+                self.replay_player.clear()
+
+    def on_session_failed(self, message):
+        self.reset_load_button()
+        QMessageBox.critical(self, "Session Load Failed", message)
+
+    def reset_load_button(self):
+        self.load_button.setEnabled(True)
+        self.load_button.setText("Load Telemetry")
 
     def display_session_highlights(self, session_type):
         podium_text = ""
@@ -257,6 +427,10 @@ class RacePulseApp(QWidget):
         except Exception as e:
             self.podium_label.setText(f"<i>Error loading podium data: {e}</i>")
 
+    def on_driver_selected(self):
+        tracer.begin_operation("Driver selected")
+        self.scheduler.request('laps')
+
     def populate_lap_dropdown(self):
         driver = self.driver_dropdown.currentText()
         if not driver or not self.session:
@@ -264,50 +438,196 @@ class RacePulseApp(QWidget):
 
         try:
             laps = get_driver_laps(self.session, driver)
-            self.lap_dropdown.clear()
+            fastest = pick_fastest_lap(laps)
 
-            for _, lap in laps.iterlaps():
-                lap_num = lap['LapNumber']
-                time = str(lap['LapTime']).split('.')[0]
-                self.lap_dropdown.addItem(f"Lap {lap_num} - {time}", userData=lap_num)
+            # The model swap and index move are silent; the fastest lap is plotted in this flush
+            with span('ui.lap_dropdown', laps=len(laps)):
+                self.lap_dropdown.blockSignals(True)
+                self.lap_model.set_laps(laps)
+                if fastest is not None:
+                    self.lap_dropdown.setCurrentIndex(self.lap_model.row_for_lap(fastest['LapNumber']))
+                self.lap_dropdown.blockSignals(False)
 
-            if laps:
-                self.plot_lap(laps.pick_fastest())
+            if fastest is not None:
+                self.scheduler.request('lap')
 
         except Exception as e:
             print(f"[Lap Error]: {e}")
 
     def on_lap_selected(self):
-        if not self.session:
+        if self.session and self.lap_dropdown.currentData() is not None:
+            tracer.begin_operation("Lap selected")
+            self.scheduler.request('lap')
+
+    def plot_selected_lap(self):
+        selected = self.selected_lap()
+        if selected:
+            self.plot_lap(*selected)
+
+    def plot_lap(self, driver, lap_number):
+        self.with_telemetry('lap', lambda: self.plotter.plot_lap(
+            get_lap_telemetry(self.session, driver, lap_number)))
+        if self.mode_dropdown.currentText() in ("Track Map", "Replay"):
+            self.scheduler.request('track_map')
+        if self.mode_dropdown.currentText() == "Replay":
+            self.scheduler.request('replay_range')
+
+    def with_telemetry(self, stage, plot):
+        # Telemetry is loaded on first use; the stage runs again, on the selection of the
+        # moment, once it arrives
+        if has_telemetry(self.session):
+            plot()
             return
-        driver = self.driver_dropdown.currentText()
-        lap_number = self.lap_dropdown.currentData()
-        laps = get_driver_laps(self.session, driver)
+        self.pending_stages.add(stage)
+        self.session_loader.load_telemetry(self.session)
 
-        lap = laps[laps['LapNumber'] == lap_number]
-        if not lap.empty:
-            self.plot_lap(lap.iloc[0])
-
-    def plot_lap(self, lap):
-        plot_lap_telemetry(lap, self.speed_canvas, self.throttle_canvas,
-                           self.brake_canvas, self.gear_canvas)
+    def on_telemetry_loaded(self, session):
+        if not self.session_loader.is_loading():
+            self.reset_load_button()
+        if session is not self.session or not self.pending_stages:
+            return
+        self.scheduler.request(*self.pending_stages)
+        self.pending_stages.clear()
 
     def open_comparison_settings(self):
         if not self.session:
             QMessageBox.information(self, "Load First", "Load a session first.")
             return
 
-        drivers = sorted(self.session.laps['Driver'].unique())
+        drivers = get_drivers(self.session)
         dialog = ComparisonSettingsDialog(drivers, self.comparison_drivers, self)
         if dialog.exec_():
             self.comparison_drivers = dialog.get_selected_drivers()
-            self.plot_comparison()
+            self.scheduler.request('comparison')
 
     def plot_comparison(self):
-        plot_comparison_telemetry(self.session, self.comparison_drivers,
-                                  self.speed_canvas, self.throttle_canvas,
-                                  self.brake_canvas, self.gear_canvas)
+        if not self.comparison_drivers:
+            return
+        tracer.begin_operation(f"Comparison ({len(self.comparison_drivers)} drivers)")
+        # Per-driver extraction runs on the worker pool; only the redraw happens here
+        self.with_telemetry('comparison', lambda: self.session_loader.prepare_comparison(
+            self.session, self.comparison_drivers))
+
+    def on_comparison_ready(self, session, series, delta):
+        if session is self.session:
+            self.plotter.plot_comparison(series, delta)
 
     def add_graph_to_playground(self):
+        from ui.graph_widget import GraphWidget
+
         widget = GraphWidget()  # New widgets can be initialized without session
-        self.playground_area.add_widget(widget)
\ No newline at end of file
+        self.playground_area.add_widget(widget)
+
+    def selected_lap(self):
+        lap_number = self.lap_dropdown.currentData()
+        if not self.session or lap_number is None:
+            return None
+        return (self.driver_dropdown.currentText(), lap_number)
+
+    def update_track_map(self):
+        selected = self.selected_lap()
+        laps = ([selected] if selected else []) + [lap for lap in self.track_overlays if lap != selected]
+        if not laps:
+            return
+        # Position slicing and the circuit outline are built on the worker pool
+        self.with_telemetry('track_map', lambda: self.session_loader.prepare_track_map(
+            self.session, laps, self.session_circuit))
+
+    def on_track_map_ready(self, session, layers, outline):
+        if session is self.session:
+            self.track_plotter.plot(layers, outline)
+
+    def on_track_color_changed(self, mode):
+        self.track_plotter.set_color_by(mode)
+
+    def add_track_overlay(self):
+        selected = self.selected_lap()
+        if selected and selected not in self.track_overlays:
+            tracer.begin_operation("Overlay lap")
+            self.track_overlays.append(selected)
+            self.scheduler.request('track_map')
+
+    def clear_track_overlays(self):
+        self.track_overlays = []
+        self.scheduler.request('track_map')
+
+    def update_race_pace(self):
+        # Lap data only, so no telemetry wait; analysed the first time the tab is shown for
+        # a session and cached per session after that
+        from logic.race_pace import get_race_pace
+
+        if self.session is None or self.pace_session is self.session:
+            self.pace_plotter.flush()
+            return
+        if self.tabs.currentWidget() is not self.pace_canvas or not self.tabs.isVisible():
+            return
+        tracer.begin_operation("Race pace")
+        self.pace_session = self.session
+        try:
+            self.pace_plotter.plot(get_race_pace(self.session))
+        except Exception as e:
+            print(f"[Race Pace Error]: {e}")
+
+    def update_replay(self):
+        # The timeline covers every driver for the whole session and is built once per session
+        if self.mode_dropdown.currentText() != "Replay" or self.session is None:
+            return
+        if self.replay_session is self.session:
+            return
+        tracer.begin_operation("Replay timeline")
+        self.with_telemetry('replay', lambda: self.session_loader.prepare_replay(self.session))
+
+    def on_replay_ready(self, session, timeline):
+        if session is not self.session:
+            return
+        self.replay_session = session
+        self.replay_player.set_timeline(timeline)
+        self.apply_replay_range()
+
+    def apply_replay_range(self):
+        timeline = self.replay_player.timeline
+        if timeline is None:
+            return
+        selected = self.selected_lap()
+        lap_span = (timeline['spans'].get((selected[0], int(selected[1])))
+                    if selected and self.replay_range_dropdown.currentText() == "Selected Lap" else None)
+        self.replay_player.set_span(*(lap_span or timeline_bounds(timeline)))
+
+    def toggle_replay(self):
+        self.replay_player.toggle()
+
+    def on_replay_playing_changed(self, playing):
+        self.play_button.setText("⏸ Pause" if playing else "▶ Play")
+
+    def on_replay_speed_changed(self, index):
+        self.replay_player.set_speed(SPEEDS[index])
+
+    def on_replay_scrubbed(self, value):
+        player = self.replay_player
+        player.seek(player.start + (player.end - player.start) * value / REPLAY_STEPS)
+
+    def on_replay_frame(self, t, frame):
+        from ui.replay_player import format_session_time
+
+        player = self.replay_player
+        length = player.end - player.start
+        self.replay_slider.blockSignals(True)
+        self.replay_slider.setValue(round((t - player.start) / length * REPLAY_STEPS) if length else 0)
+        self.replay_slider.blockSignals(False)
+
+        # The telemetry cursor follows the selected driver while they are on the plotted lap
+        selected = self.selected_lap()
+        drivers = player.timeline['drivers']
+        distance = None
+        lap_text = ""
+        if selected and selected[0] in drivers:
+            i = drivers.index(selected[0])
+            lap = frame['Lap'][i]
+            if lap == selected[1]:
+                distance = float(frame['Distance'][i])
+            if np.isfinite(lap):
+                lap_text = f"  {selected[0]} lap {lap:.0f}"
+        self.replay_time_label.setText(
+            f"{format_session_time(t - player.start)} / {format_session_time(length)}{lap_text}")
+        if distance is not None or self.crosshair.distance is not None:
+            self.crosshair.show_distance(distance)
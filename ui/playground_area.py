@@ -1,20 +1,32 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QScrollArea, QFrame, QGridLayout
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QEvent, QRect
 from ui.draggable_graph_frame import DraggableGraphFrame
+from ui.render_scheduler import RenderScheduler
+
+GROW_MARGIN = 400  # px of free canvas kept beyond the farthest panel, to drag into
+PRELOAD_MARGIN = 200  # px around the viewport in which panels already count as on screen
 
 class PlaygroundArea(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.frames = {}  # frame -> whether it was last seen on screen
+        # Scrolling and dragging fire on every pixel; the layout pass runs once per turn
+        self.scheduler = RenderScheduler(self)
+        self.scheduler.add_stage('playground_extent', self.update_extent)
+        self.scheduler.add_stage('playground_viewport', self.update_viewport)
         self.init_ui()
 
     def init_ui(self):
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
 
+        # Grows with the panels (see update_extent) and otherwise fills the viewport
         self.container = QWidget()
-        self.container.setMinimumSize(2000, 1500)  # Arbitrary large size to scroll around
 
         self.scroll_area.setWidget(self.container)
+        self.scroll_area.viewport().installEventFilter(self)
+        for bar in (self.scroll_area.horizontalScrollBar(), self.scroll_area.verticalScrollBar()):
+            bar.valueChanged.connect(lambda: self.scheduler.request('playground_viewport'))
 
         main_layout = QVBoxLayout()
         main_layout.addWidget(self.scroll_area)
@@ -23,8 +35,48 @@ class PlaygroundArea(QWidget):
         self.graph_count = 0
 
     def add_widget(self, widget):
-        frame = DraggableGraphFrame(widget)
+        # Parented up front so the panel's style sheets are polished once, not again on reparenting
+        frame = DraggableGraphFrame(widget, self.container)
         frame.move(50 + self.graph_count * 30, 50 + self.graph_count * 30)  # Stagger placement
-        frame.setParent(self.container)
+        frame.geometry_changed.connect(lambda: self.scheduler.request('playground_extent', 'playground_viewport'))
+        frame.closed.connect(self.remove_frame)
+        # Decided before show(), so a panel placed out of view never builds its canvases
+        on_screen = frame.geometry().intersects(self.visible_rect())
+        self.frames[frame] = on_screen
+        frame.set_on_screen(on_screen)
         frame.show()
-        self.graph_count += 1
\ No newline at end of file
+        self.graph_count += 1
+        self.scheduler.request('playground_extent', 'playground_viewport')
+
+    def remove_frame(self, frame):
+        self.frames.pop(frame, None)
+        self.scheduler.request('playground_extent')
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Resize:
+            self.scheduler.request('playground_viewport')
+        return super().eventFilter(obj, event)
+
+    def update_extent(self):
+        # The container's minimum size is what the scroll area scrolls over
+        width = height = 0
+        for frame in self.frames:
+            geometry = frame.geometry()
+            width = max(width, geometry.right() + 1)
+            height = max(height, geometry.bottom() + 1)
+        self.container.setMinimumSize(width + GROW_MARGIN, height + GROW_MARGIN)
+
+    def visible_rect(self):
+        # The viewport in container coordinates, widened by PRELOAD_MARGIN
+        viewport = self.scroll_area.viewport()
+        return QRect(-self.container.pos(), viewport.size()).adjusted(
+            -PRELOAD_MARGIN, -PRELOAD_MARGIN, PRELOAD_MARGIN, PRELOAD_MARGIN)
+
+    def update_viewport(self):
+        # Panels outside the visible part of the container stop drawing until they return
+        visible = self.visible_rect()
+        for frame, was_on_screen in self.frames.items():
+            on_screen = frame.geometry().intersects(visible)
+            if on_screen != was_on_screen:
+                self.frames[frame] = on_screen
+                frame.set_on_screen(on_screen)
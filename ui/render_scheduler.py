@@ -0,0 +1,50 @@
+from PyQt5.QtCore import QObject, QTimer
+
+from logic.tracing import span
+
+
+# Coalesces the work behind cascading selector signals. Handlers call request() instead
+# of fetching and drawing themselves; at the end of the event-loop turn every requested
+# stage runs once, in the order the stages were added, against whatever the widgets hold
+# by then. A stage may request a later stage, which then runs in the same flush; a stage
+# requested again from itself or a later one waits for the next turn. A stage requested
+# before it has been added runs once it is, e.g. plots requested while they are being built.
+class RenderScheduler(QObject):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stages = {}  # name -> callback, in run order
+        self.dirty = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(0)
+        self.timer.timeout.connect(self.flush)
+
+    def add_stage(self, name, callback):
+        self.stages[name] = callback
+        if name in self.dirty and not self.timer.isActive():
+            self.timer.start()
+
+    def request(self, *names):
+        self.dirty.update(names)
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def cancel(self):
+        self.dirty.clear()
+        self.timer.stop()
+
+    def flush(self):
+        self.timer.stop()
+        # Callbacks may add stages, so the order is taken up front; a stage added meanwhile
+        # runs on the next turn. Each flag is cleared before its callback, which may set it again
+        for name, callback in list(self.stages.items()):
+            if name not in self.dirty:
+                continue
+            self.dirty.discard(name)
+            try:
+                with span(f'ui.{name}'):
+                    callback()
+            except Exception as e:
+                print(f"[Render Error] {name}: {e}")
+        if not self.dirty:
+            self.timer.stop()
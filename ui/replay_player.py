@@ -0,0 +1,155 @@
+import time
+
+import numpy as np
+from PyQt5.QtCore import QObject, Qt, QTimer, pyqtSignal
+from matplotlib.collections import PathCollection
+from matplotlib.font_manager import FontProperties
+from matplotlib.textpath import TextPath
+from matplotlib.transforms import Affine2D
+
+from logic.plotter import comparison_color
+from logic.replay import timeline_bounds, timeline_frame
+from ui.canvas_interaction import blit_figure
+
+FRAME_MS = 16
+LABEL_SIZE = 7  # pt
+
+
+def format_session_time(seconds):
+    minutes, seconds = divmod(max(seconds, 0.0), 60)
+    hours, minutes = divmod(int(minutes), 60)
+    return f"{hours}:{minutes:02d}:{seconds:04.1f}" if hours else f"{minutes}:{seconds:04.1f}"
+
+
+# Plays a replay timeline on a track canvas. One scatter holds every car and one collection
+# of text outlines holds their labels (20 Text artists would cost ~12 ms a frame in glyph
+# layout); both are animated and blitted over a background cached after each full draw, so a
+# frame is one restore, two collections and one blit however much is on the map. Time
+# advances by the wall clock times the speed, so timer jitter never changes the playback rate.
+class ReplayPlayer(QObject):
+    frame = pyqtSignal(float, object)  # session time, timeline_frame() at that time
+    playing_changed = pyqtSignal(bool)
+
+    def __init__(self, canvas, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.ax = canvas.ax
+        self.timeline = None
+        self.start = self.end = self.time = 0.0
+        self.speed = 1.0
+        self.last_tick = None
+        self.background = None
+
+        self.markers = self.ax.scatter([], [], s=60, edgecolors='black', linewidths=0.8,
+                                       zorder=5, animated=True)
+        # Label outlines are in points, placed at the car positions in data coordinates
+        self.labels = PathCollection([], offsets=np.empty((0, 2)), offset_transform=self.ax.transData,
+                                     transform=Affine2D().scale(1 / 72) + canvas.figure.dpi_scale_trans,
+                                     edgecolors='none', zorder=6, animated=True)
+        self.ax.add_collection(self.labels, autolim=False)
+        interaction = getattr(canvas, 'interaction', None)
+        if interaction is not None:
+            interaction.overlays.extend([self.markers, self.labels])
+            # Ahead of TrackMapPlotter.freeze(), which snapshots the canvas buffer
+            interaction.on_begin.insert(0, self.restore_background)
+
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(FRAME_MS)
+        self.timer.timeout.connect(self.tick)
+
+        canvas.mpl_connect('draw_event', self.on_draw)
+
+    def set_timeline(self, timeline):
+        self.pause()
+        self.timeline = timeline
+        drivers = timeline['drivers']
+        colors = [comparison_color(i, len(drivers)) for i in range(len(drivers))]
+        bold = FontProperties(weight='bold')
+        self.labels.set_paths([TextPath((5, 4), driver, size=LABEL_SIZE, prop=bold) for driver in drivers])
+        self.labels.set_facecolor(colors)
+        self.markers.set_facecolor(colors)
+        self.set_span(*timeline_bounds(timeline))
+
+    def set_span(self, start, end):
+        # Playback runs between start and end, e.g. one lap or the whole session
+        self.start, self.end = start, max(start, end)
+        self.seek(start)
+
+    def seek(self, t):
+        self.time = min(max(t, self.start), self.end)
+        self.last_tick = time.perf_counter()
+        self.render()
+
+    def set_speed(self, speed):
+        self.speed = speed
+
+    def play(self):
+        if self.timeline is None or self.timer.isActive():
+            return
+        if self.time >= self.end:
+            self.time = self.start
+        self.last_tick = time.perf_counter()
+        self.timer.start()
+        self.playing_changed.emit(True)
+
+    def pause(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.playing_changed.emit(False)
+
+    def toggle(self):
+        if self.timer.isActive():
+            self.pause()
+        else:
+            self.play()
+
+    def is_playing(self):
+        return self.timer.isActive()
+
+    def tick(self):
+        now = time.perf_counter()
+        self.time += (now - self.last_tick) * self.speed
+        self.last_tick = now
+        if self.time >= self.end:
+            self.time = self.end
+            self.pause()
+        self.render()
+
+    def render(self):
+        if self.timeline is None:
+            return
+        frame = timeline_frame(self.timeline, self.time)
+        offsets = np.column_stack([frame['X'], frame['Y']])  # NaN for cars off track are skipped
+        self.markers.set_offsets(offsets)
+        self.labels.set_offsets(offsets)
+        self.blit()
+        self.frame.emit(self.time, frame)
+
+    def on_draw(self, event):
+        interaction = getattr(self.canvas, 'interaction', None)
+        if interaction is not None and interaction.animated:
+            self.background = None  # zoom/pan frames draw the markers as overlays
+            return
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.blit()
+
+    def restore_background(self):
+        # Takes the markers back out of the canvas buffer
+        if self.background is not None:
+            self.canvas.restore_region(self.background)
+
+    def blit(self):
+        if self.background is None or not self.canvas.isVisible():
+            return
+        self.canvas.restore_region(self.background)
+        self.ax.draw_artist(self.markers)
+        self.ax.draw_artist(self.labels)
+        blit_figure(self.canvas)
+
+    def clear(self):
+        self.pause()
+        self.timeline = None
+        self.markers.set_offsets(np.empty((0, 2)))
+        self.labels.set_offsets(np.empty((0, 2)))
+        self.blit()
@@ -0,0 +1,362 @@
+import importlib
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from logic.telemetry_loader import ensure_telemetry, persist_session, load_comparison_telemetry, LoadCancelled
+from logic.session_registry import session_registry
+from logic.resampling import delta_traces
+from logic.schedule_service import schedule_service
+from logic.replay import get_replay_timeline
+from logic.tracing import span
+
+
+class LoadSignals(QObject):
+    progress = pyqtSignal(str, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class SessionLoadTask(QRunnable):
+    def __init__(self, year, round_number, session_type):
+        super().__init__()
+        self.year = year
+        self.round_number = round_number
+        self.session_type = session_type
+        self.signals = LoadSignals()
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def is_cancelled(self):
+        return self.cancelled
+
+    def run(self):
+        try:
+            session = session_registry.acquire(self.year, self.round_number, self.session_type,
+                                               progress=self.signals.progress.emit,
+                                               is_cancelled=self.is_cancelled)
+        except LoadCancelled:
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+
+        if self.cancelled:
+            session_registry.release(session)
+        else:
+            self.signals.finished.emit(session)
+
+
+class TelemetryLoadTask(QRunnable):
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            ensure_telemetry(self.session, progress=self.signals.progress.emit)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(self.session)
+
+        # Hand the plot its data first, then write the columnar copy for next time
+        persist_session(self.session)
+
+
+class ComparisonTask(QRunnable):
+    def __init__(self, session, drivers):
+        super().__init__()
+        self.session = session
+        self.drivers = list(drivers)
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            series = load_comparison_telemetry(self.session, self.drivers)
+            delta = delta_traces(series, reference=self.drivers[0])
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit((series, delta))
+
+
+class TrackMapTask(QRunnable):
+    def __init__(self, session, laps, circuit_key):
+        super().__init__()
+        self.session = session
+        self.laps = list(laps)
+        self.circuit_key = circuit_key
+        self.signals = LoadSignals()
+
+    def run(self):
+        from logic.track_map import load_track_map  # with matplotlib, loaded after start-up
+
+        try:
+            result = load_track_map(self.session, self.laps, self.circuit_key)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(result)
+
+
+class ReplayTask(QRunnable):
+    def __init__(self, session):
+        super().__init__()
+        self.session = session
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            timeline = get_replay_timeline(self.session)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(timeline)
+
+
+class ScheduleTask(QRunnable):
+    def __init__(self, year):
+        super().__init__()
+        self.year = year
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            events = schedule_service.get(self.year)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(events)
+
+
+class ImportTask:
+    # Imports modules off the GUI thread, so its first use of them finds them loaded; a
+    # module that fails to import is left for that first use to report
+    def __init__(self, names):
+        self.names = list(names)
+        self.signals = LoadSignals()
+
+    def run(self):
+        for name in self.names:
+            try:
+                with span('startup.import', module=name):
+                    importlib.import_module(name)
+            except Exception:
+                break
+        self.signals.finished.emit(self.names)
+
+
+TASK_ATTRS = ('task', 'telemetry_task', 'comparison_task', 'track_map_task', 'replay_task',
+              'schedule_task', 'import_task')
+
+
+# Only the most recent request is live: starting a new load or calling cancel()
+# drops the previous one, and anything it emits afterwards is ignored. Sessions come
+# from the shared registry, so whoever receives `loaded` owns one reference to it.
+class SessionLoader(QObject):
+    progress = pyqtSignal(str, int)
+    loaded = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    telemetry_loaded = pyqtSignal(object)
+    comparison_ready = pyqtSignal(object, object, object)
+    track_map_ready = pyqtSignal(object, object, object)
+    replay_ready = pyqtSignal(object, object)
+    schedule_loaded = pyqtSignal(int, object)
+    schedule_failed = pyqtSignal(int, str)
+    modules_loaded = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        self.task = None
+        self.telemetry_task = None
+        self.comparison_task = None
+        self.track_map_task = None
+        self.replay_task = None
+        self.schedule_task = None
+        self.import_task = None
+        self.closed = False
+
+    def is_loading(self):
+        return self.task is not None
+
+    def load(self, year, round_number, session_type):
+        if self.task is not None:
+            self.task.cancel()
+
+        task = SessionLoadTask(year, round_number, session_type)
+        task.signals.progress.connect(lambda stage, percent: self._on_progress(task, stage, percent))
+        task.signals.finished.connect(lambda session: self._on_finished(task, session))
+        task.signals.failed.connect(lambda message: self._on_failed(task, message))
+        self._start('task', task)
+
+    def load_telemetry(self, session):
+        if self.telemetry_task is not None and self.telemetry_task.session is session:
+            return
+
+        task = TelemetryLoadTask(session)
+        task.signals.progress.connect(lambda stage, percent: self._on_telemetry_progress(task, stage, percent))
+        task.signals.finished.connect(lambda session: self._on_telemetry_finished(task, session))
+        task.signals.failed.connect(lambda message: self._on_telemetry_failed(task, message))
+
+        self.telemetry_task = task
+        self.pool.start(task)
+
+    def prepare_comparison(self, session, drivers):
+        task = ComparisonTask(session, drivers)
+        task.signals.finished.connect(lambda result: self._on_comparison_finished(task, result))
+        task.signals.failed.connect(lambda message: self._on_comparison_failed(task, message))
+        self._start('comparison_task', task)
+
+    def prepare_track_map(self, session, laps, circuit_key=None):
+        task = TrackMapTask(session, laps, circuit_key)
+        task.signals.finished.connect(lambda result: self._on_track_map_finished(task, result))
+        task.signals.failed.connect(lambda message: self._on_track_map_failed(task, message))
+        self._start('track_map_task', task)
+
+    def prepare_replay(self, session):
+        if self.replay_task is not None and self.replay_task.session is session:
+            return
+        task = ReplayTask(session)
+        task.signals.finished.connect(lambda timeline: self._on_replay_finished(task, timeline))
+        task.signals.failed.connect(lambda message: self._on_replay_failed(task, message))
+        self._start('replay_task', task)
+
+    def load_schedule(self, year):
+        task = ScheduleTask(year)
+        task.signals.finished.connect(lambda events: self._on_schedule_finished(task, events))
+        task.signals.failed.connect(lambda message: self._on_schedule_failed(task, message))
+        self._start('schedule_task', task)
+
+    def load_modules(self, names):
+        # On a thread of its own: the pool may be busy with a schedule fetch that is waiting
+        # on the network, and has a single thread on a single core
+        task = ImportTask(names)
+        task.signals.finished.connect(lambda names: self._on_modules_loaded(task, names))
+        self.import_task = task
+        threading.Thread(target=task.run, name='module-import', daemon=True).start()
+
+    def cancel(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        self._take(self.task)
+        self.task = None
+        self.cancelled.emit()
+
+    def shutdown(self):
+        # The owner is about to be deleted, and this loader with it: every pending task is
+        # dropped and disconnected, and whatever a running one still emits is ignored
+        self.closed = True
+        if self.task is not None:
+            self.task.cancel()  # releases its session itself if it still gets one
+        for attr in TASK_ATTRS:
+            task = getattr(self, attr)
+            if task is None:
+                continue
+            setattr(self, attr, None)
+            if isinstance(task, QRunnable):
+                self._take(task)
+            for signal in (task.signals.progress, task.signals.finished, task.signals.failed):
+                try:
+                    signal.disconnect()
+                except (TypeError, RuntimeError):
+                    pass  # nothing connected to it
+
+    def _start(self, attr, task):
+        # A newer request supersedes the last one of its kind; if that is still queued it is
+        # taken off the pool and never runs
+        previous = getattr(self, attr)
+        if previous is not None:
+            self._take(previous)
+        setattr(self, attr, task)
+        self.pool.start(task)
+
+    def _take(self, task):
+        try:
+            self.pool.tryTake(task)
+        except RuntimeError:
+            pass  # already ran, and the pool deleted it
+
+    def _on_progress(self, task, stage, percent):
+        if task is self.task and not self.closed:
+            self.progress.emit(stage, percent)
+
+    def _on_finished(self, task, session):
+        if task is not self.task or self.closed:
+            session_registry.release(session)
+            return
+        self.task = None
+        self.loaded.emit(session)
+
+    def _on_failed(self, task, message):
+        if task is self.task:
+            self.task = None
+            self.failed.emit(message)
+
+    def _on_telemetry_progress(self, task, stage, percent):
+        if not self.closed:
+            self.progress.emit(stage, percent)
+
+    def _on_telemetry_finished(self, task, session):
+        if self.closed:
+            return
+        if task is self.telemetry_task:
+            self.telemetry_task = None
+        self.telemetry_loaded.emit(session)
+
+    def _on_telemetry_failed(self, task, message):
+        if self.closed:
+            return
+        if task is self.telemetry_task:
+            self.telemetry_task = None
+        self.failed.emit(message)
+
+    def _on_comparison_finished(self, task, result):
+        if task is self.comparison_task:
+            self.comparison_task = None
+            series, delta = result
+            self.comparison_ready.emit(task.session, series, delta)
+
+    def _on_comparison_failed(self, task, message):
+        if task is self.comparison_task:
+            self.comparison_task = None
+            self.failed.emit(message)
+
+    def _on_track_map_finished(self, task, result):
+        if task is self.track_map_task:
+            self.track_map_task = None
+            layers, outline = result
+            self.track_map_ready.emit(task.session, layers, outline)
+
+    def _on_track_map_failed(self, task, message):
+        if task is self.track_map_task:
+            self.track_map_task = None
+            self.failed.emit(message)
+
+    def _on_replay_finished(self, task, timeline):
+        if task is self.replay_task:
+            self.replay_task = None
+            self.replay_ready.emit(task.session, timeline)
+
+    def _on_replay_failed(self, task, message):
+        if task is self.replay_task:
+            self.replay_task = None
+            self.failed.emit(message)
+
+    def _on_schedule_finished(self, task, events):
+        if not self.closed:
+            self.schedule_loaded.emit(task.year, events)
+
+    def _on_schedule_failed(self, task, message):
+        if not self.closed:
+            self.schedule_failed.emit(task.year, message)
+
+    def _on_modules_loaded(self, task, names):
+        if not self.closed:
+            self.modules_loaded.emit(names)
@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import (
-    QDialog, QHBoxLayout, QLabel, QVBoxLayout, QPushButton, QMessageBox
+    QDialog, QHBoxLayout, QLabel, QVBoxLayout, QPushButton
 )
 from .draggable_list import DraggableList
 
@@ -25,10 +25,14 @@ class ComparisonSettingsDialog(QDialog):
 
         layout.addWidget(QLabel("Available Drivers"))
         layout.addWidget(self.available_list)
-        layout.addWidget(QLabel("Compare These"))
+        layout.addWidget(QLabel("Compare These\n(first is the delta reference)"))
         layout.addWidget(self.selected_list)
 
         btn_layout = QVBoxLayout()
+        self.all_btn = QPushButton("Whole Grid")
+        self.all_btn.clicked.connect(self.select_all)
+        btn_layout.addWidget(self.all_btn)
+
         self.save_btn = QPushButton("Save")
         self.save_btn.clicked.connect(self.save_selection)
         btn_layout.addStretch()
@@ -37,11 +41,12 @@ class ComparisonSettingsDialog(QDialog):
 
         self.setLayout(layout)
 
+    def select_all(self):
+        while self.available_list.count():
+            self.selected_list.addItem(self.available_list.takeItem(0).text())
+
     def save_selection(self):
         items = [self.selected_list.item(i).text() for i in range(self.selected_list.count())]
-        if len(items) > 5:
-            QMessageBox.warning(self, "Too Many", "Please select a maximum of 5 drivers.")
-            return
         self.selected_drivers = items
         self.accept()
 
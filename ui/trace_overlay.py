@@ -0,0 +1,56 @@
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtWidgets import QCheckBox, QLabel, QStatusBar
+
+from logic.tracing import tracer
+
+REFRESH_MS = 100
+
+
+# Status-bar switch for the tracer plus a one-line readout of the last operation's stages.
+# Spans finish on worker threads too, so they only raise `changed`; the label is refreshed
+# on the GUI thread, at most once per REFRESH_MS.
+class TraceOverlay(QStatusBar):
+    changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSizeGripEnabled(False)
+
+        self.summary_label = QLabel("")
+        self.addWidget(self.summary_label, 1)
+
+        self.toggle = QCheckBox("⏱️ Trace")
+        self.toggle.setToolTip("Record timing spans and write a Chrome trace when switched off")
+        self.toggle.setChecked(tracer.enabled)
+        self.toggle.toggled.connect(self.set_tracing)
+        self.addPermanentWidget(self.toggle)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.changed.connect(self.schedule_refresh)
+        listener = self.changed.emit
+        tracer.add_listener(listener)
+        self.destroyed.connect(lambda: tracer.remove_listener(listener))
+
+    def set_tracing(self, enabled):
+        if enabled:
+            tracer.enable()
+            self.showMessage(f"Tracing to {tracer.path}", 3000)
+            return
+
+        tracer.disable()
+        try:
+            path = tracer.save()
+            self.showMessage(f"Trace written to {path}", 5000)
+        except OSError as e:
+            self.showMessage(f"Could not write trace: {e}", 5000)
+
+    def schedule_refresh(self):
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def refresh(self):
+        self.summary_label.setText(tracer.last_operation() or "")
@@ -0,0 +1,102 @@
+import argparse
+import os
+import sys
+
+import fastf1
+
+from logic.cache_warmer import (
+    DEFAULT_WORKERS, SESSION_TYPES, cache_size, compact, format_size, ingest_mirror, job_name,
+    parse_size, prune, scan_cache, season_sessions, session_status, warm
+)
+from logic.schedule_service import SUPPORTED_YEARS
+from logic.telemetry_loader import CACHE_DIR, enable_cache
+
+
+def cmd_warm(args):
+    offline = args.offline or bool(args.mirror)
+    if args.mirror:
+        copied, skipped = ingest_mirror(args.mirror, args.cache, set(args.years), args.workers,
+                                        trusted=args.trust_mirror)
+        print(f"[Mirror] Copied {copied} entries from {args.mirror}")
+        if not args.trust_mirror:
+            print("[Mirror] FastF1 pickles and HTTP responses are only taken with --trust-mirror")
+        for path in skipped:
+            print(f"[Mirror] Skipped {path}")
+
+    if offline:
+        fastf1.Cache.offline_mode(True)
+    jobs = season_sessions(args.years, args.sessions)
+    print(f"Warming {len(jobs)} sessions with {args.workers} workers"
+          f"{' offline' if offline else ''}...")
+    results = warm(jobs, args.cache, args.workers, offline, persist=not args.no_store)
+    failed = [key for key, status in results.items() if status.startswith('failed')]
+    print(f"\n{len(results) - len(failed)} sessions ready, {len(failed)} failed; "
+          f"cache is {format_size(cache_size(args.cache))}")
+    return 1 if failed else 0
+
+def cmd_verify(args):
+    statuses = scan_cache(args.cache, args.workers)
+    problems = {path: status for path, status in statuses.items() if status != 'ok'}
+    for path, status in sorted(problems.items()):
+        print(f"  {status:<12} {path}")
+    print(f"{len(statuses)} entries checked, {len(problems)} stale or corrupt")
+
+    incomplete = 0
+    if args.years:
+        counts = {}
+        for job in season_sessions(args.years, args.sessions):
+            status, detail = session_status(job, args.cache, statuses)
+            counts[status] = counts.get(status, 0) + 1
+            if status not in ('stored', 'cached'):
+                incomplete += 1
+                print(f"  {status:<12} {job_name(job)}{': ' + detail if detail else ''}")
+        print(', '.join(f"{count} {status}" for status, count in sorted(counts.items())))
+    return 1 if problems or incomplete else 0
+
+def cmd_prune(args):
+    statuses = scan_cache(args.cache, args.workers)
+    print(f"Compaction freed {format_size(compact(args.cache, statuses))}")
+    if args.budget is not None:
+        removed, freed = prune(args.cache, args.budget)
+        for path in removed:
+            print(f"  removed {path}")
+        print(f"Pruned {len(removed)} sessions, {format_size(freed)}")
+    print(f"Cache is {format_size(cache_size(args.cache))}")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prefetch, check and trim the RacePulse session cache.")
+    parser.add_argument('--cache', default=CACHE_DIR, help='FastF1 cache directory')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='worker processes')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    warm_parser = commands.add_parser('warm', help='download every session of the given seasons')
+    warm_parser.add_argument('years', nargs='*', type=int, default=SUPPORTED_YEARS)
+    warm_parser.add_argument('--sessions', nargs='+', default=SESSION_TYPES, help='session identifiers')
+    warm_parser.add_argument('--mirror', help='ingest from this cache directory instead of the network')
+    warm_parser.add_argument('--trust-mirror', action='store_true',
+                             help="also take the mirror's FastF1 pickles and HTTP responses; loading "
+                                  "them runs any code they contain, so only for caches you made yourself")
+    warm_parser.add_argument('--offline', action='store_true', help='only use what is already cached')
+    warm_parser.add_argument('--no-store', action='store_true',
+                             help='skip converting sessions into the RacePulse store')
+    warm_parser.set_defaults(run=cmd_warm)
+
+    verify_parser = commands.add_parser('verify', help='report stale, corrupt and missing entries')
+    verify_parser.add_argument('years', nargs='*', type=int, help='also list sessions missing from these seasons')
+    verify_parser.add_argument('--sessions', nargs='+', default=SESSION_TYPES, help='session identifiers')
+    verify_parser.set_defaults(run=cmd_verify)
+
+    prune_parser = commands.add_parser('prune', help='compact the cache and trim it to a disk budget')
+    prune_parser.add_argument('--budget', type=parse_size, help='e.g. 20G; least recently used sessions go first')
+    prune_parser.set_defaults(run=cmd_prune)
+
+    args = parser.parse_args(argv)
+    os.makedirs(args.cache, exist_ok=True)
+    enable_cache(args.cache)
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())